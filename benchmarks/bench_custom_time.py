@@ -0,0 +1,138 @@
+# get_custom_time 运算路径基准：原浮点路径（datetime 字段 + microsecond/1e6 × float 倍率）对比整数纳秒路径
+# 用法：python -m benchmarks.bench_custom_time [--rates 2.3 3.7 20] [--samples 200000]
+
+import argparse
+import datetime
+import math
+import random
+import time
+from array import array
+from fractions import Fraction
+
+from modules.clock_source import LOCAL_EPOCH, SimulatedClock
+from modules.time_dilation import AcceleratedWorld
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86400 * _NS_PER_SECOND
+
+
+def _float_custom_second(now: datetime.datetime, rate: float) -> int:
+    # 原浮点路径（改造前 get_custom_time 的算式）：当天秒数含 microsecond/1e6，乘 float 倍率后取整
+    total_seconds = now.hour * 3600 + now.minute * 60 + now.second + now.microsecond / 1e6
+    return int(total_seconds * rate)
+
+
+def _integer_custom_second(local_ns: int, numerator: int, denominator: int) -> int:
+    # 整数纳秒路径（现 get_custom_time 的算式）：当天纳秒数 × 分子 // 分母，再整除到秒
+    return local_ns % _NS_PER_DAY * numerator // denominator // _NS_PER_SECOND
+
+
+def _boundary_moments(rate: float, count: int, day: datetime.date) -> list[datetime.datetime]:
+    # 抖动样本：自定义秒边界两侧 ±1 微秒的标准时刻（浮点误差只在边界附近改变取整结果）
+    exact = Fraction(str(rate))
+    midnight = datetime.datetime.combine(day, datetime.time.min)
+    moments = []
+    for custom_second in random.Random(0).sample(range(int(86400 * rate)), count):
+        boundary_us = math.ceil(custom_second * 1_000_000 / exact)
+        for delta in (-1, 0, 1):
+            moments.append(midnight + datetime.timedelta(microseconds=boundary_us + delta))
+    return moments
+
+
+def _time_per_call(func, args_list: list) -> float:
+    # 逐个参数调用一次，返回平均耗时（纳秒）
+    start = time.perf_counter_ns()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter_ns() - start) / len(args_list)
+
+
+def bench_rate(rate: float, samples: int) -> dict:
+    # 单个倍率：两种算式的单次耗时、边界样本上与精确有理数结果的偏差次数、get_custom_time 端到端耗时
+    exact = Fraction(str(rate))
+    numerator, denominator = exact.as_integer_ratio()
+    day = datetime.date(2026, 8, 8)
+    rng = random.Random(1)
+    midnight = datetime.datetime.combine(day, datetime.time.min)
+    moments = [
+        midnight + datetime.timedelta(microseconds=rng.randrange(86400 * 1_000_000))
+        for _ in range(samples)
+    ]
+    stamps = [(m - LOCAL_EPOCH) // datetime.timedelta(microseconds=1) * 1000 for m in moments]
+
+    float_ns = _time_per_call(_float_custom_second, [(m, rate) for m in moments])
+    integer_ns = _time_per_call(
+        _integer_custom_second, [(ns, numerator, denominator) for ns in stamps]
+    )
+
+    # 抖动：浮点路径在自定义秒边界处取整错误的次数（精确值按有理数计算）
+    boundary = _boundary_moments(rate, min(samples, 20000), day)
+    float_errors = integer_errors = batch_errors = 0
+    world = AcceleratedWorld(rate)
+    batch = world.get_custom_time_batch(array("d", (m.timestamp() for m in boundary)))
+    batch_day_seconds = world.custom_hours_per_day * 3600  # 批量小时按一天自定义小时数取模
+    for i, moment in enumerate(boundary):
+        local_ns = (moment - LOCAL_EPOCH) // datetime.timedelta(microseconds=1) * 1000
+        expected = math.floor(Fraction(local_ns % _NS_PER_DAY, _NS_PER_SECOND) * exact)
+        float_errors += _float_custom_second(moment, rate) != expected
+        integer_errors += _integer_custom_second(local_ns, numerator, denominator) != expected
+        batch_second = batch.hours[i] * 3600 + batch.minutes[i] * 60 + batch.seconds[i]
+        batch_errors += batch_second != expected % batch_day_seconds
+
+    # 端到端：模拟时钟每次推进 1ms，缓存按自定义毫秒失效（每次调用都完整换算）
+    clock = SimulatedClock(midnight + datetime.timedelta(hours=9))
+    world = AcceleratedWorld(rate, clock=clock)
+    calls = min(samples, 50000)
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        clock.advance(0.001)
+        world.get_custom_time(milliseconds=True)
+    end_to_end_ns = (time.perf_counter_ns() - start) / calls
+
+    return {
+        "rate": rate,
+        "float_ns": float_ns,
+        "integer_ns": integer_ns,
+        "boundary_samples": len(boundary),
+        "float_errors": float_errors,
+        "integer_errors": integer_errors,
+        "batch_errors": batch_errors,
+        "end_to_end_ns": end_to_end_ns,
+    }
+
+
+def main() -> None:
+    # 命令行入口：逐倍率输出对比表
+    parser = argparse.ArgumentParser(description="get_custom_time 浮点/整数运算路径基准")
+    parser.add_argument("--rates", type=float, nargs="+", default=[2.0, 2.3, 3.7, 20.0])
+    parser.add_argument("--samples", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(
+        f"{'倍率':>6} | {'浮点 ns/次':>10} | {'整数 ns/次':>10} | "
+        f"{'边界样本':>8} | {'浮点抖动':>8} | {'整数抖动':>8} | {'批量抖动':>8} | "
+        f"{'端到端 ns/次':>12}"
+    )
+    for rate in args.rates:
+        r = bench_rate(rate, args.samples)
+        print(
+            f"{r['rate']:>6} | {r['float_ns']:>10.0f} | {r['integer_ns']:>10.0f} | "
+            f"{r['boundary_samples']:>8} | {r['float_errors']:>8} | {r['integer_errors']:>8} | "
+            f"{r['batch_errors']:>8} | {r['end_to_end_ns']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ===== benchmarks/bench_custom_time.py 函数/类说明 =====
+# _float_custom_second(now, rate): 原浮点路径算式（datetime 字段 + microsecond/1e6 × float 倍率）
+# _integer_custom_second(local_ns, numerator, denominator): 现整数纳秒路径算式
+# _boundary_moments(rate, count, day): 自定义秒边界 ±1 微秒的标准时刻样本（抖动检测用）
+# bench_rate(rate, samples) -> dict: 单倍率两种算式单次耗时、边界样本上偏离精确有理数结果的次数
+#   （含 get_custom_time_batch 批量路径）、get_custom_time(milliseconds=True) 端到端耗时
+# main(): python -m benchmarks.bench_custom_time 入口，逐倍率输出对比表
+#   说明：浮点路径输入为 datetime（原实现取时方式），整数路径输入为 now_ns() 整数纳秒；
+#     抖动列为边界样本中取整结果与 floor(当天秒数 × 有理倍率) 不一致的次数；
+#     批量抖动列为 get_custom_time_batch（array('d') 输入）在同一样本上的偏差次数（整数纳秒运算，应为 0）
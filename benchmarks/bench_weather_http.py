@@ -0,0 +1,144 @@
+# 天气请求 HTTP 客户端基准：urllib.request.urlopen（每次新建连接）对比 utils/http_pool.py 连接池（keep-alive + gzip）
+# 本地桩服务器返回 Open-Meteo 形态的 17 城 JSON；--handshake-ms 在服务器接受新连接时延迟，模拟建连（TCP/TLS 握手）往返
+# 用法：python -m benchmarks.bench_weather_http [--requests 200] [--handshake-ms 0 20]
+
+import argparse
+import gzip
+import http.server
+import json
+import threading
+import time
+import urllib.request
+
+from data.cities import CITIES
+from utils.http_pool import HTTPConnectionPool
+
+
+def _payload() -> bytes:
+    # 17 城批量响应形态的 JSON（与 get_weather_by_coords_batch 请求的字段一致）
+    item = {
+        "latitude": 39.9,
+        "longitude": 116.4,
+        "current": {
+            "time": "2026-08-08T12:00",
+            "temperature_2m": 20.0,
+            "relative_humidity_2m": 50,
+            "weather_code": 0,
+            "wind_speed_10m": 5.0,
+            "apparent_temperature": 21.0,
+        },
+    }
+    return json.dumps([item] * len(CITIES)).encode("utf-8")
+
+
+class _StubServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handshake_seconds: float):
+        # 随机端口；记录接受的连接数与发送的响应体字节数
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.handshake_seconds = handshake_seconds
+        self.connections = 0
+        self.bytes_sent = 0
+        self.body = _payload()
+        self.gzip_body = gzip.compress(self.body)
+
+    def get_request(self):
+        # 每个新连接延迟 handshake_seconds（模拟建连往返），复用连接不受影响
+        request = super().get_request()
+        self.connections += 1
+        if self.handshake_seconds:
+            time.sleep(self.handshake_seconds)
+        return request
+
+
+class _StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # 响应头与响应体分两次写出，避免 Nagle + 延迟确认的 40ms 停顿
+
+    def do_GET(self):
+        # 按 Accept-Encoding 返回 gzip 或原文 JSON
+        server = self.server
+        body = server.body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = server.gzip_body
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        server.bytes_sent += len(body)
+
+    def log_message(self, format, *args):
+        # 静默访问日志
+        pass
+
+
+def _urlopen_get(url: str) -> bytes:
+    # 原 _fetch_weather_data 的取数方式：每次 urlopen 新建连接
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return response.read()
+
+
+def bench_client(name: str, handshake_ms: float, requests: int) -> dict:
+    # 单个客户端：顺序发起 requests 次请求，统计平均耗时、服务器接受的连接数与传输字节数
+    server = _StubServer(handshake_ms / 1000)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/forecast?latitude=39.9&longitude=116.4"
+    pool = HTTPConnectionPool(timeout=10)
+    get = _urlopen_get if name == "urlopen" else pool.get
+    try:
+        assert json.loads(get(url))  # 预热并校验响应可解析
+        server.connections = server.bytes_sent = 0
+        start = time.perf_counter()
+        for _ in range(requests):
+            get(url)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+    return {
+        "client": name,
+        "handshake_ms": handshake_ms,
+        "ms_per_request": elapsed * 1000 / requests,
+        "connections": server.connections,
+        "bytes_per_request": server.bytes_sent / requests,
+    }
+
+
+def main() -> None:
+    # 命令行入口：逐模拟握手延迟输出两种客户端对比表
+    parser = argparse.ArgumentParser(description="天气请求 urlopen / 连接池客户端基准")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, nargs="+", default=[0.0, 20.0])
+    args = parser.parse_args()
+
+    print(
+        f"{'客户端':>8} | {'模拟握手 ms':>10} | {'ms/请求':>8} | {'新建连接':>8} | {'字节/请求':>9}"
+    )
+    for handshake_ms in args.handshake_ms:
+        for name in ("urlopen", "pool"):
+            r = bench_client(name, handshake_ms, args.requests)
+            print(
+                f"{r['client']:>8} | {r['handshake_ms']:>10.1f} | {r['ms_per_request']:>8.3f} | "
+                f"{r['connections']:>8} | {r['bytes_per_request']:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
+
+
+# ===== benchmarks/bench_weather_http.py 函数/类说明 =====
+# _payload(): 17 城批量响应形态的 JSON 字节（与 get_weather_by_coords_batch 同字段）
+# _StubServer(handshake_seconds): 本地 HTTP/1.1 桩服务器（ThreadingHTTPServer），统计新建连接数与响应字节数；
+#   get_request() 对每个新连接延迟 handshake_seconds，模拟真实网络建连（TCP + TLS 握手）往返
+# _StubHandler: 按 Accept-Encoding 返回 gzip 或原文 JSON（keep-alive）
+# _urlopen_get(url): 原实现取数方式（每次新建连接、不请求 gzip）
+# bench_client(name, handshake_ms, requests) -> dict: 单客户端顺序请求的平均耗时/新建连接数/字节数
+# main(): python -m benchmarks.bench_weather_http 入口，输出 urlopen 与连接池对比表
+#   说明：本地回环无真实 TLS，握手成本以 --handshake-ms 模拟；连接池只在首个请求付出该成本，
+#     urlopen 每个请求都付出；字节列体现 gzip 对 JSON 响应的压缩效果
@@ -6,8 +6,8 @@ import sys
 from config.static.static_config import get_static_config
 from utils.file_utils import get_project_root
 from utils.logger import setup_logging
-from modules.time_dilation import main_cli
-from ui.main_window import main_gui
+from modules.time_dilation import main_cli, main_once
+from modules.time_snapshot import get_time_snapshot_path
 
 
 def main() -> None:
@@ -28,9 +28,15 @@ def main() -> None:
   python main.py                          # 启动图形界面
   python main.py --gui                    # 启动图形界面
   python main.py --cli --rate 3.0         # 启动命令行界面，倍率3.0
+  python main.py --once -F "{custom_time}" # 按模板输出一行后退出（状态栏用）
   python main.py --hidden                 # 启动并隐藏到托盘
   python main.py --theme dark             # 使用暗色主题
   python main.py --city 上海              # 默认显示上海天气
+  python main.py --cli --rate 20 --fps    # 高频毫秒显示（默认帧率见静态配置）
+  python main.py --cli --schedule 00:00=1,09:00=4,12:00=1   # 分段膨胀日程（会议 1x、专注 4x）
+  python main.py --serve                  # 启动本地时间服务（Unix 域套接字推送）
+  python main.py --serve --snapshot       # 同时发布共享内存时间快照
+  python main.py --build-lunar-table      # 预计算农历表（加速农历查询）
         """,
     )
 
@@ -38,6 +44,17 @@ def main() -> None:
     mode_group = parser.add_mutually_exclusive_group()
     mode_group.add_argument("--gui", action="store_true", help="运行图形界面（默认）")
     mode_group.add_argument("--cli", action="store_true", help="运行命令行界面")
+    mode_group.add_argument(
+        "--once", action="store_true", help="按 --format 模板输出一行后退出"
+    )
+    mode_group.add_argument(
+        "--serve", action="store_true", help="运行本地时间服务（Unix 域套接字，每秒推送）"
+    )
+    mode_group.add_argument(
+        "--build-lunar-table",
+        action="store_true",
+        help="预计算农历表（年份范围/输出路径来自静态配置）后退出",
+    )
 
     # 核心参数
     parser.add_argument(
@@ -48,6 +65,48 @@ def main() -> None:
         help=f"时间膨胀倍率（{base['rate_min']}-{base['rate_max']}，默认{base['default_rate']}）",
     )
 
+    # 分段膨胀日程（按时段切换倍率；给定时 --rate 不生效）
+    parser.add_argument(
+        "--schedule",
+        default=None,
+        metavar="SPEC",
+        help="分段膨胀日程，--cli/--once/--serve 使用，如 00:00=1,09:00=4,12:00=1（给定时忽略 --rate）",
+    )
+
+    # --once 输出模板（str.format 语法，字段为 TimeInfo 属性）
+    parser.add_argument(
+        "--format",
+        "-F",
+        default=None,
+        help=f"--once 输出模板（默认 \"{base['once_format']}\"）",
+    )
+
+    # --serve 套接字路径
+    parser.add_argument(
+        "--socket", default=None, help="--serve 套接字路径（默认见静态配置 time_service_socket）"
+    )
+
+    # 共享内存时间快照（--serve 与 GUI 均可发布；不带路径时用静态配置默认路径）
+    parser.add_argument(
+        "--snapshot",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="发布共享内存时间快照（默认路径见静态配置 time_snapshot_path）",
+    )
+
+    # 高频毫秒模式（CLI 实时钟与 GUI 时钟面板；不带帧率时用静态配置 live_clock_fps）
+    parser.add_argument(
+        "--fps",
+        type=float,
+        nargs="?",
+        const=float(base["live_clock_fps"]),
+        default=None,
+        metavar="N",
+        help=f"高频毫秒显示，按帧率刷新（默认 {base['live_clock_fps']}fps）",
+    )
+
     # GUI 专属参数
     parser.add_argument(
         "--theme",
@@ -74,13 +133,54 @@ def main() -> None:
         print("例如: python main.py --rate 2.0")
         sys.exit(1)
 
+    # 验证 --fps 参数（正数）
+    if args.fps is not None and args.fps <= 0:
+        print("错误: --fps 参数必须大于 0")
+        print("例如: python main.py --cli --fps 30")
+        sys.exit(1)
+
+    # 解析分段膨胀日程（格式/起点错误、各段倍率超出 --rate 同一范围时直接退出）
+    schedule = None
+    if args.schedule is not None:
+        from modules.dilation_schedule import DilationSchedule
+
+        try:
+            schedule = DilationSchedule.parse(args.schedule)
+        except ValueError as e:
+            print(f"错误：{e}")
+            print("例如: python main.py --cli --schedule 00:00=1,09:00=4,12:00=1")
+            sys.exit(1)
+
+    # 快照路径：未指定 --snapshot 为 None（不发布）；不带路径时取默认路径
+    snapshot_path = None
+    if args.snapshot is not None:
+        snapshot_path = args.snapshot or get_time_snapshot_path()
+
     # 判断运行模式（run_cli 一行别名已内联，S10.11 C4）
-    if args.cli:
-        # 运行命令行界面（顶层 import，无模块会 import main，按需加载收益不存在）
-        if args.rate is not None:
-            main_cli(rate=args.rate)
-        else:
-            main_cli()
+    if args.build_lunar_table:
+        # 构建农历预计算表（一次性步骤，之后农历查询走 mmap 快路径）
+        from modules.chinese_calendar import build_lunar_table
+
+        start_year, end_year = base["lunar_table_years"]
+        count = build_lunar_table()
+        print(f"农历表已生成: {start_year}-{end_year} 共 {count} 天")
+    elif args.once:
+        # 单次输出（状态栏轮询场景：不进入实时钟循环，模板未引用农历时不做农历计算）
+        main_once(rate=args.rate, template=args.format, schedule=schedule)
+    elif args.serve:
+        # 时间服务守护进程（LINE 协议模板同 --format；asyncio/ssl 约 25ms，仅本分支导入）
+        from modules.time_service import main_serve
+
+        main_serve(
+            rate=args.rate,
+            socket_path=args.socket,
+            template=args.format,
+            snapshot_path=snapshot_path,
+            schedule=schedule,
+        )
+    elif args.cli:
+        # 运行命令行界面（只依赖 modules/ 与 config/，不导入任何 GUI 模块）
+        main_cli(rate=args.rate, fps=args.fps, schedule=schedule)
     else:
         # 运行图形界面
         # 构建启动参数（可选参数推导式过滤 None，hidden 布尔单独处理）
@@ -90,12 +190,17 @@ def main() -> None:
                 "rate": args.rate,
                 "theme": args.theme,
                 "city": args.city,
+                "snapshot": snapshot_path,
+                "fps": args.fps,
             }.items()
             if v is not None
         }
         if args.hidden:
             gui_args["hidden"] = True
 
+        # GUI 依赖（PyQt6/QtMultimedia/各面板）在确定进入图形界面后才导入，CLI/--version/--help 不加载
+        from ui.main_window import main_gui
+
         main_gui(**gui_args)
 
 
@@ -108,8 +213,15 @@ if __name__ == "__main__":
 #   及各 UI 显示均从静态配置读取（版本迁移方案，代码零硬编码版本字符串）
 # main() -> None: 主程序入口
 #   输入：命令行参数（argparse）
-#   逻辑步骤：读取静态配置 → 初始化日志 → 解析参数（--gui/--cli/--rate/--theme/--city/--hidden/--version）
-#            → 验证 --rate 范围 → 分发 CLI（main_cli(rate=...)）或 GUI（main_gui(**gui_args)）
-#   设计理由：入口收编 CLI/GUI 分发；版本号从 base.json 读取（单一来源，代码零硬编码）
-#   异常处理：rate 越界打印错误并 sys.exit(1)
-#   关联配置：utils/logger.py 日志初始化；modules/time_dilation.py CLI；ui/main_window.py GUI
+#   逻辑步骤：读取静态配置 → 初始化日志 → 解析参数（--gui/--cli/--once/--serve/--build-lunar-table/
+#            --format/--socket/--snapshot/--fps/--schedule/--rate/--theme/--city/--hidden/--version）→
+#            验证 --rate 范围、--fps 正数、解析 --schedule（DilationSchedule.parse）→
+#            构建农历表（build_lunar_table()）或单次输出（main_once(rate, template)）或时间服务
+#            （main_serve(rate, socket_path, template, snapshot_path, schedule)）或分发 CLI（main_cli(rate=..., fps=..., schedule=...)）或 GUI（按需导入 ui.main_window 后 main_gui(**gui_args)）
+#   设计理由：入口收编 CLI/GUI 分发；版本号从 base.json 读取（单一来源，代码零硬编码）；
+#            GUI 模块仅 GUI 分支导入，CLI/--version/--help 冷启动不加载 PyQt6（tests/test_main.py 守护）；
+#            时间服务（asyncio/ssl）、分段日程、农历表构建同样只在各自分支按需导入
+#   异常处理：rate 越界、fps 非正数、schedule 非法打印错误并 sys.exit(1)
+#   关联配置：utils/logger.py 日志初始化；modules/time_dilation.py CLI；modules/time_service.py 时间服务；
+#            ui/main_window.py GUI；
+#            modules/chinese_calendar.py 农历表构建（base.json lunar_table_path/lunar_table_years）
@@ -16,6 +16,9 @@ from utils.dataclass_utils import dataclass_from_dict
 # 静态配置（闹钟上限参数）
 from config.static.static_config import get_static_config
 
+# 可注入时钟源（check_alarms 未传时刻时取当前时间）
+from modules.clock_source import ClockSource, RealClock
+
 # 配置日志
 logger = logging.getLogger(__name__)
 
@@ -167,9 +170,10 @@ def _trigger_key(check_time: datetime) -> str:
 
 
 class AlarmManager:
-    def __init__(self) -> None:
-        # 空列表启动；上限来自静态配置；_last_triggered 存"日期+分钟"触发去重记录
+    def __init__(self, clock: ClockSource | None = None) -> None:
+        # 空列表启动；上限来自静态配置；_last_triggered 存"日期+分钟"触发去重记录；clock 默认真实时钟
         self.alarms: List[Alarm] = []
+        self.clock = clock if clock is not None else RealClock()
         self.max_alarms = int(get_static_config().base["max_alarms"])
         self._last_triggered: Dict[
             str, str
@@ -222,8 +226,10 @@ class AlarmManager:
             return True
         return False
 
-    def check_alarms(self, check_time: datetime) -> List[Alarm]:
-        # 去重键含日期维度（经 _trigger_key），跨天不误判；命中即标记
+    def check_alarms(self, check_time: Optional[datetime] = None) -> List[Alarm]:
+        # 去重键含日期维度（经 _trigger_key），跨天不误判；命中即标记；未传时刻取时钟源当前时间
+        if check_time is None:
+            check_time = self.clock.now()
         time_str = _trigger_key(check_time)
         triggered = []
 
@@ -268,8 +274,9 @@ class AlarmManager:
 #   to_dict/from_dict: JSON 序列化往返；from_dict 容错（未知键过滤，非法数据返回 None）
 #   is_one_time: 无重复天数即一次性
 # play_preset_sound(preset): winsound.Beep 组合（阻塞，由 ui/audio_player.py async 入口后台化）
-# AlarmManager: 闹钟管理（上限 10、同时间同标签去重、同分钟触发去重 _last_triggered）
+# AlarmManager(clock=None): 闹钟管理（上限 10、同时间同标签去重、同分钟触发去重 _last_triggered）
 #   add/remove/get/replace/toggle/check/to_dict_list/from_dict_list
+#   check_alarms(check_time=None): 未传时刻时取注入时钟源（modules/clock_source.py）当前时间
 #   设计理由：数据模型与匹配逻辑集中在 service 层，UI 只做展示与持久化；
 #   播放职责已迁至 ui/audio_player.py（S10.5 D2：UI 库依赖不进入业务层）
 #   异常处理：构造校验抛 ValueError；播放失败记录日志
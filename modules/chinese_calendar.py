@@ -1,11 +1,24 @@
 # 农历/干支/节气/节日模块
 
+import bisect
 import datetime
+import importlib
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Tuple
+from pathlib import Path
+from typing import Any, Iterator, Tuple
 
-from lunar_python import Solar  # type: ignore
-from chinese_calendar import get_holiday_detail  # type: ignore
+# 静态配置（农历缓存容量/预计算表与节气索引年份范围）
+from config.static.static_config import get_static_config
+
+# 农历预计算表（mmap 快路径）
+from modules.lunar_table import (
+    get_lunar_table,
+    get_lunar_table_path,
+    reset_lunar_table,
+    write_lunar_table,
+)
 
 # 时辰映射
 SHI_CHEN = [
@@ -59,6 +72,26 @@ CUSTOM_HOLIDAYS = {
 # 英文节日名称到中文的翻译映射
 HOLIDAY_TRANSLATION = {"New Year's Day": "元旦", "National Day": "国庆节"}
 
+# 第三方农历/节假日库：首次农历查询（或 GUI 后台预热）时才导入，只显示时间的模式不付导入开销
+# 模块级名称保留（测试可 monkeypatch），由 _ensure_libraries() 填充
+Lunar: Any = None
+LunarYear: Any = None
+LunarUtil: Any = None
+Solar: Any = None
+get_holiday_detail: Any = None
+_libraries_lock = threading.Lock()
+
+# 节气英文占位键 → 中文（Lunar.JIE_QI_IN_USE 首尾跨年节气用英文键区分，与 Lunar.__convertJieQi 一致）
+_JIE_QI_ALIAS = {
+    "DONG_ZHI": "冬至",
+    "DA_HAN": "大寒",
+    "XIAO_HAN": "小寒",
+    "LI_CHUN": "立春",
+    "DA_XUE": "大雪",
+    "YU_SHUI": "雨水",
+    "JING_ZHE": "惊蛰",
+}
+
 # 星期映射（中文日期格式化用，模块级常量避免每次调用重建，E6）
 _WEEKDAY_NAMES = {
     0: "星期一",
@@ -71,6 +104,23 @@ _WEEKDAY_NAMES = {
 }
 
 
+# 农历展示文本缓存：(日期, 时辰桶) → 文本，LRU 有界；输出只随日期与时辰变化（一天 12 个桶）
+_lunar_cache: "OrderedDict[tuple[datetime.date, int], str]" = OrderedDict()
+_lunar_cache_lock = threading.Lock()
+_lunar_cache_stats = {"hits": 0, "misses": 0}
+
+# 节日年度索引：公历年 → 年内逐日节日名列表（每年构建一次，不淘汰，单年约 366 个短字符串）
+_holiday_indexes: dict[int, list[str]] = {}
+_holiday_index_lock = threading.Lock()
+
+# 节气交接时刻索引：农历年 → (升序时刻列表, 对应节气名列表)，按查询时刻所需年份懒构建（每年一次，不淘汰）
+_jieqi_indexes: dict[int, tuple[list[datetime.datetime], list[str]]] = {}
+_jieqi_index_lock = threading.Lock()
+
+# 缓存容量（条目数，来自静态配置）
+LUNAR_CACHE_MAXSIZE = int(get_static_config().base["lunar_cache_size"])
+
+
 @dataclass
 class LunarInfo:
     lunar_year: str  # 天干地支年（如"丙午年"）
@@ -85,22 +135,49 @@ class LunarInfo:
     position: str  # 八卦方位
 
 
+@dataclass(frozen=True)
+class JieQiTerm:
+    name: str  # 节气名
+    start: datetime.datetime  # 交节时刻（北京时间，秒精度）
+
+
+def _ensure_libraries() -> None:
+    # 懒导入 lunar-python / chinese-calendar（双重检查加锁；各自判空，Solar 最后赋值作为农历库就绪标志）
+    global Lunar, LunarYear, LunarUtil, Solar, get_holiday_detail
+    if Solar is not None and get_holiday_detail is not None:
+        return
+    with _libraries_lock:
+        if Solar is None:
+            lunar_python = importlib.import_module("lunar_python")
+            LunarUtil = importlib.import_module("lunar_python.util").LunarUtil
+            Lunar = lunar_python.Lunar
+            LunarYear = lunar_python.LunarYear
+            Solar = lunar_python.Solar
+        if get_holiday_detail is None:
+            get_holiday_detail = importlib.import_module("chinese_calendar").get_holiday_detail
+
+
+def warm_up_lunar(now: datetime.datetime | None = None) -> None:
+    # GUI 后台预热：导入农历库并预先算好当前农历文本与当前年份的节气索引，首帧 tick 不阻塞主线程
+    now = now or datetime.datetime.now()
+    _ensure_libraries()
+    get_lunar_info(now)
+    _get_jieqi_window(now)
+
+
 # 农历计算核心函数
 def get_chinese_lunar_calendar(year: int, month: int, day: int, hour: int) -> LunarInfo:
-    # lunar-python 提供干支生肖月日，chinese-calendar 兜底节假日，自定义表兜底
-    # 使用lunar-python获取农历信息
-    solar = Solar.fromYmdHms(year, month, day, hour, 0, 0)
-    lunar = solar.getLunar()
+    # 预计算表覆盖范围内 O(1) 查表；范围外（或表未构建）走 lunar-python 实时计算慢路径
+    table = get_lunar_table()
+    row = table.lookup(datetime.date(year, month, day)) if table is not None else None
+    if row is None:
+        row = _compute_day_fields(year, month, day, hour)
+    return _make_lunar_info(row, month, hour)
 
-    # 获取天干地支年份
-    lunar_year = lunar.getYearInGanZhi() + "年"
 
-    # 获取生肖
-    shengxiao = lunar.getYearShengXiao()
-
-    # 获取农历月份和日期
-    lunar_month = lunar.getMonthInChinese() + "月"
-    lunar_day = lunar.getDayInChinese()
+def _make_lunar_info(row: tuple[str, ...], month: int, hour: int) -> LunarInfo:
+    # 逐日字段（TABLE_COLUMNS 顺序）+ 时辰（按小时）+ 财神方位（按公历月）→ LunarInfo
+    lunar_year, shengxiao, lunar_month, lunar_day, yue_phase, jieqi, public_holiday = row
 
     # 计算时辰
     for start, end, chen in SHI_CHEN:
@@ -110,39 +187,6 @@ def get_chinese_lunar_calendar(year: int, month: int, day: int, hour: int) -> Lu
     else:
         current_chen = "子时"
 
-    # 获取月相
-    yue_phase = lunar.getYueXiang() + "月"
-
-    # 获取节气
-    jieqi = lunar.getJieQi()
-    if not jieqi:
-        # 如果当天不是节气日，获取当前节气（如果有的话）
-        jieqi = lunar.getCurrentJieQi()
-    # 确保节气值是字符串类型
-    jieqi = str(jieqi) if jieqi else ""
-
-    # 获取公历节日
-    # 先检查lunar-python的节日
-    festivals = lunar.getFestivals()
-    public_holiday = festivals[0] if festivals else ""
-
-    # 如果lunar-python没有找到节日，检查chinese-calendar
-    if not public_holiday:
-        try:
-            holiday_detail = get_holiday_detail(datetime.datetime(year, month, day))
-            # get_holiday_detail返回(Boolean, String)元组，第二个元素是节日名称
-            public_holiday = holiday_detail[1] if holiday_detail[0] else ""
-        except NotImplementedError:
-            # 年份超出 chinese-calendar 支持范围（2004-2026）时降级跳过
-            public_holiday = ""
-
-    # 如果chinese-calendar没有找到节日，检查自定义节日列表
-    if not public_holiday:
-        public_holiday = CUSTOM_HOLIDAYS.get((month, day), "")
-
-    # 将英文节日名称转换为中文
-    public_holiday = HOLIDAY_TRANSLATION.get(public_holiday, public_holiday)
-
     # 获取拜财神方向
     cai_shen_dir, position = CAI_SHEN_DIRECTION[month]
 
@@ -160,21 +204,285 @@ def get_chinese_lunar_calendar(year: int, month: int, day: int, hour: int) -> Lu
     )
 
 
+def _compute_day_fields(year: int, month: int, day: int, hour: int = 12) -> tuple[str, ...]:
+    # 慢路径：lunar-python 提供干支生肖月日，chinese-calendar 兜底节假日，自定义表兜底
+    # 返回按 lunar_table.TABLE_COLUMNS 顺序的逐日字段（与小时无关，hour 仅用于构造 Solar）
+    _ensure_libraries()
+    # 使用lunar-python获取农历信息
+    solar = Solar.fromYmdHms(year, month, day, hour, 0, 0)
+    lunar = solar.getLunar()
+
+    # 获取天干地支年份
+    lunar_year = lunar.getYearInGanZhi() + "年"
+
+    # 获取生肖
+    shengxiao = lunar.getYearShengXiao()
+
+    # 获取农历月份和日期
+    lunar_month = lunar.getMonthInChinese() + "月"
+    lunar_day = lunar.getDayInChinese()
+
+    # 获取月相
+    yue_phase = lunar.getYueXiang() + "月"
+
+    # 获取节气
+    jieqi = lunar.getJieQi()
+    if not jieqi:
+        # 如果当天不是节气日，获取当前节气（如果有的话）
+        jieqi = lunar.getCurrentJieQi()
+    # 确保节气值是字符串类型
+    jieqi = str(jieqi) if jieqi else ""
+
+    # 获取公历节日（四源合并的年度索引，单次读取）
+    public_holiday = get_public_holiday(datetime.date(year, month, day))
+
+    return (lunar_year, shengxiao, lunar_month, lunar_day, yue_phase, jieqi, public_holiday)
+
+
+def _build_holiday_index(year: int) -> list[str]:
+    # 构建公历年节日索引（按年内序号 0..364/365），合并优先级与原逐日兜底一致：
+    # lunar-python 农历节日（含除夕）→ chinese-calendar → CUSTOM_HOLIDAYS → 英文翻译
+    _ensure_libraries()
+    first_day = datetime.date(year, 1, 1)
+    holidays = [""] * ((datetime.date(year, 12, 31) - first_day).days + 1)
+
+    # 1. 农历节日：公历年横跨上一农历年尾与本农历年，按农历月首日定位各日
+    for lunar_year in (year - 1, year):
+        months = [m for m in LunarYear.fromYear(lunar_year).getMonths() if m.getYear() == lunar_year]
+        for month_index, lunar_month in enumerate(months):
+            solar = Solar.fromJulianDay(lunar_month.getFirstJulianDay())
+            offset = (datetime.date(solar.getYear(), solar.getMonth(), solar.getDay()) - first_day).days
+            month = lunar_month.getMonth()
+            day_count = lunar_month.getDayCount()
+            for lunar_day in range(1, day_count + 1):
+                index = offset + lunar_day - 1
+                if not 0 <= index < len(holidays):
+                    continue
+                festival = LunarUtil.FESTIVAL.get(f"{month}-{lunar_day}", "")
+                if (
+                    not festival
+                    and month_index == len(months) - 1
+                    and abs(month) == 12
+                    and lunar_day == day_count
+                ):
+                    # 农历年最后一天（腊月廿九/三十）为除夕
+                    festival = "除夕"
+                holidays[index] = festival
+
+    # 2. chinese-calendar：只在年初探测一次是否支持该年（支持范围外不再逐日触发异常）
+    try:
+        get_holiday_detail(first_day)
+        supported = True
+    except NotImplementedError:
+        # 年份超出 chinese-calendar 支持范围（2004-2026）时整年跳过
+        supported = False
+    for index, holiday in enumerate(holidays):
+        day = first_day + datetime.timedelta(days=index)
+        if not holiday and supported:
+            # get_holiday_detail返回(Boolean, String)元组，第二个元素是节日名称
+            is_holiday, name = get_holiday_detail(day)
+            holiday = name if is_holiday else ""
+        # 3. 自定义节日兜底
+        if not holiday:
+            holiday = CUSTOM_HOLIDAYS.get((day.month, day.day), "")
+        # 4. 将英文节日名称转换为中文
+        holidays[index] = HOLIDAY_TRANSLATION.get(holiday, holiday) if holiday else ""
+    return holidays
+
+
+def get_public_holiday(day: datetime.date) -> str:
+    # 节日查询：按公历年懒构建索引（每年一次），此后为单次列表读取
+    index = _holiday_indexes.get(day.year)
+    if index is None:
+        with _holiday_index_lock:
+            index = _holiday_indexes.get(day.year)
+            if index is None:
+                index = _holiday_indexes[day.year] = _build_holiday_index(day.year)
+    return index[day.timetuple().tm_yday - 1]
+
+
+def _jieqi_days(lunar_year: int) -> dict[datetime.date, str]:
+    # 农历年对应的节气日表（公历日期 → 中文节气名），覆盖前一年大雪至次年惊蛰
+    _ensure_libraries()
+    jieqi_days = {}
+    julian_days = LunarYear.fromYear(lunar_year).getJieQiJulianDays()
+    for key, julian_day in zip(Lunar.JIE_QI_IN_USE, julian_days):
+        solar = Solar.fromJulianDay(julian_day)
+        jieqi_days[datetime.date(solar.getYear(), solar.getMonth(), solar.getDay())] = (
+            _JIE_QI_ALIAS.get(key, key)
+        )
+    return jieqi_days
+
+
+def _iter_day_fields(
+    start: datetime.date, end: datetime.date
+) -> Iterator[tuple[datetime.date, tuple[str, ...]]]:
+    # 增量逐日生成 (公历日期, 逐日字段)：按农历年→农历月→日推进，每个农历年只构建一次 LunarYear，
+    # 字段直接查 LunarUtil 字典表（与 Lunar 对象各 getter 同源），不再逐日构建 Solar/Lunar
+    if start > end:
+        return
+    _ensure_libraries()
+    first = Solar.fromYmd(start.year, start.month, start.day).getLunar()
+    lunar_year = first.getYear()
+    jieqi_days: dict[datetime.date, str] = {}
+    while True:
+        # 节气日表取相邻三个农历年并集（节气按公历日期匹配，跨年首尾均覆盖）
+        for y in (lunar_year - 1, lunar_year, lunar_year + 1):
+            jieqi_days.update(_jieqi_days(y))
+        offset = lunar_year - 4
+        lunar_year_text = LunarUtil.GAN[offset % 10 + 1] + LunarUtil.ZHI[offset % 12 + 1] + "年"
+        shengxiao = LunarUtil.SHENGXIAO[offset % 12 + 1]
+        months = [m for m in LunarYear.fromYear(lunar_year).getMonths() if m.getYear() == lunar_year]
+        for lunar_month in months:
+            solar = Solar.fromJulianDay(lunar_month.getFirstJulianDay())
+            day = datetime.date(solar.getYear(), solar.getMonth(), solar.getDay())
+            day_count = lunar_month.getDayCount()
+            if day + datetime.timedelta(days=day_count) <= start:
+                continue
+            month = lunar_month.getMonth()
+            month_text = ("闰" if month < 0 else "") + LunarUtil.MONTH[abs(month)] + "月"
+            for lunar_day in range(1, day_count + 1):
+                if day > end:
+                    return
+                if day >= start:
+                    yield day, (
+                        lunar_year_text,
+                        shengxiao,
+                        month_text,
+                        LunarUtil.DAY[lunar_day],
+                        LunarUtil.YUE_XIANG[lunar_day] + "月",
+                        jieqi_days.get(day, ""),
+                        get_public_holiday(day),
+                    )
+                day += datetime.timedelta(days=1)
+        lunar_year += 1
+
+
+def get_lunar_range(
+    start: datetime.date, end: datetime.date, hour: int = 12
+) -> Iterator[LunarInfo]:
+    # 区间 [start, end] 逐日 LunarInfo 生成器（月历/年历视图一次调用；流式输出不占整段内存）
+    # 时辰按统一的 hour 计算；逐日字段与 get_chinese_lunar_calendar 完全一致
+    for day, row in _iter_day_fields(start, end):
+        yield _make_lunar_info(row, day.month, hour)
+
+
+def build_lunar_table(
+    path: Path | str | None = None,
+    start_year: int | None = None,
+    end_year: int | None = None,
+) -> int:
+    # 构建步骤：增量遍历生成 [start_year, end_year] 农历表（默认范围/路径来自静态配置），返回天数
+    default_start, default_end = get_static_config().base["lunar_table_years"]
+    start_year = int(default_start if start_year is None else start_year)
+    end_year = int(default_end if end_year is None else end_year)
+    if start_year > end_year:
+        raise ValueError(f"农历表年份范围无效: {start_year}-{end_year}")
+    first_day = datetime.date(start_year, 1, 1)
+    last_day = datetime.date(end_year, 12, 31)
+    rows = (row for _, row in _iter_day_fields(first_day, last_day))
+    target = Path(path) if path is not None else get_lunar_table_path()
+    count = write_lunar_table(target, first_day, rows)
+    # 重建默认表后重置单例，下次查询重新 mmap
+    if target == get_lunar_table_path():
+        reset_lunar_table()
+    return count
+
+
+def _build_jieqi_index(lunar_year: int) -> tuple[list[datetime.datetime], list[str]]:
+    # 农历年冬至（前一公历年 12 月）..大雪 24 个交节时刻（中文键；跨年英文键为相邻年重复项不取），约 5ms
+    _ensure_libraries()
+    instants: list[datetime.datetime] = []
+    names: list[str] = []
+    julian_days = LunarYear.fromYear(lunar_year).getJieQiJulianDays()
+    for key, julian_day in zip(Lunar.JIE_QI_IN_USE, julian_days):
+        if key in _JIE_QI_ALIAS:
+            continue
+        solar = Solar.fromJulianDay(julian_day)
+        instants.append(
+            datetime.datetime(
+                solar.getYear(),
+                solar.getMonth(),
+                solar.getDay(),
+                solar.getHour(),
+                solar.getMinute(),
+                solar.getSecond(),
+            )
+        )
+        names.append(key)
+    return instants, names
+
+
+def _get_jieqi_index(lunar_year: int) -> tuple[list[datetime.datetime], list[str]]:
+    # 按农历年懒构建节气索引（双重检查加锁，每年只构建一次）
+    index = _jieqi_indexes.get(lunar_year)
+    if index is None:
+        with _jieqi_index_lock:
+            index = _jieqi_indexes.get(lunar_year)
+            if index is None:
+                index = _jieqi_indexes[lunar_year] = _build_jieqi_index(lunar_year)
+    return index
+
+
+def _get_jieqi_window(moment: datetime.datetime) -> tuple[list[datetime.datetime], list[str]]:
+    # moment 所在公历年 Y 的查询窗口：农历年 Y 覆盖 [Y-1 冬至, Y 冬至)，Y+1 覆盖 [Y 冬至, Y+1 冬至)，
+    # 两年拼接后当前节气与下一节气都在窗口内；公历年超出 base.json jieqi_index_years 抛 ValueError
+    start_year, end_year = get_static_config().base["jieqi_index_years"]
+    if not int(start_year) <= moment.year <= int(end_year):
+        raise ValueError(f"时刻超出节气索引范围: {moment}")
+    instants, names = _get_jieqi_index(moment.year)
+    next_instants, next_names = _get_jieqi_index(moment.year + 1)
+    return instants + next_instants, names + next_names
+
+
+def get_current_jieqi(moment: datetime.datetime) -> JieQiTerm:
+    # 当前所处节气（最近一个交节时刻 <= moment），bisect 查两年窗口；超出索引范围抛 ValueError
+    instants, names = _get_jieqi_window(moment)
+    i = bisect.bisect_right(instants, moment) - 1
+    return JieQiTerm(names[i], instants[i])
+
+
+def get_next_jieqi(moment: datetime.datetime) -> tuple[JieQiTerm, datetime.timedelta]:
+    # 下一个节气及距其交节的剩余时长（严格晚于 moment），bisect 查两年窗口；超出索引范围抛 ValueError
+    instants, names = _get_jieqi_window(moment)
+    i = bisect.bisect_right(instants, moment)
+    return JieQiTerm(names[i], instants[i]), instants[i] - moment
+
+
 def get_chinese_date(now: datetime.datetime) -> str:
     # 星期映射后经 strftime 格式化
     return now.strftime(f"%Y年%m月%d日 {_WEEKDAY_NAMES[now.weekday()]}")
 
 
+def _shichen_bucket(hour: int) -> int:
+    # 小时 → 时辰序号（0=子时 … 11=亥时；23 点与 0 点同属子时）
+    return ((hour + 1) // 2) % 12
+
+
 def get_lunar_info(now: datetime.datetime) -> str:
-    # 委托 get_chinese_lunar_calendar 后按固定格式拼接，空字段跳过
-    year = now.year
-    month = now.month
-    day = now.day
-    hour = now.hour
+    # 按 (日期, 时辰桶) 查 LRU 缓存，未命中才走农历全量计算（一天最多 12 次，替代逐秒重算）
+    key = (now.date(), _shichen_bucket(now.hour))
+    with _lunar_cache_lock:
+        cached = _lunar_cache.get(key)
+        if cached is not None:
+            _lunar_cache.move_to_end(key)
+            _lunar_cache_stats["hits"] += 1
+            return cached
+        _lunar_cache_stats["misses"] += 1
+
+    lunar_info = _format_lunar_info(
+        get_chinese_lunar_calendar(now.year, now.month, now.day, now.hour)
+    )
+
+    with _lunar_cache_lock:
+        _lunar_cache[key] = lunar_info
+        while len(_lunar_cache) > LUNAR_CACHE_MAXSIZE:
+            _lunar_cache.popitem(last=False)
+    return lunar_info
 
-    info = get_chinese_lunar_calendar(year, month, day, hour)
 
-    # 构建农历信息字符串
+def _format_lunar_info(info: LunarInfo) -> str:
+    # 按固定格式拼接农历展示文本，空字段跳过
     lunar_info = (
         f"{info.lunar_year}（{info.shengxiao}年）"
         f"{info.lunar_month}{info.lunar_day}{info.shichen}"
@@ -192,16 +500,65 @@ def get_lunar_info(now: datetime.datetime) -> str:
     return lunar_info
 
 
+def get_lunar_cache_stats() -> dict[str, int]:
+    # 缓存命中/未命中计数与当前容量（监控与测试用）
+    with _lunar_cache_lock:
+        return {
+            "hits": _lunar_cache_stats["hits"],
+            "misses": _lunar_cache_stats["misses"],
+            "size": len(_lunar_cache),
+            "maxsize": LUNAR_CACHE_MAXSIZE,
+        }
+
+
+def clear_lunar_cache() -> None:
+    # 清空缓存并归零计数
+    with _lunar_cache_lock:
+        _lunar_cache.clear()
+        _lunar_cache_stats["hits"] = 0
+        _lunar_cache_stats["misses"] = 0
+
+
 # ===== modules/chinese_calendar.py 函数/常量说明 =====
+# Lunar/LunarYear/LunarUtil/Solar/get_holiday_detail: 第三方库名称，_ensure_libraries() 首次使用时填充
+# _ensure_libraries(): importlib 懒导入 lunar-python/chinese-calendar（约 35ms），双重检查加锁
+#   设计理由：time_dilation 在模块加载时导入本模块，CLI/仅时间模式不应付农历库导入开销；
+#   预计算表命中时 get_chinese_lunar_calendar 完全不需要农历库
+# warm_up_lunar(now=None): GUI 后台线程预热（导入库 + 当前农历文本 + 当前年份节气索引）
 # 常量：SHI_CHEN 时辰表、CAI_SHEN_DIRECTION 财神方位表、CUSTOM_HOLIDAYS 自定义节日表、
 #       HOLIDAY_TRANSLATION 英文节日翻译表（S2.2.2 提升为模块级）
 # LunarInfo: dataclass，农历信息聚合（S2 引入，替代 10 元组返回）
 # get_chinese_lunar_calendar(year, month, day, hour) -> LunarInfo:
 #   输入：公历年月日时；输出：LunarInfo 各字段
-#   逻辑步骤：lunar-python 取干支/生肖/农历月日/月相/节气 → 时辰表匹配 →
-#            节日三级兜底（lunar-python → chinese-calendar → CUSTOM_HOLIDAYS）→ 翻译 → 财神方位
+#   逻辑步骤：预计算表 O(1) 查逐日字段（范围外走 _compute_day_fields 慢路径）→ _make_lunar_info
+# _make_lunar_info(row, month, hour) -> LunarInfo: 逐日字段 + 时辰表匹配 + 财神方位
+# _compute_day_fields(year, month, day, hour=12) -> tuple: 慢路径逐日字段（TABLE_COLUMNS 顺序）
+#   lunar-python 取干支/生肖/农历月日/月相/节气 → 节日查年度索引（get_public_holiday）
+# _build_holiday_index(year) -> list[str]: 公历年节日索引（年内序号 → 节日名）
+#   合并优先级：lunar-python 农历节日/除夕 → chinese-calendar → CUSTOM_HOLIDAYS → 翻译
+#   chinese-calendar 每年只探测一次支持范围，范围外年份不再逐日触发 NotImplementedError
+# get_public_holiday(day) -> str: 节日查询，按年懒构建索引（双重检查加锁）后单次读取
 #   设计理由：三库兜底提高节日覆盖率；数据表模块级常量避免重复构建
+# _jieqi_days(lunar_year) -> dict: 农历年节气日表（_JIE_QI_ALIAS 归一跨年英文占位键）
+# _iter_day_fields(start, end): 增量逐日字段生成器，每农历年构建一次 LunarYear，字段查 LunarUtil 表
+# get_lunar_range(start, end, hour=12) -> Iterator[LunarInfo]: 区间逐日 LunarInfo 流式生成（月历/年历视图）
+#   设计理由：避免每日构建 Solar/Lunar 对象图；生成器输出，百年区间也不驻留内存
+# build_lunar_table(path=None, start_year=None, end_year=None) -> int: 构建步骤，增量遍历写入
+#   modules/lunar_table.py 定长二进制表（默认路径/年份来自 base.json），重建默认表后重置 mmap 单例
+# JieQiTerm: 节气名 + 交节时刻（frozen dataclass）
+# _build_jieqi_index(lunar_year) / _get_jieqi_index(lunar_year): 单个农历年 24 个交节时刻（升序，约 5ms），
+#   按年懒构建（双重检查加锁，同节日年度索引）
+# _get_jieqi_window(moment): moment 所在公历年 Y 与 Y+1 两个农历年索引拼接（覆盖 Y-1 冬至至 Y+1 冬至）
+# get_current_jieqi(moment) -> JieQiTerm: bisect 查当前节气
+# get_next_jieqi(moment) -> (JieQiTerm, timedelta): bisect 查下一节气及倒计时（UI"距下一节气 N 天"）
+#   异常处理：moment 所在公历年超出 base.json jieqi_index_years 抛 ValueError
+#   性能：只构建查询所需的两个农历年（约 10ms），不再首次查询即预建整个年份范围（200 年约 1s）
+#   设计理由：交节时刻固定不变，预先排序后查询免去逐次天文计算
 # get_chinese_date(now) -> str: 中文日期字符串
-# get_lunar_info(now) -> str: 拼装农历展示文本（空字段跳过）
+# get_lunar_info(now) -> str: 农历展示文本，经 (日期, 时辰桶) LRU 缓存（容量 base.json lunar_cache_size）
+#   输出只随日期与时辰变化，一天最多 12 次全量计算（原秒级缓存下为 86400 次）；加锁保证多线程安全
+# _shichen_bucket(hour): 小时 → 时辰序号（23 点并入子时）
+# _format_lunar_info(info): 拼装农历展示文本（空字段跳过）
+# get_lunar_cache_stats() / clear_lunar_cache(): 命中/未命中计数与容量查询、清空归零
 #   异常处理：节气/节日可能为空，统一转空字符串避免拼接 None
-#   关联配置：依赖 lunar-python 与 chinese-calendar 第三方库
+#   关联配置：依赖 lunar-python 与 chinese-calendar 第三方库（懒导入）；缓存容量来自 config/static/base.json
@@ -0,0 +1,112 @@
+# 时钟源模块（可注入时间来源：真实时钟 / 单调锚定时钟 / 模拟时钟）
+# time_dilation/alarm_service/倒计时面板经此取"当前时间"，测试与容量评估可脱离真实时间快进
+
+import datetime
+import time
+from abc import ABC, abstractmethod
+
+# now_ns() 计数起点：本地墙上时间 1970-01-01 00:00（naive，与 now() 同口径，不是 UTC 纪元）
+LOCAL_EPOCH = datetime.datetime(1970, 1, 1)
+
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+_NS_PER_SECOND = 1_000_000_000
+
+# 真实时钟本地 UTC 偏移缓存粒度（秒）：各时区偏移与切换时刻均落在 UTC 15 分钟边界上
+_OFFSET_BUCKET_SECONDS = 900
+
+
+class ClockSource(ABC):
+    @abstractmethod
+    def now(self) -> datetime.datetime:
+        # 当前本地时间（naive datetime，与 datetime.datetime.now() 同口径），子类必须实现
+        raise NotImplementedError
+
+    @abstractmethod
+    def now_ns(self) -> int:
+        # 当前本地时间距 LOCAL_EPOCH 的整数纳秒（整数运算路径用），子类必须实现
+        raise NotImplementedError
+
+    def sleep(self, seconds: float) -> None:
+        # 等待指定秒数（真实时钟阻塞休眠；模拟时钟改为直接推进时间）
+        time.sleep(seconds)
+
+
+class RealClock(ClockSource):
+    def __init__(self):
+        # 本地 UTC 偏移缓存：(偏移桶序号, 偏移纳秒)
+        self._offset: tuple[int, int] = (-1, 0)
+
+    def now(self) -> datetime.datetime:
+        # 直接读系统墙上时钟（默认时钟源，行为与原先直接调用 now() 一致）
+        return datetime.datetime.now()
+
+    def now_ns(self) -> int:
+        # time.time_ns() + 本地 UTC 偏移（含夏令时），纳秒精度且不构造 datetime；
+        # 偏移按 15 分钟桶缓存，每桶只调用一次 localtime
+        utc_ns = time.time_ns()
+        seconds = utc_ns // _NS_PER_SECOND
+        bucket = seconds // _OFFSET_BUCKET_SECONDS
+        if self._offset[0] != bucket:
+            self._offset = (bucket, time.localtime(seconds).tm_gmtoff * _NS_PER_SECOND)
+        return utc_ns + self._offset[1]
+
+
+class MonotonicClock(ClockSource):
+    def __init__(self, anchor: datetime.datetime | None = None):
+        # 构造时锚定一次墙上时间，此后只按 monotonic_ns 增量推进（不受系统校时/跳变影响）
+        self._anchor = anchor if anchor is not None else datetime.datetime.now()
+        self._anchor_ns = time.monotonic_ns()
+        self._anchor_local_ns = (self._anchor - LOCAL_EPOCH) // _ONE_MICROSECOND * 1000
+
+    def now(self) -> datetime.datetime:
+        # 锚点 + 单调时钟流逝量（微秒精度）
+        elapsed_us = (time.monotonic_ns() - self._anchor_ns) // 1000
+        return self._anchor + datetime.timedelta(microseconds=elapsed_us)
+
+    def now_ns(self) -> int:
+        # 锚点 + 单调时钟流逝量（纳秒精度，纯整数）
+        return self._anchor_local_ns + time.monotonic_ns() - self._anchor_ns
+
+
+class SimulatedClock(ClockSource):
+    def __init__(self, start: datetime.datetime):
+        # 模拟时钟：时间只在 advance/set/sleep 时前进，一天的 tick 可在毫秒级跑完
+        self._now = start
+
+    def now(self) -> datetime.datetime:
+        # 返回当前模拟时刻
+        return self._now
+
+    def now_ns(self) -> int:
+        # 当前模拟时刻距 LOCAL_EPOCH 的整数纳秒（微秒精度）
+        return (self._now - LOCAL_EPOCH) // _ONE_MICROSECOND * 1000
+
+    def advance(self, seconds: float | datetime.timedelta) -> datetime.datetime:
+        # 模拟时间前进（秒数或 timedelta），返回推进后的时刻
+        if not isinstance(seconds, datetime.timedelta):
+            seconds = datetime.timedelta(seconds=seconds)
+        self._now += seconds
+        return self._now
+
+    def set(self, moment: datetime.datetime) -> None:
+        # 直接跳转到指定时刻（允许回拨，用于构造跨天/边界场景）
+        self._now = moment
+
+    def sleep(self, seconds: float) -> None:
+        # 模拟休眠：不阻塞，直接推进模拟时间
+        self.advance(seconds)
+
+
+# ===== modules/clock_source.py 函数/类说明 =====
+# LOCAL_EPOCH: now_ns() 计数起点（本地墙上时间 1970-01-01 00:00，naive）
+# ClockSource(ABC): 时钟源抽象基类，抽象方法 now() 当前本地时间（naive）与
+#   now_ns() 距 LOCAL_EPOCH 的整数纳秒（AcceleratedWorld.get_custom_time 的整数运算路径经此取时），
+#   未实现二者的子类在构造时即抛 TypeError；sleep(seconds) 默认阻塞等待
+# RealClock: 系统墙上时钟（默认时钟源）；now_ns() 为 time.time_ns() + 本地 UTC 偏移
+#   （偏移按 UTC 15 分钟桶缓存，夏令时切换当刻即生效）
+# MonotonicClock(anchor=None): 构造时锚定墙上时间，之后按 time.monotonic_ns 增量推进，
+#   不受系统校时回拨影响（长时间运行的 CLI/守护进程适用）；now_ns() 纳秒精度
+# SimulatedClock(start): 模拟时钟，advance/set 手动推进，sleep 直接推进不阻塞；now_ns() 微秒精度
+#   设计理由：时间来源可注入后，AcceleratedWorld/AlarmManager/CountdownPanel 均可用模拟时钟
+#   快进驱动（一天的 tick 毫秒级跑完），测试无需打桩 datetime 模块
+#   关联配置：无；由 modules/time_dilation.py、modules/alarm_service.py、ui 面板消费
@@ -0,0 +1,136 @@
+# 分段膨胀日程模块（一天内按时段切换倍率，如会议 1x、专注 4x）
+# 时段起点与累计膨胀纳秒前缀和预先算好，正向（标准 → 膨胀）与反向（膨胀 → 标准）均为 O(log n) 二分
+
+import bisect
+from fractions import Fraction
+from typing import Any, Iterable
+
+# 静态配置（倍率范围）
+from config.static.static_config import get_static_config
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86400 * _NS_PER_SECOND
+
+
+def _parse_start(start: str | int | float) -> int:
+    # 时段起点 "HH:MM[:SS]" 或当天秒数 → 当天纳秒数；格式错误/越界抛 ValueError
+    if isinstance(start, str):
+        parts = start.strip().split(":")
+        try:
+            if len(parts) not in (2, 3):
+                raise ValueError
+            hour, minute, second = (int(p) for p in parts + ["0"] * (3 - len(parts)))
+        except ValueError:
+            raise ValueError(f"时段起点格式错误: {start}，应为 HH:MM[:SS]") from None
+        if not (0 <= minute < 60 and 0 <= second < 60):
+            raise ValueError(f"时段起点分/秒越界: {start}")
+        start_ns = (hour * 3600 + minute * 60 + second) * _NS_PER_SECOND
+    else:
+        start_ns = int(Fraction(str(start)) * _NS_PER_SECOND)
+    if not 0 <= start_ns < _NS_PER_DAY:
+        raise ValueError(f"时段起点超出当天范围: {start}")
+    return start_ns
+
+
+class DilationSchedule:
+    __slots__ = ("starts", "rates", "prefix", "_ratios", "_arrays")
+
+    def __init__(self, segments: Iterable[tuple[str | int | float, float]]):
+        # segments: (起点, 倍率) 序列，第一段须从 00:00 开始、起点严格递增，每段持续到下一段起点（末段到午夜）；
+        # 倍率按十进制字面值转有理数（与 AcceleratedWorld.rate_fraction 同口径），
+        # 每段须在 [rate_min, rate_max] 内（与 main.py --rate 同一范围与错误文案）
+        base = get_static_config().base
+        rate_min, rate_max = base["rate_min"], base["rate_max"]
+        parsed = [(_parse_start(start), rate) for start, rate in segments]
+        if not parsed or parsed[0][0] != 0:
+            raise ValueError("膨胀日程第一段必须从 00:00 开始")
+        for (prev, _), (start, _) in zip(parsed, parsed[1:]):
+            if start <= prev:
+                raise ValueError("膨胀日程时段起点必须严格递增")
+        for _, rate in parsed:
+            if not rate_min <= rate <= rate_max:
+                raise ValueError(f"膨胀日程倍率必须在 {rate_min} 到 {rate_max} 之间: {rate}")
+
+        self.starts = tuple(start for start, _ in parsed)  # 各段起点（当天标准纳秒）
+        self.rates = tuple(float(rate) for _, rate in parsed)  # 各段倍率
+        self._ratios = tuple(Fraction(str(rate)).as_integer_ratio() for _, rate in parsed)
+        # prefix[i]: 第 i 段起点的累计膨胀纳秒（整数运算，与 get_custom_time 同一取整口径）；
+        # 共 n+1 项，末项为一天膨胀总纳秒
+        prefix = [0]
+        for start, end, (numerator, denominator) in zip(
+            self.starts, self.starts[1:] + (_NS_PER_DAY,), self._ratios
+        ):
+            prefix.append(prefix[-1] + (end - start) * numerator // denominator)
+        self.prefix = tuple(prefix)
+        self._arrays = None  # 起点/前缀和/分子/分母 ndarray（批量换算用，首次需要时生成）
+
+    @classmethod
+    def parse(cls, spec: str) -> "DilationSchedule":
+        # 文本格式 "00:00=1,09:00=4,12:00=1"（命令行 --schedule 用）
+        segments = []
+        for item in spec.split(","):
+            start, sep, rate = item.partition("=")
+            if not sep:
+                raise ValueError(f"膨胀日程格式错误: {item}，应为 HH:MM=倍率")
+            try:
+                segments.append((start, float(rate)))
+            except ValueError:
+                raise ValueError(f"膨胀日程倍率不是数字: {item}") from None
+        return cls(segments)
+
+    @property
+    def total_ns(self) -> int:
+        # 一天膨胀总纳秒（前缀和末项）
+        return self.prefix[-1]
+
+    def rate_at(self, day_ns: int) -> float:
+        # 当天标准纳秒所在时段的倍率
+        return self.rates[bisect.bisect_right(self.starts, day_ns) - 1]
+
+    def dilated_ns(self, day_ns: int) -> int:
+        # 正向：当天标准纳秒 → 当天膨胀纳秒（二分定位时段 + 段内整数乘除）
+        i = bisect.bisect_right(self.starts, day_ns) - 1
+        numerator, denominator = self._ratios[i]
+        return self.prefix[i] + (day_ns - self.starts[i]) * numerator // denominator
+
+    def standard_ns(self, dilated_ns: int) -> int:
+        # 反向：膨胀纳秒 d → 正向结果 ≥ d 的最小当天标准纳秒（二分定位前缀和 + 段内向上取整除法）；
+        # 超出一天膨胀范围抛 ValueError
+        if not 0 <= dilated_ns < self.prefix[-1]:
+            raise ValueError(f"膨胀时间超出当天范围: {dilated_ns}ns")
+        i = bisect.bisect_right(self.prefix, dilated_ns) - 1
+        numerator, denominator = self._ratios[i]
+        return self.starts[i] - (-(dilated_ns - self.prefix[i]) * denominator // numerator)
+
+    def dilated_ns_array(self, day_ns: Any, np: Any) -> Any:
+        # 正向的 ndarray 版本（批量换算用）：searchsorted 定位时段，段内同样整数乘除，逐项与 dilated_ns 相等；
+        # 段内纳秒拆成 (商 × 分子 + 余数 × 分子 // 分母) 避免 int64 中间积溢出，分子×分母过大时退回 object 数组
+        if self._arrays is None:
+            numerators, denominators = zip(*self._ratios)
+            wide = max(n * d for n, d in self._ratios) >= 2**63
+            dtype = object if wide else np.int64
+            self._arrays = tuple(
+                np.array(values, dtype=dtype)
+                for values in (self.starts, self.prefix[:-1], numerators, denominators)
+            )
+        starts, prefix, numerators, denominators = self._arrays
+        index = np.searchsorted(starts, day_ns, side="right") - 1
+        numerator = numerators[index]
+        quotient, remainder = np.divmod(day_ns - starts[index], denominators[index])
+        return (
+            prefix[index] + quotient * numerator + remainder * numerator // denominators[index]
+        ).astype(np.int64)
+
+
+# ===== modules/dilation_schedule.py 函数/类说明 =====
+# _parse_start(start) -> int: 时段起点（"HH:MM[:SS]" 或当天秒数）→ 当天纳秒，非法抛 ValueError
+# DilationSchedule(segments): 分段膨胀日程，segments 为 (起点, 倍率)，第一段从 00:00 开始、起点严格递增
+#   starts/rates/prefix: 各段起点纳秒、倍率、累计膨胀纳秒前缀和（n+1 项，末项为一天总量）
+#   parse(spec): "00:00=1,09:00=4,12:00=1" 文本格式（main.py --schedule）
+#   total_ns: 一天膨胀总纳秒；rate_at(day_ns): 所在时段倍率
+#   dilated_ns(day_ns): 正向 O(log n)，bisect 定位时段 + 段内整数乘除（与 get_custom_time 同一取整口径）
+#   standard_ns(dilated_ns): 反向 O(log n)，bisect 前缀和 + 段内向上取整，得到正向结果 ≥ 目标的最小标准纳秒
+#   dilated_ns_array(day_ns, np): dilated_ns 的 ndarray 版本（searchsorted 定位时段 + 段内整数乘除，逐项与标量相等）
+#   设计理由：倍率按时段变化后膨胀时间是分段线性函数，前缀和使任意时刻只需一次二分，不随段数线性扫描
+#   异常处理：格式错误、起点非递增/不从 00:00 开始、倍率超出 [rate_min, rate_max]、反向越界均抛 ValueError
+#   关联配置：base.json rate_min/rate_max；由 modules/time_dilation.py AcceleratedWorld(schedule=...) 消费
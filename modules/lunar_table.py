@@ -0,0 +1,186 @@
+# 农历预计算表模块（定长二进制文件 + mmap 按日序号 O(1) 查询）
+# 表内容由 modules/chinese_calendar.py build_lunar_table() 生成；本模块只负责格式读写，不依赖农历库
+
+import datetime
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Iterable, Sequence
+
+# 项目根定位
+from utils.file_utils import get_project_root
+
+# 静态配置（表文件路径）
+from config.static.static_config import get_static_config
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 文件头：魔数、格式版本、单条记录字节数、首日 ordinal、天数、字符串表字节数
+_HEADER = struct.Struct("<4sHHIII")
+_MAGIC = b"AWLT"
+_VERSION = 1
+
+# 单日记录：干支年/生肖/农历月/农历日/月相/节气 各 1 字节字符串表下标，节日 2 字节下标
+_RECORD = struct.Struct("<6BH")
+
+# 记录列（顺序即文件列序，也是 lookup 返回元组的字段顺序）
+TABLE_COLUMNS = (
+    "lunar_year",
+    "shengxiao",
+    "lunar_month",
+    "lunar_day",
+    "yue_phase",
+    "jieqi",
+    "public_holiday",
+)
+
+# 各列下标上限（与 _RECORD 各字段宽度对应）
+_COLUMN_LIMITS = (0xFF,) * 6 + (0xFFFF,)
+
+
+def write_lunar_table(
+    path: Path | str, first_day: datetime.date, rows: Iterable[Sequence[str]]
+) -> int:
+    # 逐日行（按 TABLE_COLUMNS 顺序的字符串）→ 各列去重字符串表 + 定长下标记录，返回写入天数
+    tables: list[dict[str, int]] = [{"": 0} for _ in TABLE_COLUMNS]
+    records = bytearray()
+    count = 0
+    for row in rows:
+        indexes = []
+        for column, value in enumerate(row):
+            table = tables[column]
+            index = table.get(value)
+            if index is None:
+                index = table[value] = len(table)
+                if index > _COLUMN_LIMITS[column]:
+                    raise ValueError(f"农历表列 {TABLE_COLUMNS[column]} 取值种类超出上限")
+            indexes.append(index)
+        records += _RECORD.pack(*indexes)
+        count += 1
+
+    strings = json.dumps([list(t) for t in tables], ensure_ascii=False).encode("utf-8")
+    file_path = Path(path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    # 原子替换：先写同目录临时文件并落盘，再 os.replace 覆盖目标；不原地截断正被 mmap 的旧表
+    # （Linux 上读方访问被截断页会 SIGBUS），写入中途崩溃也只留下临时文件，目标仍是完整旧表
+    fd, temp_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(
+                _HEADER.pack(
+                    _MAGIC, _VERSION, _RECORD.size, first_day.toordinal(), count, len(strings)
+                )
+            )
+            f.write(strings)
+            f.write(records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, file_path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return count
+
+
+class LunarTable:
+    def __init__(self, path: Path | str):
+        # 打开并 mmap 表文件，校验文件头后解析字符串表；格式不符抛 ValueError
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, record_size, first_ordinal, count, strings_len = (
+                _HEADER.unpack_from(self._mmap, 0)
+            )
+            if magic != _MAGIC or version != _VERSION or record_size != _RECORD.size:
+                raise ValueError(f"农历表格式不匹配: {path}")
+            self._data_offset = _HEADER.size + strings_len
+            if len(self._mmap) < self._data_offset + count * record_size:
+                raise ValueError(f"农历表文件截断: {path}")
+            strings = self._mmap[_HEADER.size : self._data_offset].decode("utf-8")
+            self._strings: list[list[str]] = json.loads(strings)
+        except (struct.error, ValueError) as e:
+            # 格式不符/截断/字符串表损坏统一转 ValueError，并释放已建立的映射
+            self._mmap.close()
+            raise ValueError(f"农历表文件无效: {path}（{e}）") from e
+        self.first_ordinal = first_ordinal
+        self.count = count
+
+    @property
+    def first_day(self) -> datetime.date:
+        # 表覆盖的首日
+        return datetime.date.fromordinal(self.first_ordinal)
+
+    @property
+    def last_day(self) -> datetime.date:
+        # 表覆盖的末日（含）
+        return datetime.date.fromordinal(self.first_ordinal + self.count - 1)
+
+    def lookup(self, day: datetime.date) -> tuple[str, ...] | None:
+        # 日序号直接定位记录（O(1)），表范围外返回 None 由调用方走慢路径
+        offset = day.toordinal() - self.first_ordinal
+        if not 0 <= offset < self.count:
+            return None
+        indexes = _RECORD.unpack_from(self._mmap, self._data_offset + offset * _RECORD.size)
+        return tuple(column[i] for column, i in zip(self._strings, indexes))
+
+    def close(self) -> None:
+        # 释放 mmap
+        self._mmap.close()
+
+
+# 默认表单例：(是否已尝试加载, LunarTable | None)，文件缺失只尝试一次
+_default_table: tuple[bool, LunarTable | None] = (False, None)
+
+
+def get_lunar_table_path() -> Path:
+    # 默认表文件路径（项目内，来自静态配置 lunar_table_path）
+    return get_project_root() / get_static_config().base["lunar_table_path"]
+
+
+def get_lunar_table() -> LunarTable | None:
+    # 懒加载默认表；文件缺失/损坏时返回 None（调用方走 lunar-python 慢路径）
+    global _default_table
+    loaded, table = _default_table
+    if loaded:
+        return table
+    path = get_lunar_table_path()
+    table = None
+    if path.exists():
+        try:
+            table = LunarTable(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"农历预计算表不可用，回退实时计算: {e}")
+    _default_table = (True, table)
+    return table
+
+
+def reset_lunar_table(table: LunarTable | None = None, loaded: bool = False) -> None:
+    # 重置默认表单例（重新构建表后或测试注入用）；loaded=True 时直接使用传入的 table
+    global _default_table
+    _, old = _default_table
+    if old is not None and old is not table:
+        old.close()
+    _default_table = (loaded, table)
+
+
+# ===== modules/lunar_table.py 函数/常量说明 =====
+# 文件格式：_HEADER（魔数 AWLT/版本/记录字节数/首日 ordinal/天数/字符串表字节数）
+#   + UTF-8 JSON 字符串表（每列一个去重列表，下标 0 恒为空串）+ 定长记录（_RECORD，8 字节/天）
+# TABLE_COLUMNS: 记录列顺序（干支年/生肖/农历月/农历日/月相/节气/公历节日）
+# write_lunar_table(path, first_day, rows) -> int: 逐日行写表，返回天数；列取值种类超宽抛 ValueError
+#   写入同目录临时文件并 fsync 后 os.replace 原子覆盖：已打开的 LunarTable（mmap）继续读旧文件内容，
+#   不因原地截断触发 SIGBUS（Windows 上原地打开会 PermissionError）；中途失败删除临时文件，目标不损坏
+# LunarTable(path): mmap 只读打开，lookup(day) 按 ordinal 差值 O(1) 定位，范围外返回 None
+#   first_day/last_day: 覆盖范围；close(): 释放 mmap；格式不符/截断/损坏抛 ValueError
+# get_lunar_table_path() / get_lunar_table(): 默认表路径与懒加载单例（缺失或损坏返回 None）
+# reset_lunar_table(table=None, loaded=False): 重建表后重置单例，或测试注入指定表
+#   设计理由：200 年逐日农历字段约 600KB，mmap 按需分页，查询不构建 lunar-python 对象图；
+#   时辰/财神方位与小时/公历月相关，不入表，由调用方实时计算
+#   关联配置：路径 config/static/base.json lunar_table_path；年份范围 lunar_table_years
@@ -1,11 +1,18 @@
 # 时间膨胀核心模块
 # 提供 AcceleratedWorld 类与 CLI 实时钟入口
 
+import calendar
 import datetime
 import logging
+import math
+import string
 import time
 import sys
+from array import array
 from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, Iterable, Sequence
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -16,22 +23,129 @@ from modules.chinese_calendar import get_chinese_date, get_lunar_info
 # 静态配置（默认倍率）
 from config.static.static_config import get_static_config
 
+# 可注入时钟源（默认真实时钟）
+from modules.clock_source import LOCAL_EPOCH, ClockSource, RealClock
+
+# 分段膨胀日程（按时段切换倍率，前缀和 + 二分换算）
+from modules.dilation_schedule import DilationSchedule
+
+# 共享内存时间快照（读方辅助函数用）
+from modules.time_snapshot import TimeSnapshotReader
+
+
+class LazyDateFields:
+    __slots__ = ("moment", "_chinese_date", "_lunar_info")
+
+    def __init__(
+        self,
+        moment: datetime.datetime | None,
+        chinese_date: str | None = None,
+        lunar_info: str | None = None,
+    ):
+        # 与倍率无关的日期字段：已给定则直接持有，否则首次访问时按 moment 计算并缓存
+        self.moment = moment
+        self._chinese_date = chinese_date
+        self._lunar_info = lunar_info
+
+    @property
+    def chinese_date(self) -> str:
+        # 中文日期（首次访问才格式化）
+        if self._chinese_date is None:
+            self._chinese_date = get_chinese_date(self.moment) if self.moment else ""
+        return self._chinese_date
+
+    @property
+    def lunar_info(self) -> str:
+        # 农历信息（tick 中最昂贵的部分，首次访问才计算）
+        if self._lunar_info is None:
+            self._lunar_info = get_lunar_info(self.moment) if self.moment else ""
+        return self._lunar_info
+
 
-@dataclass
 class TimeInfo:
-    standard_datetime: str  # 标准日期时间字符串
-    custom_time: str  # 自定义时间字符串
-    chinese_date: str  # 中文日期字符串（YYYY年MM月DD日 星期X）
-    lunar_info: str  # 农历信息字符串
-    dilation_percentage: float  # 时间膨胀倍率百分比
-    expanded_hours_per_day: float  # 膨胀后一天的小时数
-    remaining_hours: float  # 加速后当天剩余的小时数
+    __slots__ = (
+        "standard_datetime",  # 标准日期时间字符串
+        "custom_time",  # 自定义时间字符串
+        "dilation_percentage",  # 时间膨胀倍率百分比
+        "expanded_hours_per_day",  # 膨胀后一天的小时数
+        "remaining_hours",  # 加速后当天剩余的小时数
+        "custom_millisecond",  # 自定义时间毫秒部分（毫秒分辨率取时才刷新，否则为 0）
+        "_date_fields",  # 中文日期/农历（LazyDateFields，同一标准秒内多个 TimeInfo 共享）
+    )
+
+    def __init__(
+        self,
+        standard_datetime: str,
+        custom_time: str,
+        chinese_date: str | None = None,
+        lunar_info: str | None = None,
+        dilation_percentage: float = 0.0,
+        expanded_hours_per_day: float = 0.0,
+        remaining_hours: float = 0.0,
+        date_fields: LazyDateFields | None = None,
+        custom_millisecond: int = 0,
+    ):
+        # 字段顺序与原 dataclass 一致；chinese_date/lunar_info 未给定时经 date_fields 惰性计算
+        self.standard_datetime = standard_datetime
+        self.custom_time = custom_time
+        self.dilation_percentage = dilation_percentage
+        self.expanded_hours_per_day = expanded_hours_per_day
+        self.remaining_hours = remaining_hours
+        self.custom_millisecond = custom_millisecond
+        if date_fields is None:
+            date_fields = LazyDateFields(None, chinese_date, lunar_info)
+        self._date_fields = date_fields
+
+    def _fields(self) -> tuple:
+        # 参与值比较的公开字段（与原 dataclass 字段一致，另含毫秒部分）
+        return (
+            self.standard_datetime,
+            self.custom_time,
+            self.chinese_date,
+            self.lunar_info,
+            self.dilation_percentage,
+            self.expanded_hours_per_day,
+            self.remaining_hours,
+            self.custom_millisecond,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        # 值相等（保持原 dataclass 语义）；比较会触发惰性日期字段计算
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+
+    # 与原 dataclass(eq=True) 一致：可变值对象不可哈希
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        # 调试输出不触发惰性字段计算
+        return (
+            f"TimeInfo(standard_datetime={self.standard_datetime!r}, "
+            f"custom_time={self.custom_time!r}, "
+            f"dilation_percentage={self.dilation_percentage!r})"
+        )
+
+    @property
+    def chinese_date(self) -> str:
+        # 中文日期字符串（YYYY年MM月DD日 星期X），首次访问才计算
+        return self._date_fields.chinese_date
+
+    @property
+    def lunar_info(self) -> str:
+        # 农历信息字符串，首次访问才计算（CLI/托盘等只读 custom_time 的路径零开销）
+        return self._date_fields.lunar_info
 
     @property
     def standard_time(self) -> str:
         # 标准时间的 HH:MM:SS 部分（显示用，避免调用点重复 split）
         return self.standard_datetime.split()[1]
 
+    @property
+    def custom_time_ms(self) -> str:
+        # 毫秒分辨率自定义时间 HH:MM:SS.mmm（需以 get_custom_time(milliseconds=True) 取得）
+        return f"{self.custom_time}.{self.custom_millisecond:03d}"
+
     @property
     def custom_hour(self) -> int:
         # 自定义时间小时数（进度条用）
@@ -43,152 +157,700 @@ class TimeInfo:
         return int(self.custom_time.split(":")[-1])
 
 
+@dataclass
+class CustomTimeBatch:
+    hours: Any  # 自定义小时数组（输入为 ndarray 时为 int64 ndarray，否则 array('l')）
+    minutes: Any  # 自定义分钟数组
+    seconds: Any  # 自定义秒数组
+    remaining_hours: Any  # 加速后当天剩余小时数组（float64 ndarray / array('d')）
+
+    def __len__(self) -> int:
+        # 批量条目数（各数组等长）
+        return len(self.hours)
+
+
+@dataclass(frozen=True)
+class AcceleratedDate:
+    elapsed_seconds: int  # 纪元以来膨胀秒数（向下取整，纪元之前为负）
+    days: int  # 膨胀天数（24 膨胀小时为一天，向下取整）
+    weeks: int  # 膨胀周数（days // 7）
+    years: int  # 膨胀整年数（加速日历时刻距纪元的公历周年数）
+    moment: datetime.datetime  # 加速日历时刻（纪元 + 膨胀流逝时长，公历）
+
+
+@dataclass
+class AcceleratedDateBatch:
+    elapsed_seconds: Any  # 纪元以来膨胀秒数组（向下取整，int64 ndarray / array('q')）
+    days: Any  # 膨胀天数数组（int64 ndarray / array('q')）
+    weeks: Any  # 膨胀周数数组
+    years: Any  # 膨胀整年数数组
+
+    def __len__(self) -> int:
+        # 批量条目数（各数组等长）
+        return len(self.days)
+
+
+def _whole_years(epoch: datetime.datetime, moment: datetime.datetime) -> int:
+    # 纪元到 moment 的公历整年数（未到周年日减一；纪元为 2/29 时非闰年周年日视为 3/1）
+    month, day = epoch.month, epoch.day
+    if (month, day) == (2, 29) and not calendar.isleap(moment.year):
+        month, day = 3, 1
+    before_anniversary = (moment.month, moment.day, moment.time()) < (month, day, epoch.time())
+    return moment.year - epoch.year - before_anniversary
+
+
+def _split_custom_seconds(custom_total_seconds: Any, custom_hours_per_day: int) -> tuple:
+    # 自定义整秒数 → (时, 分, 秒)：标量与 int64 ndarray 共用的整除/取模运算（get_custom_time 与批量换算同源）
+    custom_hour = (custom_total_seconds // 3600) % custom_hours_per_day
+    custom_minute = (custom_total_seconds % 3600) // 60
+    custom_second = custom_total_seconds % 60
+    return custom_hour, custom_minute, custom_second
+
+
+def format_custom_time(custom_ns: int, custom_hours_per_day: int) -> str:
+    # 当天自定义纳秒 → "HH:MM:SS"（get_custom_time 与 modules/world_registry.py 共用的格式化）
+    hour, minute, second = _split_custom_seconds(custom_ns // _NS_PER_SECOND, custom_hours_per_day)
+    return f"{hour:02d}:{minute:02d}:{second:02d}"
+
+
+# 边界对齐休眠余量（秒）：醒来时保证已跨过目标秒边界，避免恰好早到一点而空转一轮
+_TICK_MARGIN_SECONDS = 0.001
+
+# 整数运算路径时间单位（纳秒）
+_NS_PER_MILLISECOND = 1_000_000
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_HOUR = 3600 * _NS_PER_SECOND
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+# NumPy 批量路径 int64 纳秒的 epoch 秒上限（留出 UTC 偏移余量）
+_MAX_ARRAY_EPOCH_SECONDS = 9.2e9
+
+
+# 高频模式预格式化数字表：一小时内 "MM:SS"（按秒序号 0..3599 索引）与 ".mmm"（按毫秒 0..999 索引）
+_MINUTE_SECOND_TEXT = tuple(f"{m:02d}:{s:02d}" for m in range(60) for s in range(60))
+_MILLISECOND_TEXT = tuple(f".{ms:03d}" for ms in range(1000))
+
+
+class MillisecondFormatter:
+    __slots__ = ("hours_per_day", "_hour_text", "_prefix", "_second", "_head")
+
+    def __init__(self, hours_per_day: int, prefix: str = ""):
+        # 当天自定义毫秒数 → prefix + "HH:MM:SS.mmm"；小时表按一天小时数预建（倍率变化时重建实例）
+        self.hours_per_day = hours_per_day
+        self._hour_text = tuple(f"{h:02d}:" for h in range(hours_per_day))
+        self._prefix = prefix
+        self._second = -1  # 已缓存行首对应的自定义秒序号
+        self._head = ""  # prefix + "HH:MM:SS"（同一自定义秒内复用）
+
+    def set_prefix(self, prefix: str) -> None:
+        # 更换行首文本（如标准秒变化），下一帧重建行首
+        self._prefix = prefix
+        self._second = -1
+
+    def format(self, custom_ms: int) -> str:
+        # 查表拼接：自定义秒变化时重建行首（两次拼接），其余帧仅行首 + 毫秒表项一次拼接
+        second, millisecond = divmod(custom_ms, 1000)
+        if second != self._second:
+            hour = second // 3600 % self.hours_per_day
+            self._head = self._prefix + self._hour_text[hour] + _MINUTE_SECOND_TEXT[second % 3600]
+            self._second = second
+        return self._head + _MILLISECOND_TEXT[millisecond]
+
+
+def _local_ns(moment: datetime.datetime) -> int:
+    # 本地 naive 时刻 → 距 LOCAL_EPOCH 的整数纳秒（与 ClockSource.now_ns() 同口径，微秒精度）
+    return (moment - LOCAL_EPOCH) // datetime.timedelta(microseconds=1) * 1000
+
+
+def _utc_offset_seconds(epoch_seconds: float) -> int:
+    # 指定时刻的本地 UTC 偏移（秒，含夏令时），与 datetime.now() 的本地时间口径一致
+    return time.localtime(int(epoch_seconds // 1)).tm_gmtoff
+
+
+def _epoch_local_ns(epoch_seconds: float, utc_offset: int) -> int:
+    # epoch 秒 + 本地 UTC 偏移 → 距 LOCAL_EPOCH 的整数纳秒（先取整到微秒，与 now_ns()/_local_ns 同口径）
+    return round(epoch_seconds * 1_000_000) * 1000 + utc_offset * _NS_PER_SECOND
+
+
+def _epoch_local_ns_array(epoch_seconds: Any, np: Any) -> Any:
+    # ndarray 版本：本地 UTC 偏移按小时桶 np.unique 去重后查表（夏令时正确），结果为 int64 纳秒数组；
+    # int64 纳秒可表示约 1678–2262 年，超出抛 ValueError（不静默回绕）
+    ts = np.asarray(epoch_seconds, dtype=np.float64)
+    if ts.size and not np.all(np.abs(ts) < _MAX_ARRAY_EPOCH_SECONDS):
+        raise ValueError("批量换算时刻超出 int64 纳秒可表示范围")
+    buckets, inverse = np.unique(np.floor_divide(ts, 3600), return_inverse=True)
+    offsets = np.fromiter(
+        (_utc_offset_seconds(b * 3600) for b in buckets),
+        dtype=np.int64,
+        count=len(buckets),
+    )
+    return (
+        np.rint(ts * 1e6).astype(np.int64) * 1000
+        + offsets[inverse.reshape(ts.shape)] * _NS_PER_SECOND
+    )
+
+
+def _scale_ns_array(values: Any, numerator: int, denominator: int, np: Any) -> Any:
+    # int64 数组 × 分子 // 分母，与标量 x * numerator // denominator 逐项相等：
+    # 拆成 (x // 分母) × 分子 + (x % 分母) × 分子 // 分母 避免中间积溢出；分子×分母超出 int64 时退回 object 数组
+    if numerator * denominator >= 2**63:
+        values = values.astype(object)
+    quotient, remainder = np.divmod(values, denominator)
+    return (quotient * numerator + remainder * numerator // denominator).astype(np.int64)
+
+
 class AcceleratedWorld:
     time_dilation_rate: float
-    """时间膨胀倍率（下限来自静态配置 rate_min，默认 default_rate）"""
+    """时间膨胀倍率（下限来自静态配置 rate_min，默认 default_rate；分段日程时为全天平均倍率）"""
+
+    rate_fraction: Fraction
+    """倍率的精确有理数表示（按十进制字面值，2.3 → 23/10），整数运算路径用"""
+
+    schedule: DilationSchedule | None
+    """分段膨胀日程（给定时按时段倍率换算，忽略 time_dilation_rate 参数）"""
 
     custom_hours_per_day: int
     """基于膨胀率计算的一天总小时数"""
 
-    def __init__(self, time_dilation_rate: float | None = None):
+    calendar_epoch: datetime.datetime
+    """加速日历纪元（本地 naive 时刻，默认 base.json calendar_epoch），膨胀天/周/年自此起算"""
+
+    def __init__(
+        self,
+        time_dilation_rate: float | None = None,
+        clock: ClockSource | None = None,
+        schedule: DilationSchedule | None = None,
+        calendar_epoch: datetime.datetime | None = None,
+    ):
         # None 哨兵避免默认参数在定义时求值硬编码；下限读 base.rate_min（消除与配置的 1.0 边界矛盾）
+        # clock 为时间来源（默认真实时钟），注入模拟时钟即可快于真实时间驱动
+        # schedule 给定时各时段倍率由日程决定（各段已校验 rate_min..rate_max），time_dilation_rate 取全天平均倍率
         base = get_static_config().base
-        if time_dilation_rate is None:
-            time_dilation_rate = float(base["default_rate"])
-        rate_min = float(base["rate_min"])
-        if time_dilation_rate < rate_min:
-            raise ValueError(f"时间膨胀倍率必须大于或等于{rate_min}！")
+        self.schedule = schedule
+        if schedule is not None:
+            self.rate_fraction = Fraction(schedule.total_ns, _NS_PER_DAY)
+            time_dilation_rate = float(self.rate_fraction)
+        else:
+            if time_dilation_rate is None:
+                time_dilation_rate = float(base["default_rate"])
+            rate_min = float(base["rate_min"])
+            if time_dilation_rate < rate_min:
+                raise ValueError(f"时间膨胀倍率必须大于或等于{rate_min}！")
+            # str() 取十进制最短表示，避免 Fraction(2.3) 的二进制展开（分母 2^50 级）
+            self.rate_fraction = Fraction(str(time_dilation_rate))
         self.time_dilation_rate = time_dilation_rate
-        self.custom_hours_per_day = int(
-            24 * time_dilation_rate
-        )  # 计算一天的自定义小时数
-        self._time_cache: tuple[tuple[int, ...], TimeInfo] | None = (
-            None  # (标准秒键, TimeInfo) 秒级缓存
-        )
-
-    def get_custom_time(self) -> TimeInfo:
-        # 同秒内直接返回缓存，避免 GUI 10Hz tick 重复农历全量计算（S9.3）
-        # 基于当前时刻秒数 × 倍率得到自定义秒数，再拆分时分秒
-        # 获取当前系统时间（带毫秒精度）
-        now = datetime.datetime.now()
-        cache_key = (now.year, now.month, now.day, now.hour, now.minute, now.second)
+        self._rate_ratio = self.rate_fraction.as_integer_ratio()
+        # 一天自定义总纳秒数（剩余小时/反向换算范围用）
+        self._custom_ns_per_day = _NS_PER_DAY * self._rate_ratio[0] // self._rate_ratio[1]
+        self.clock = clock if clock is not None else RealClock()
+        # 计算一天的自定义小时数（整数纳秒整除，与 int(24 * rate) 一致）
+        self.custom_hours_per_day = self._custom_ns_per_day // _NS_PER_HOUR
+        # 加速日历纪元：预先拆成（标准日序号, 当天膨胀纳秒），任意时刻的膨胀流逝量即为闭式 O(1)
+        if calendar_epoch is None:
+            calendar_epoch = datetime.datetime.fromisoformat(base["calendar_epoch"])
+        self.calendar_epoch = calendar_epoch
+        epoch_day, epoch_day_ns = divmod(_local_ns(calendar_epoch), _NS_PER_DAY)
+        self._epoch_day = epoch_day
+        self._epoch_custom_ns = self._custom_ns(epoch_day_ns)
+        self._time_cache: tuple[tuple[int, int, int], TimeInfo] | None = (
+            None  # ((标准秒序号, 自定义时间单位, 自定义单位序号), TimeInfo) 秒级/毫秒级缓存
+        )
+        self._date_cache: tuple[int, str, LazyDateFields] | None = (
+            None  # (标准秒序号, 标准日期时间, 惰性日期字段) 与倍率无关部分的秒级缓存
+        )
+
+    def get_custom_time(self, milliseconds: bool = False) -> TimeInfo:
+        # 标准秒与自定义秒（milliseconds=True 时为自定义毫秒）均未变时直接返回缓存；
+        # 农历等与倍率无关部分仅按标准秒缓存（S9.3）
+        return self._time_info(self.clock.now_ns(), milliseconds)
+
+    def get_custom_frame(self) -> tuple[TimeInfo, int]:
+        # 高频帧取时：一次读时钟得到（秒级缓存 TimeInfo, 当天自定义毫秒数），两者同一时刻、口径一致；
+        # 同一自定义秒内返回同一 TimeInfo 对象，每帧只做整数运算不分配新对象
+        local_ns = self.clock.now_ns()
+        custom_ms = self._custom_ns(local_ns % _NS_PER_DAY) // _NS_PER_MILLISECOND
+        return self._time_info(local_ns, False), custom_ms
+
+    def _custom_ns(self, day_ns: int) -> int:
+        # 当天标准纳秒 → 当天自定义纳秒：恒定倍率为 × 分子 // 分母，分段日程为前缀和 + 二分（O(log n)）
+        if self.schedule is not None:
+            return self.schedule.dilated_ns(day_ns)
+        numerator, denominator = self._rate_ratio
+        return day_ns * numerator // denominator
+
+    def dilation_at(self, local_ns: int) -> tuple[int, float, float]:
+        # 外部调用方（多倍率注册表）用的单次换算：本地纳秒（距 LOCAL_EPOCH，与 clock.now_ns() 同口径）→
+        # (当天自定义纳秒, 当前倍率百分比, 当天剩余自定义小时)，与 get_custom_time 同一整数运算
+        day_ns = local_ns % _NS_PER_DAY
+        custom_ns = self._custom_ns(day_ns)
+        remaining_hours = (self._custom_ns_per_day - custom_ns) / _NS_PER_HOUR
+        return custom_ns, self._dilation_percentage(day_ns), remaining_hours
+
+    def _dilation_percentage(self, day_ns: int) -> float:
+        # 当前倍率百分比（分段日程取所在时段倍率）
+        if self.schedule is not None:
+            return self.schedule.rate_at(day_ns) * 100
+        return self.time_dilation_rate * 100
+
+    def _standard_ns(self, custom_ns: int) -> int:
+        # 反解：正向换算结果 ≥ custom_ns 的最小当天标准纳秒（恒定倍率向上取整除法，日程二分前缀和）
+        if self.schedule is not None:
+            return self.schedule.standard_ns(custom_ns)
+        numerator, denominator = self._rate_ratio
+        return -(-custom_ns * denominator // numerator)
+
+    def _time_info(self, local_ns: int, milliseconds: bool) -> TimeInfo:
+        # 整数纳秒运算：当天纳秒数 × 倍率分子 // 分母（或分段日程），无浮点舍入，边界处不抖动
+        custom_ns = self._custom_ns(local_ns % _NS_PER_DAY)
+
+        # 缓存键含自定义时间单位序号：rate>1 时同一标准秒内自定义秒会变化，需刷新显示
+        standard_second = local_ns // _NS_PER_SECOND
+        unit = _NS_PER_MILLISECOND if milliseconds else _NS_PER_SECOND
+        cache_key = (standard_second, unit, custom_ns // unit)
         if self._time_cache is not None and self._time_cache[0] == cache_key:
             return self._time_cache[1]
 
-        # 格式化标准日期时间（只显示到秒）
-        standard_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
-
-        # 使用日期模块获取中文日期
-        chinese_date = get_chinese_date(now)
-
-        # 获取农历信息
-        lunar_info = get_lunar_info(now)
-
-        # 计算当前时刻在标准一天中的总秒数（毫秒级精度）
-        current_hour = now.hour
-        current_minute = now.minute
-        current_second = now.second
-        current_microsecond = now.microsecond
-
-        # 计算总秒数，包含毫秒精度
-        total_seconds = (
-            current_hour * 3600
-            + current_minute * 60
-            + current_second
-            + current_microsecond / 1e6
+        if self._date_cache is not None and self._date_cache[0] == standard_second:
+            _, standard_datetime, date_fields = self._date_cache
+        else:
+            # 标准秒变化时才构造 datetime：格式化标准日期时间（只显示到秒）
+            now = LOCAL_EPOCH + datetime.timedelta(seconds=standard_second)
+            standard_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
+            # 中文日期/农历惰性计算：仅在调用方首次读取时执行，同一标准秒内共享
+            date_fields = LazyDateFields(now)
+            self._date_cache = (standard_second, standard_datetime, date_fields)
+
+        # 格式化自定义时间（整数运算拆分时分秒，只显示到秒，毫秒部分另存 custom_millisecond）
+        custom_time = format_custom_time(custom_ns, self.custom_hours_per_day)
+        custom_millisecond = (
+            custom_ns % _NS_PER_SECOND // _NS_PER_MILLISECOND if milliseconds else 0
         )
 
-        # 使用时间膨胀倍率计算自定义时间的总秒数（毫秒级精度）
-        custom_total_seconds = total_seconds * self.time_dilation_rate
-
-        # 使用整数运算直接计算小时、分钟和秒，避免手动进位
-        custom_hour = int(custom_total_seconds // 3600) % self.custom_hours_per_day
-        custom_minute = int((custom_total_seconds % 3600) // 60)
-        custom_second = int(custom_total_seconds % 60)
-
-        # 格式化自定义时间（只显示到秒）
-        custom_time = f"{custom_hour:02d}:{custom_minute:02d}:{custom_second:02d}"
-
-        # 计算时间膨胀倍率百分比
-        dilation_percentage = self.time_dilation_rate * 100
+        # 计算时间膨胀倍率百分比（分段日程取当前时段倍率）
+        dilation_percentage = self._dilation_percentage(local_ns % _NS_PER_DAY)
 
         # 计算膨胀后一天的小时数（精确到两位小数）
         expanded_hours_per_day = 24.0 * self.time_dilation_rate
 
-        # 计算加速后当天剩余的小时数（精确到两位小数）
-        # 总自定义时间秒数 - 当前自定义时间秒数 = 剩余秒数（rate≤20 时当前值恒小于一天总量，无需取模）
-        total_custom_seconds_per_day = expanded_hours_per_day * 3600
-        remaining_seconds = total_custom_seconds_per_day - custom_total_seconds
-        remaining_hours = remaining_seconds / 3600
+        # 计算加速后当天剩余的小时数（整数纳秒相减后只做一次除法）
+        remaining_hours = (self._custom_ns_per_day - custom_ns) / _NS_PER_HOUR
 
         info = TimeInfo(
             standard_datetime=standard_datetime,
             custom_time=custom_time,
-            chinese_date=chinese_date,
-            lunar_info=lunar_info,
             dilation_percentage=dilation_percentage,
             expanded_hours_per_day=expanded_hours_per_day,
             remaining_hours=remaining_hours,
+            date_fields=date_fields,
+            custom_millisecond=custom_millisecond,
         )
         self._time_cache = (cache_key, info)
         return info
 
-    def run_live_clock(self) -> None:
-        # 秒数变化时整行覆写输出，10ms 轮询平衡精度与 CPU
-        print(
-            f"=== 加速世界 | 时间膨胀倍率{self.time_dilation_rate}倍 | "
-            f"一天{self.custom_hours_per_day}小时制实时时钟 ==="
+    def get_custom_time_batch(
+        self, epoch_seconds: Sequence[float] | Any
+    ) -> CustomTimeBatch:
+        # 批量换算：epoch 秒数组 → 自定义时/分/秒 + 剩余小时数组（事件日志后处理用）
+        # ndarray 输入时单次向量化；其余（array('d')/list）逐元素走 get_custom_time 同一整数纳秒运算
+        # NumPy 为可选依赖且不在模块加载时导入（约 60ms）：调用方能传入 ndarray 说明其已导入
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(epoch_seconds, np.ndarray):
+            return self._custom_time_batch_numpy(epoch_seconds, np)
+
+        hours = array("l")
+        minutes = array("l")
+        seconds = array("l")
+        remaining = array("d")
+        offsets: dict[int, int] = {}  # 小时桶 → UTC 偏移（夏令时按小时粒度切换）
+        for ts in epoch_seconds:
+            bucket = int(ts // 3600)
+            offset = offsets.get(bucket)
+            if offset is None:
+                offset = offsets[bucket] = _utc_offset_seconds(ts)
+            custom_ns = self._custom_ns(_epoch_local_ns(ts, offset) % _NS_PER_DAY)
+            h, m, s = _split_custom_seconds(custom_ns // _NS_PER_SECOND, self.custom_hours_per_day)
+            hours.append(h)
+            minutes.append(m)
+            seconds.append(s)
+            remaining.append((self._custom_ns_per_day - custom_ns) / _NS_PER_HOUR)
+        return CustomTimeBatch(hours, minutes, seconds, remaining)
+
+    def _custom_ns_array(self, day_ns: Any, np: Any) -> Any:
+        # _custom_ns 的 ndarray 版本：int64 当天纳秒 → int64 当天自定义纳秒（逐项与标量相等）
+        if self.schedule is not None:
+            return self.schedule.dilated_ns_array(day_ns, np)
+        return _scale_ns_array(day_ns, *self._rate_ratio, np)
+
+    def _custom_time_batch_numpy(self, epoch_seconds: Any, np: Any) -> CustomTimeBatch:
+        # 向量化路径：int64 纳秒整体数组化，运算与逐元素路径相同
+        day_ns = np.mod(_epoch_local_ns_array(epoch_seconds, np), _NS_PER_DAY)
+        custom_ns = self._custom_ns_array(day_ns, np)
+        h, m, s = _split_custom_seconds(custom_ns // _NS_PER_SECOND, self.custom_hours_per_day)
+        return CustomTimeBatch(
+            hours=h,
+            minutes=m,
+            seconds=s,
+            remaining_hours=(self._custom_ns_per_day - custom_ns) / _NS_PER_HOUR,
+        )
+
+    def _elapsed_custom_ns(self, local_ns: int) -> int:
+        # 纪元以来膨胀纳秒：整天数 × 一天膨胀纳秒 + 当天膨胀纳秒之差（闭式，不逐日累加）
+        day, day_ns = divmod(local_ns, _NS_PER_DAY)
+        return (
+            (day - self._epoch_day) * self._custom_ns_per_day
+            + self._custom_ns(day_ns)
+            - self._epoch_custom_ns
+        )
+
+    def _accelerated_date(self, local_ns: int) -> AcceleratedDate:
+        # 本地纳秒 → 加速日历读数（get_accelerated_date 与逐元素批量路径共用）
+        elapsed_ns = self._elapsed_custom_ns(local_ns)
+        try:
+            accelerated = self.calendar_epoch + datetime.timedelta(microseconds=elapsed_ns // 1000)
+        except OverflowError:
+            raise ValueError("加速日历超出公历可表示范围") from None
+        days = elapsed_ns // _NS_PER_DAY  # 一个膨胀日 = 24 膨胀小时
+        return AcceleratedDate(
+            elapsed_seconds=elapsed_ns // _NS_PER_SECOND,
+            days=days,
+            weeks=days // 7,
+            years=_whole_years(self.calendar_epoch, accelerated),
+            moment=accelerated,
+        )
+
+    def get_accelerated_date(self, moment: datetime.datetime | None = None) -> AcceleratedDate:
+        # 连续加速日历：纪元以来的膨胀秒/天/周/年与对应公历时刻（moment 默认取时钟当前时刻）
+        return self._accelerated_date(self.clock.now_ns() if moment is None else _local_ns(moment))
+
+    def get_accelerated_date_batch(
+        self, epoch_seconds: Sequence[float] | Any
+    ) -> AcceleratedDateBatch:
+        # 批量加速日历：epoch 秒数组 → 膨胀秒/天/周/年数组（与 get_custom_time_batch 同一偏移与日程口径）
+        np = sys.modules.get("numpy")
+        if np is not None and isinstance(epoch_seconds, np.ndarray):
+            return self._accelerated_date_batch_numpy(epoch_seconds, np)
+
+        elapsed = array("q")
+        days = array("q")
+        weeks = array("q")
+        years = array("q")
+        offsets: dict[int, int] = {}  # 小时桶 → UTC 偏移（夏令时按小时粒度切换）
+        for ts in epoch_seconds:
+            bucket = int(ts // 3600)
+            offset = offsets.get(bucket)
+            if offset is None:
+                offset = offsets[bucket] = _utc_offset_seconds(ts)
+            date = self._accelerated_date(_epoch_local_ns(ts, offset))
+            elapsed.append(date.elapsed_seconds)
+            days.append(date.days)
+            weeks.append(date.weeks)
+            years.append(date.years)
+        return AcceleratedDateBatch(elapsed, days, weeks, years)
+
+    def _accelerated_date_batch_numpy(self, epoch_seconds: Any, np: Any) -> AcceleratedDateBatch:
+        # 向量化路径：天/周为整除，整年数用 datetime64 比较当年周年日（月 + 日 + 时刻偏移）
+        day, day_ns = np.divmod(_epoch_local_ns_array(epoch_seconds, np), _NS_PER_DAY)
+        # 膨胀纳秒 = 天差 × 一天膨胀纳秒 + 当天膨胀纳秒之差；天差 × 一天膨胀纳秒可超出 int64，
+        # 一天膨胀纳秒拆成整秒与余纳秒两部分分别相乘，直接得到向下取整的膨胀秒与秒内纳秒
+        per_day_seconds, per_day_ns = divmod(self._custom_ns_per_day, _NS_PER_SECOND)
+        day_diff = day - self._epoch_day
+        elapsed, sub_ns = np.divmod(
+            day_diff * per_day_ns + self._custom_ns_array(day_ns, np) - self._epoch_custom_ns,
+            _NS_PER_SECOND,
+        )
+        elapsed += day_diff * per_day_seconds
+        days = np.floor_divide(elapsed, 86400)
+
+        epoch = self.calendar_epoch
+        accelerated = np.datetime64(epoch, "us") + (elapsed * 1_000_000 + sub_ns // 1000).astype(
+            "timedelta64[us]"
+        )
+        year_start = accelerated.astype("datetime64[Y]")
+        calendar_years = year_start.astype(np.int64) + 1970
+        if calendar_years.size and (calendar_years.min() < 1 or calendar_years.max() > 9999):
+            raise ValueError("加速日历超出公历可表示范围")
+        # 当年周年日：年初 + (月-1) 月 + (日-1) 天 + 时刻；纪元为 2/29 时非闰年顺延到 3/1，与标量口径一致
+        anniversary = (
+            (year_start.astype("datetime64[M]") + np.timedelta64(epoch.month - 1, "M")).astype(
+                "datetime64[D]"
+            )
+            + np.timedelta64(epoch.day - 1, "D")
+        ).astype("datetime64[us]") + np.timedelta64(
+            (epoch - epoch.replace(hour=0, minute=0, second=0, microsecond=0))
+            // datetime.timedelta(microseconds=1),
+            "us",
+        )
+        years = (calendar_years - epoch.year - (accelerated < anniversary)).astype(np.int64)
+        return AcceleratedDateBatch(
+            elapsed_seconds=elapsed,
+            days=days,
+            weeks=np.floor_divide(days, 7),
+            years=years,
+        )
+
+    def _parse_custom_time(self, custom_time: str | float) -> float:
+        # "HH:MM[:SS]" 或自定义总秒数 → 自定义总秒数；超出当前倍率一天范围抛 ValueError
+        if isinstance(custom_time, str):
+            parts = custom_time.strip().split(":")
+            if len(parts) not in (2, 3):
+                raise ValueError(f"自定义时间格式错误: {custom_time}，应为 HH:MM:SS")
+            hour, minute, second = (int(p) for p in parts + ["0"] * (3 - len(parts)))
+            if not (0 <= minute < 60 and 0 <= second < 60):
+                raise ValueError(f"自定义时间分/秒越界: {custom_time}")
+            if not 0 <= hour < self.custom_hours_per_day:
+                raise ValueError(
+                    f"自定义小时必须在 0 到 {self.custom_hours_per_day - 1} 之间: {custom_time}"
+                )
+            custom_total_seconds = float(hour * 3600 + minute * 60 + second)
+        else:
+            custom_total_seconds = float(custom_time)
+        if not 0 <= custom_total_seconds * _NS_PER_SECOND < self._custom_ns_per_day:
+            raise ValueError(f"自定义时间超出当天范围: {custom_time}")
+        return custom_total_seconds
+
+    def _standard_microseconds(self, custom_total_seconds: float) -> int:
+        # 反解：自定义秒 c 首次出现的标准时刻（当天微秒数），即正向整数运算结果 ≥ c 纳秒的最小微秒；
+        # 全程有理数/整数运算，无需回代微调
+        target_ns = math.ceil(Fraction(custom_total_seconds) * _NS_PER_SECOND)
+        return -(-self._standard_ns(target_ns) // 1000)
+
+    def custom_to_standard(
+        self, custom_time: str | float, day: datetime.date | None = None
+    ) -> datetime.datetime:
+        # 反向换算：自定义时间（"HH:MM:SS" 或自定义总秒数）→ 当天对应的标准时间（默认时钟源今天）
+        # 闭式除法 O(1)（分段日程 O(log n)），替代逐秒扫描；返回的时刻经 get_custom_time 正向换算恰为该自定义秒的首个微秒
+        if day is None:
+            day = self.clock.now().date()
+        microseconds = self._standard_microseconds(self._parse_custom_time(custom_time))
+        return datetime.datetime.combine(day, datetime.time.min) + datetime.timedelta(
+            microseconds=microseconds
         )
-        print("按 Ctrl+C 退出\n")
 
-        last_standard_second = None
-        last_custom_second = None
+    def custom_to_standard_batch(
+        self, custom_times: Iterable[str | float], day: datetime.date | None = None
+    ) -> list[datetime.datetime]:
+        # 批量反向换算：同一天的多个自定义时间，当天零点只计算一次
+        if day is None:
+            day = self.clock.now().date()
+        midnight = datetime.datetime.combine(day, datetime.time.min)
+        return [
+            midnight
+            + datetime.timedelta(
+                microseconds=self._standard_microseconds(self._parse_custom_time(t))
+            )
+            for t in custom_times
+        ]
+
+    def _seconds_until_next_tick(self, now: datetime.datetime) -> float:
+        # 距下一个标准秒或自定义秒边界（取较早者）的秒数，加 1ms 余量确保醒来时已跨过边界
+        # 下一自定义秒边界经反向换算求得（分段日程跨时段时同样精确）
+        day_ns = (
+            (now.hour * 3600 + now.minute * 60 + now.second) * 1_000_000 + now.microsecond
+        ) * 1000
+        until_standard = 1.0 - now.microsecond / 1e6
+        next_custom_ns = (self._custom_ns(day_ns) // _NS_PER_SECOND + 1) * _NS_PER_SECOND
+        if next_custom_ns >= self._custom_ns_per_day:
+            return until_standard + _TICK_MARGIN_SECONDS
+        until_custom = (self._standard_ns(next_custom_ns) - day_ns) / _NS_PER_SECOND
+        return min(until_standard, until_custom) + _TICK_MARGIN_SECONDS
+
+    def run_live_clock(self, fps: float | None = None) -> None:
+        # 默认边界对齐逐秒刷新；fps 给定时进入高频毫秒模式（按帧率刷新 HH:MM:SS.mmm）
+        mode = f"{fps:g}fps 毫秒" if fps else f"一天{self.custom_hours_per_day}小时制"
+        if self.schedule is not None:
+            rate_text = f"分段膨胀日程（平均{self.time_dilation_rate:.2f}倍）"
+        else:
+            rate_text = f"时间膨胀倍率{self.time_dilation_rate}倍"
+        print(f"=== 加速世界 | {rate_text} | {mode}实时时钟 ===")
+        print("按 Ctrl+C 退出\n")
 
         try:
-            while True:
-                try:
-                    # 秒变化检测前置：标准秒未变不调 get_custom_time（配合秒级缓存，每秒仅 1 次全量计算）
-                    now = datetime.datetime.now()
-                    current_standard_second = now.second
-                    if current_standard_second == last_standard_second:
-                        time.sleep(0.01)
-                        continue
-
-                    # 获取当前标准日期时间和自定义时间
-                    info = self.get_custom_time()
-
-                    # 提取自定义时间的秒数（经 TimeInfo 计算属性）
-                    current_custom_second = info.custom_second
-
-                    # 当标准时间或自定义时间的秒数变化时，更新显示
-                    if (
-                        last_standard_second != current_standard_second
-                        or last_custom_second != current_custom_second
-                    ):
-                        # 同时显示所有信息
-                        output = f"\r标准时间：{info.standard_datetime} | 自定义时间：{info.custom_time}"
-                        output += (
-                            f" | 膨胀倍率：{info.dilation_percentage:.0f}% | "
-                            f"一天小时数：{info.expanded_hours_per_day:.2f}小时 | "
-                            f"当天剩余：{info.remaining_hours:.2f}小时"
-                        )
-                        sys.stdout.write(output)
-                        sys.stdout.flush()
-                        last_standard_second = current_standard_second
-                        last_custom_second = current_custom_second
-                except Exception as e:
-                    # 单轮异常（如农历库异常）记录后继续，避免 CLI 崩溃退出
-                    logger.exception(f"实时时钟单轮刷新异常: {e}")
-                    time.sleep(1.0)
-
-                # 使用短暂的休眠，平衡精度和CPU使用率
-                time.sleep(0.01)  # 10毫秒休眠
+            if fps:
+                self._live_clock_frames(fps)
+            else:
+                self._live_clock_ticks()
         except KeyboardInterrupt:
             print("\n\n时钟已停止运行～")
 
+    def _live_clock_ticks(self) -> None:
+        # 边界对齐：每次刷新后直接休眠到下一个标准/自定义秒边界（约 1+rate 次/秒唤醒，替代 10ms 轮询）
+        last_display: tuple[str, str] | None = None
+
+        while True:
+            try:
+                # 获取当前标准日期时间和自定义时间（秒级缓存，跨边界才重算）
+                info = self.get_custom_time()
+
+                # 当标准时间或自定义时间的秒数变化时，更新显示
+                display = (info.standard_datetime, info.custom_time)
+                if display != last_display:
+                    # 同时显示所有信息
+                    sys.stdout.write(
+                        f"\r标准时间：{info.standard_datetime} | 自定义时间：{info.custom_time}"
+                        + self._live_clock_tail(info)
+                    )
+                    sys.stdout.flush()
+                    last_display = display
+
+                # 休眠到下一个秒边界（标准/自定义取较早者）
+                delay = self._seconds_until_next_tick(self.clock.now())
+            except Exception as e:
+                # 单轮异常（如农历库异常）记录后继续，避免 CLI 崩溃退出
+                logger.exception(f"实时时钟单轮刷新异常: {e}")
+                delay = 1.0
+
+            self.clock.sleep(delay)
+
+    def _live_clock_frames(self, fps: float) -> None:
+        # 高频毫秒模式：每帧一次取时（整数运算，不分配 TimeInfo）；
+        # TimeInfo 变化（自定义秒/标准秒）时整行重写，其余帧只覆写行首到毫秒为止（查表 + 一次拼接）
+        frame_seconds = 1.0 / fps
+        formatter = MillisecondFormatter(self.custom_hours_per_day)
+        last_info: TimeInfo | None = None
+        last_ms = -1
+        write, flush = sys.stdout.write, sys.stdout.flush
+
+        while True:
+            try:
+                info, custom_ms = self.get_custom_frame()
+                if info is not last_info:
+                    formatter.set_prefix(f"\r标准时间：{info.standard_datetime} | 自定义时间：")
+                    write(formatter.format(custom_ms) + self._live_clock_tail(info))
+                    flush()
+                    last_info, last_ms = info, custom_ms
+                elif custom_ms != last_ms:
+                    # 行尾参数不变：光标停在毫秒之后，下一帧 \r 回行首覆写等宽前段
+                    write(formatter.format(custom_ms))
+                    flush()
+                    last_ms = custom_ms
+                delay = frame_seconds
+            except Exception as e:
+                # 单帧异常记录后继续（与逐秒模式一致）
+                logger.exception(f"实时时钟单帧刷新异常: {e}")
+                delay = 1.0
+
+            self.clock.sleep(delay)
+
+    @staticmethod
+    def _live_clock_tail(info: TimeInfo) -> str:
+        # 实时钟行尾参数段（倍率/一天小时数/剩余小时），每个自定义秒格式化一次
+        return (
+            f" | 膨胀倍率：{info.dilation_percentage:.0f}% | "
+            f"一天小时数：{info.expanded_hours_per_day:.2f}小时 | "
+            f"当天剩余：{info.remaining_hours:.2f}小时"
+        )
+
+
+def read_time_snapshot(
+    source: TimeSnapshotReader | Path | str | None = None,
+) -> TimeInfo:
+    # 读取共享内存快照为 TimeInfo（零 IPC）：高频读方传入常驻 TimeSnapshotReader 复用映射；
+    # 传路径/None 时临时打开读取一次后关闭（默认路径见 base.json time_snapshot_path）
+    if isinstance(source, TimeSnapshotReader):
+        snapshot = source.read()
+    else:
+        reader = TimeSnapshotReader(source)
+        try:
+            snapshot = reader.read()
+        finally:
+            reader.close()
+    return TimeInfo(
+        standard_datetime=snapshot.standard_datetime,
+        custom_time=snapshot.custom_time,
+        chinese_date=snapshot.chinese_date,
+        lunar_info=snapshot.lunar_info,
+        dilation_percentage=snapshot.dilation_percentage,
+        expanded_hours_per_day=snapshot.expanded_hours_per_day,
+        remaining_hours=snapshot.remaining_hours,
+    )
+
+
+# 输出模板可用字段（TimeInfo 属性名）；其中 lunar_info 触发农历计算，毫秒字段按毫秒分辨率取时
+TEMPLATE_FIELDS = (
+    "standard_datetime",
+    "standard_time",
+    "custom_time",
+    "custom_time_ms",
+    "custom_millisecond",
+    "custom_hour",
+    "custom_second",
+    "dilation_percentage",
+    "expanded_hours_per_day",
+    "remaining_hours",
+    "chinese_date",
+    "lunar_info",
+)
+_LUNAR_TEMPLATE_FIELDS = frozenset({"lunar_info"})
+_MILLISECOND_TEMPLATE_FIELDS = frozenset({"custom_time_ms", "custom_millisecond"})
+
+
+class OutputTemplate:
+    __slots__ = ("template", "fields", "needs_lunar", "needs_milliseconds", "_parts")
+
+    def __init__(self, template: str):
+        # 编译一次：拆分为 (字面量, 字段, 格式说明, 转换符) 序列并校验字段名；非法模板抛 ValueError
+        parts = []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            if field is not None:
+                if field not in TEMPLATE_FIELDS:
+                    raise ValueError(
+                        f"未知模板字段 {{{field}}}，可用字段: {', '.join(TEMPLATE_FIELDS)}"
+                    )
+                if "{" in spec:
+                    raise ValueError(f"模板字段 {{{field}}} 不支持嵌套格式说明")
+                if conversion not in (None, "r", "s", "a"):
+                    raise ValueError(f"模板字段 {{{field}}} 转换符无效: !{conversion}")
+            parts.append((literal, field, spec, conversion))
+        self.template = template
+        self._parts = tuple(parts)
+        self.fields = frozenset(p[1] for p in parts if p[1] is not None)
+        # 模板不引用农历字段时渲染全程不读取惰性农历（不导入农历库、不做农历计算）
+        self.needs_lunar = not self.fields.isdisjoint(_LUNAR_TEMPLATE_FIELDS)
+        # 引用毫秒字段时调用方应以 get_custom_time(milliseconds=True) 取时
+        self.needs_milliseconds = not self.fields.isdisjoint(_MILLISECOND_TEMPLATE_FIELDS)
+
+    def render(self, info: TimeInfo) -> str:
+        # 按编译结果逐段拼接，只读取模板引用的 TimeInfo 字段
+        out = []
+        for literal, field, spec, conversion in self._parts:
+            out.append(literal)
+            if field is not None:
+                value = getattr(info, field)
+                if conversion == "r":
+                    value = repr(value)
+                elif conversion == "s":
+                    value = str(value)
+                elif conversion == "a":
+                    value = ascii(value)
+                out.append(format(value, spec))
+        return "".join(out)
+
 
 # ------------------- 命令行界面 -------------------
-def main_cli(rate: float | None = None) -> None:
+def main_once(
+    rate: float | None = None,
+    template: str | None = None,
+    schedule: DilationSchedule | None = None,
+) -> None:
+    # 单次输出：按模板打印一行后退出（tmux/polybar 等状态栏每秒调用）；模板默认值来自静态配置
+    base = get_static_config().base
+    if rate is None:
+        rate = float(base["default_rate"])
+    try:
+        compiled = OutputTemplate(base["once_format"] if template is None else template)
+        info = AcceleratedWorld(time_dilation_rate=rate, schedule=schedule).get_custom_time(
+            milliseconds=compiled.needs_milliseconds
+        )
+        print(compiled.render(info))
+    except ValueError as e:
+        print(f"错误：{e}")
+        sys.exit(1)
+
+
+def main_cli(
+    rate: float | None = None,
+    fps: float | None = None,
+    schedule: DilationSchedule | None = None,
+) -> None:
     # 倍率默认值来自静态配置，下限校验非法则退出
     if rate is None:
         rate = float(get_static_config().base["default_rate"])
@@ -200,9 +862,9 @@ def main_cli(rate: float | None = None) -> None:
 
     try:
         # 初始化时间膨胀倍率
-        accel_world = AcceleratedWorld(time_dilation_rate=rate)
-        # 运行实时时钟
-        accel_world.run_live_clock()
+        accel_world = AcceleratedWorld(time_dilation_rate=rate, schedule=schedule)
+        # 运行实时时钟（fps 给定时为高频毫秒模式）
+        accel_world.run_live_clock(fps)
     except ValueError as e:
         print(f"错误：{e}")
         sys.exit(1)
@@ -214,15 +876,84 @@ if __name__ == "__main__":
 
 
 # ===== modules/time_dilation.py 函数/类说明 =====
-# TimeInfo: dataclass，时间信息聚合（S2 引入，替代 7 元组返回）
+# LazyDateFields: 与倍率无关的中文日期/农历字段（__slots__），首次访问才按 moment 计算并缓存
+# TimeInfo: 时间信息聚合（S2 引入，替代 7 元组返回；__slots__ 实现，构造参数顺序与原 dataclass 一致）
 #   standard_datetime/custom_time/chinese_date/lunar_info/dilation_percentage/
-#   expanded_hours_per_day/remaining_hours
+#   expanded_hours_per_day/remaining_hours；chinese_date/lunar_info 为惰性属性，
+#   只读 custom_time 的热路径（CLI/托盘）不触发农历计算
+#   custom_millisecond/custom_time_ms: 自定义时间毫秒部分与 HH:MM:SS.mmm（毫秒分辨率取时才非 0）
+#   __eq__: 按上述公开字段（含 custom_millisecond）值比较，与原 dataclass 语义一致，不可哈希；
+#     改为 __slots__ 后不再支持 dataclasses.asdict/astuple/fields，需字段时直接读属性
+# CustomTimeBatch: dataclass，批量换算结果（hours/minutes/seconds/remaining_hours 等长数组）
+# AcceleratedDate: frozen dataclass，加速日历读数（elapsed_seconds/days/weeks/years/moment）
+# AcceleratedDateBatch: dataclass，批量加速日历结果（elapsed_seconds/days/weeks/years 等长数组）
+# _whole_years(epoch, moment): 公历整年数（未到周年日减一，纪元 2/29 在非闰年按 3/1 计）
+# _split_custom_seconds(custom_total, hours_per_day): 自定义整秒数 → 时分秒，标量（get_custom_time）与
+#   int64 ndarray（批量）共用同一套运算
+# format_custom_time(custom_ns, hours_per_day) -> str: 当天自定义纳秒 → "HH:MM:SS"
+#   （get_custom_time 与 modules/world_registry.py 共用）
+# _MINUTE_SECOND_TEXT/_MILLISECOND_TEXT: 高频模式预格式化数字表（"MM:SS" 3600 项、".mmm" 1000 项）
+# MillisecondFormatter(hours_per_day, prefix=""): 自定义毫秒数 → prefix + "HH:MM:SS.mmm"
+#   同一自定义秒内行首（prefix + 时分秒）复用，每帧仅一次拼接；set_prefix() 更换行首；
+#   CLI 高频实时钟与 ui/panels/clock_panel.py update_frame 共用
+# _local_ns(moment): 本地 naive 时刻 → 距 LOCAL_EPOCH 的整数纳秒（与 now_ns() 同口径）
+# _utc_offset_seconds(ts): 时刻对应的本地 UTC 偏移（time.localtime().tm_gmtoff，含夏令时）
+# _epoch_local_ns(ts, offset) / _epoch_local_ns_array(ts, np): epoch 秒 → 本地整数纳秒（先取整到微秒，
+#   与 now_ns() 同口径）；ndarray 版本按小时桶去重求偏移，超出 int64 纳秒范围（约 1678–2262 年）抛 ValueError
+# _scale_ns_array(values, numerator, denominator, np): int64 数组 × 分子 // 分母（商/余数拆分防溢出），
+#   逐项与标量整数运算相等
 # AcceleratedWorld: 时间膨胀核心类
-#   __init__(rate=None): 默认值与下限校验来自静态配置（default_rate/rate_min，None 哨兵零硬编码），
-#     下限为 rate_min（含边界，修复 S10.1 A1 的 1.0 矛盾），计算一天自定义小时数（int(24*rate)）
-#   get_custom_time() -> TimeInfo: 当前秒数×倍率 → 时分秒；含农历/中文日期/剩余小时
-#   run_live_clock(): CLI 实时钟，秒变化时覆写输出，KeyboardInterrupt 优雅退出
-# main_cli(rate): CLI 入口（倍率直接传参，修复 D1），校验后启动实时钟
+#   __init__(rate=None, clock=None, schedule=None, calendar_epoch=None): 默认值与下限校验来自静态配置（default_rate/rate_min，None 哨兵零硬编码），
+#     下限为 rate_min（含边界，修复 S10.1 A1 的 1.0 矛盾），计算一天自定义小时数（int(24*rate)）；
+#     clock 为时钟源（modules/clock_source.py，默认 RealClock），now()/sleep() 均经此调用；
+#     schedule 为分段膨胀日程（modules/dilation_schedule.py），给定时 time_dilation_rate 为全天平均倍率，
+#     TimeInfo.dilation_percentage 取当前时段倍率
+#   _custom_ns(day_ns)/_standard_ns(custom_ns): 正向/反向换算核心（恒定倍率整数乘除，日程前缀和二分 O(log n)），
+#     get_custom_time/get_custom_frame/custom_to_standard/_seconds_until_next_tick 共用
+#   dilation_at(local_ns) -> (custom_ns, dilation_percentage, remaining_hours): 公开的单次换算
+#     （本地纳秒同 clock.now_ns() 口径），供 modules/world_registry.py 多倍率求值；
+#     _dilation_percentage(day_ns) 当前倍率百分比（日程取所在时段）与 _time_info 共用
+#   rate_fraction: 倍率的精确有理数（Fraction(str(rate))，2.3 → 23/10）
+#   get_custom_time(milliseconds=False) -> TimeInfo: 当天纳秒数 × 倍率分子 // 分母 → 时分秒（毫秒）；
+#     含农历/中文日期/剩余小时；取时经 clock.now_ns()（RealClock 为 time.time_ns()），
+#     纯整数运算，高倍率下自定义秒边界与反向换算逐纳秒一致，不再有浮点舍入抖动
+#     双层缓存：TimeInfo 按（标准秒, 自定义秒或毫秒）缓存；标准日期与惰性日期字段按标准秒缓存
+#     （datetime 仅在标准秒变化时构造）；基准对比见 benchmarks/bench_custom_time.py
+#   get_custom_time_batch(epoch_seconds) -> CustomTimeBatch: epoch 秒数组批量换算
+#     与 get_custom_time 同一整数纳秒运算（逐项结果一致，无浮点边界误差）；
+#     ndarray 输入走 NumPy int64 向量化（_custom_ns_array；本地偏移按小时桶 np.unique 去重后查表；
+#     日程模式 DilationSchedule.dilated_ns_array），
+#     array('d')/list 输入逐元素计算并输出 array('l')/array('d')；NumPy 为可选依赖，
+#     不在模块加载时导入，按 sys.modules 识别调用方已导入的 ndarray（CLI 启动不付 NumPy 导入开销）
+#   custom_to_standard(custom_time, day=None) -> datetime: 反向换算，自定义 HH:MM:SS（或总秒数）
+#     → 当天首次显示该读数的标准时刻（有理数 ceil(c × 分母 / 分子) 微秒，与正向整数运算一致），越界抛 ValueError
+#   custom_to_standard_batch(custom_times, day=None) -> list[datetime]: 批量反向换算
+#   calendar_epoch: 加速日历纪元（默认 base.json calendar_epoch），构造时拆为（日序号, 当天膨胀纳秒）
+#   get_accelerated_date(moment=None) -> AcceleratedDate: 连续加速日历（不随真实午夜归零），
+#     纪元以来膨胀纳秒 = 整天数 × 一天膨胀纳秒 + 当天膨胀纳秒之差，闭式 O(1)（日程模式 O(log n)），
+#     长时间模拟无需逐日累加；超出公历范围抛 ValueError
+#   get_accelerated_date_batch(epoch_seconds) -> AcceleratedDateBatch: 批量加速日历
+#     （本地偏移/日程口径同 get_custom_time_batch；逐元素路径复用 _accelerated_date，与标量逐项一致；
+#     NumPy 路径膨胀秒按整秒/余纳秒拆分防 int64 溢出，整年数用 datetime64 比较当年周年日）
+#   _seconds_until_next_tick(now): 距下一个标准秒/自定义秒边界的较早者（+1ms 余量；自定义边界经反向换算，跨时段精确）
+#   get_custom_frame() -> (TimeInfo, custom_ms): 高频帧取时，一次读时钟得到秒级缓存 TimeInfo 与当天自定义毫秒数
+#   _time_info(local_ns, milliseconds): get_custom_time/get_custom_frame 共用的换算与双层缓存
+#   run_live_clock(fps=None): CLI 实时钟，KeyboardInterrupt 优雅退出
+#     _live_clock_ticks(): 默认逐秒模式，边界对齐休眠（唤醒约 1+rate 次/秒，替代 10ms 轮询），
+#       标准秒或自定义秒变化时覆写输出
+#     _live_clock_frames(fps): 高频毫秒模式，按帧率休眠；TimeInfo 变化时整行重写，
+#       其余帧只覆写行首到毫秒（MillisecondFormatter 查表 + 一次拼接，行尾参数 _live_clock_tail 每秒格式化一次）
+# read_time_snapshot(source=None) -> TimeInfo: 共享内存快照读方辅助（modules/time_snapshot.py），
+#   传常驻 TimeSnapshotReader 时每次读取仅内存访问；传路径/None 时临时打开读一次
+# TEMPLATE_FIELDS: 输出模板可用字段（TimeInfo 属性）；_LUNAR_TEMPLATE_FIELDS 需农历计算的字段；
+#   _MILLISECOND_TEMPLATE_FIELDS 需毫秒分辨率取时的字段
+# OutputTemplate(template): str.format 语法模板，构造时编译（拆段 + 字段名/转换符校验，非法抛 ValueError）
+#   fields: 引用字段集合；needs_lunar: 是否引用农历字段（不引用时渲染不触发惰性农历计算）；
+#   needs_milliseconds: 是否引用毫秒字段（main_once/时间服务据此以毫秒分辨率取时）
+#   render(info) -> str: 按编译结果拼接，仅读取引用字段
+# main_once(rate=None, template=None, schedule=None): --once 单次输出入口（模板默认 base.json once_format），打印一行后返回
+# main_cli(rate, fps=None, schedule=None): CLI 入口（倍率直接传参，修复 D1），校验后启动实时钟（fps 给定为高频毫秒模式）
 #   设计理由：纯计算无 GUI 依赖，CLI/GUI 共用；整数运算避免浮点进位误差
 #   异常处理：rate < rate_min 抛 ValueError；运行期 KeyboardInterrupt 捕获退出
-#   关联配置：农历数据来自 modules/chinese_calendar.py；倍率参数来自 config/static/base.json
+#   关联配置：农历数据来自 modules/chinese_calendar.py；倍率参数来自 config/static/base.json；
+#     时间来源来自 modules/clock_source.py
@@ -0,0 +1,275 @@
+# 本地时间服务模块（asyncio + Unix 域套接字守护进程，向任意数量订阅客户端推送膨胀时间）
+# 每个标准秒只计算一次 TimeInfo、每种协议只编码一次，按连接直接写入同一份字节（计算量与客户端数无关）
+
+import asyncio
+import json
+import logging
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Iterator
+
+# 时间膨胀核心与输出模板（LINE 协议沿用 --once 模板语法）
+from modules.time_dilation import AcceleratedWorld, OutputTemplate, TimeInfo
+
+# 分段膨胀日程（--schedule）
+from modules.dilation_schedule import DilationSchedule
+
+# 共享内存快照发布端（--snapshot 时每帧同步写入）
+from modules.time_snapshot import TimeSnapshotWriter
+
+# 静态配置（套接字路径/模板/握手超时/写缓冲上限）
+from config.static.static_config import get_static_config
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+# 订阅协议：LINE 按模板输出一行文本（shell/状态栏），JSON 每行一个对象（工具解析）
+MODES = ("LINE", "JSON")
+
+# JSON 协议字段（TimeInfo 属性，含惰性日期字段；农历文本按 (日期, 时辰) 缓存，每秒读取开销可忽略）
+JSON_FIELDS = (
+    "standard_datetime",
+    "custom_time",
+    "dilation_percentage",
+    "expanded_hours_per_day",
+    "remaining_hours",
+    "chinese_date",
+    "lunar_info",
+)
+
+
+def get_time_service_path() -> Path:
+    # 默认套接字路径：base.json time_service_socket，相对路径置于系统临时目录（避免项目路径过长超出 sun_path）
+    path = Path(get_static_config().base["time_service_socket"])
+    return path if path.is_absolute() else Path(tempfile.gettempdir()) / path
+
+
+def _remove_stale_socket(path: Path) -> None:
+    # 探测已有套接字文件：有服务应答说明守护进程仍在运行，抛 OSError（不抢占其路径）；
+    # 连接被拒（进程已退出留下的残留文件）才删除，文件不存在则无需处理
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+    except FileNotFoundError:
+        return
+    except ConnectionRefusedError:
+        path.unlink(missing_ok=True)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"时间服务已在运行: {path}")
+
+
+class TimeService:
+    def __init__(
+        self,
+        world: AcceleratedWorld,
+        socket_path: Path | str | None = None,
+        template: str | None = None,
+        snapshot_path: Path | str | None = None,
+    ):
+        # 服务状态：共享一个 AcceleratedWorld；订阅者按协议分组；模板编译一次；
+        # snapshot_path 非空时每帧同时发布到共享内存快照
+        base = get_static_config().base
+        self.world = world
+        self.socket_path = Path(socket_path) if socket_path is not None else get_time_service_path()
+        self._template = OutputTemplate(base["once_format"] if template is None else template)
+        self._handshake_timeout = float(base["time_service_handshake_timeout"])
+        self._max_buffer = int(base["time_service_max_buffer"])
+        self._subscribers: dict[str, set[asyncio.StreamWriter]] = {mode: set() for mode in MODES}
+        self._info: TimeInfo | None = None  # 当前帧 TimeInfo
+        self._payloads: dict[str, bytes] = {}  # 当前帧各协议编码结果（按需编码，每帧每协议至多一次）
+        self._server: asyncio.AbstractServer | None = None
+        self._tick_task: asyncio.Task | None = None
+        self._snapshot_path = snapshot_path
+        self._snapshot: TimeSnapshotWriter | None = None
+        self.ticks = 0
+
+    @property
+    def client_count(self) -> int:
+        # 当前订阅者总数
+        return sum(len(writers) for writers in self._subscribers.values())
+
+    async def start(self) -> None:
+        # 清理残留套接字文件后监听（已有服务在运行时抛 OSError），先算首帧再启动按秒 tick 循环
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("当前平台不支持 Unix 域套接字，无法启动时间服务")
+        _remove_stale_socket(self.socket_path)
+        if self._snapshot_path is not None:
+            self._snapshot = TimeSnapshotWriter(self._snapshot_path)
+        self._tick()
+        self._server = await asyncio.start_unix_server(
+            self._handle_client, path=str(self.socket_path)
+        )
+        self._tick_task = asyncio.create_task(self._tick_loop())
+        logger.info(f"时间服务已启动: {self.socket_path}")
+
+    async def close(self) -> None:
+        # 停止 tick、关闭监听与全部连接；仅删除本实例监听过的套接字文件（启动被拒时不动他人的）
+        owns_socket = self._server is not None
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            try:
+                await self._tick_task
+            except asyncio.CancelledError:
+                pass
+            self._tick_task = None
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        for writers in self._subscribers.values():
+            for writer in writers:
+                writer.close()
+            writers.clear()
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+        if owns_socket:
+            self.socket_path.unlink(missing_ok=True)
+
+    async def serve_forever(self) -> None:
+        # 启动并阻塞运行，退出（取消/中断）时统一清理
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        # 握手：首行为协议名（LINE/JSON）；超时未发送或空行按 LINE 处理（socat -u 等只读客户端）
+        try:
+            line = await asyncio.wait_for(reader.readline(), self._handshake_timeout)
+        except asyncio.TimeoutError:
+            line = b""
+        mode = line.decode("utf-8", "replace").strip().upper() or "LINE"
+        if mode not in self._subscribers:
+            writer.write(f"ERROR 未知协议 {mode}，可选: {' '.join(MODES)}\n".encode("utf-8"))
+            writer.close()
+            return
+
+        writers = self._subscribers[mode]
+        writers.add(writer)
+        # 新订阅者立即收到当前帧（与本帧其他订阅者共用同一份编码）
+        writer.write(self._payload(mode))
+        try:
+            # 对端半关闭（只写完握手）不算断开；连接真正断开/写失败时 wait_closed 返回
+            await writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writers.discard(writer)
+
+    def _payload(self, mode: str) -> bytes:
+        # 当前帧指定协议的字节串：首次需要时编码并缓存，无订阅者的协议不编码（不读取农历等字段）
+        payload = self._payloads.get(mode)
+        if payload is None:
+            if mode == "JSON":
+                record = {field: getattr(self._info, field) for field in JSON_FIELDS}
+                text = json.dumps(record, ensure_ascii=False)
+            else:
+                text = self._template.render(self._info)
+            payload = self._payloads[mode] = (text + "\n").encode("utf-8")
+        return payload
+
+    def _tick(self) -> None:
+        # 单次 tick：计算一次 TimeInfo，每协议编码一次后向所有订阅者写入同一份字节；
+        # 写缓冲积压超限的慢客户端断开
+        self._info = self.world.get_custom_time(milliseconds=self._template.needs_milliseconds)
+        self._payloads = {}
+        self.ticks += 1
+        if self._snapshot is not None:
+            self._snapshot.publish(self._info)
+        for mode, writers in self._subscribers.items():
+            if not writers:
+                continue
+            payload = None
+            for writer in tuple(writers):
+                if writer.is_closing():
+                    writers.discard(writer)
+                elif writer.transport.get_write_buffer_size() > self._max_buffer:
+                    logger.warning("时间服务客户端写缓冲积压，断开连接")
+                    writers.discard(writer)
+                    writer.close()
+                else:
+                    if payload is None:
+                        payload = self._payload(mode)
+                    writer.write(payload)
+
+    def _seconds_until_next_second(self) -> float:
+        # 距下一个标准秒边界的秒数（时钟源取时，+1ms 余量保证跨过边界）
+        now = self.world.clock.now()
+        return 1.0 - now.microsecond / 1e6 + 0.001
+
+    async def _tick_loop(self) -> None:
+        # 对齐标准秒边界推送；单轮异常记录后继续（与 run_live_clock 一致）
+        while True:
+            await asyncio.sleep(self._seconds_until_next_second())
+            try:
+                self._tick()
+            except Exception as e:
+                logger.exception(f"时间服务单轮推送异常: {e}")
+
+
+def subscribe_time_service(
+    socket_path: Path | str | None = None, mode: str = "JSON"
+) -> Iterator[str]:
+    # 同步订阅客户端（脚本/工具用）：发送协议名后逐行产出服务端推送，连接断开时结束
+    path = Path(socket_path) if socket_path is not None else get_time_service_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(path))
+        sock.sendall(f"{mode}\n".encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                yield line.rstrip("\n")
+
+
+def main_serve(
+    rate: float | None = None,
+    socket_path: Path | str | None = None,
+    template: str | None = None,
+    snapshot_path: Path | str | None = None,
+    schedule: DilationSchedule | None = None,
+) -> None:
+    # --serve 入口：构造共享实例后运行守护进程，Ctrl+C 退出
+    if rate is None:
+        rate = float(get_static_config().base["default_rate"])
+    try:
+        world = AcceleratedWorld(time_dilation_rate=rate, schedule=schedule)
+        service = TimeService(world, socket_path, template, snapshot_path)
+        print(f"时间服务监听: {service.socket_path}（Ctrl+C 退出）")
+        if snapshot_path is not None:
+            print(f"共享内存快照: {snapshot_path}")
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\n时间服务已停止～")
+    except (ValueError, OSError) as e:
+        print(f"错误：{e}")
+        sys.exit(1)
+
+
+# ===== modules/time_service.py 函数/类说明 =====
+# MODES: 订阅协议 LINE（模板文本行）/ JSON（每行一个对象，字段 JSON_FIELDS）
+# get_time_service_path() -> Path: 默认套接字路径（base.json time_service_socket，相对路径置于临时目录）
+# TimeService(world, socket_path=None, template=None, snapshot_path=None): asyncio Unix 域套接字时间服务
+#   snapshot_path 非空时启动时创建 TimeSnapshotWriter，每帧 publish（modules/time_snapshot.py），关闭时删除
+# _remove_stale_socket(path): 启动前探测套接字文件，有服务应答抛 OSError（"时间服务已在运行"），
+#   仅连接被拒（残留文件）时删除；防止第二个 --serve 删掉运行中守护进程的套接字并抢占路径
+#   （原订阅者挂在失去路径的旧服务上，新客户端却连到新服务）
+#   start()/close()/serve_forever(): 监听与生命周期（启动前经 _remove_stale_socket 清理残留，
+#     关闭时只删除本实例监听过的套接字文件）
+#   _handle_client(): 握手读协议名（超时/空行按 LINE），立即补发当前帧，等待连接关闭后退订
+#   _payload(mode): 当前帧按需编码（每帧每协议至多一次，无订阅者的协议不编码）
+#   _tick(): 每标准秒计算一次 TimeInfo，同一份字节写给该协议全部订阅者；
+#     写缓冲超过 time_service_max_buffer 的慢客户端直接断开，不拖累其他客户端
+#   _tick_loop(): 按时钟源对齐标准秒边界休眠；单轮异常记录后继续
+#   client_count/ticks: 当前订阅者数、已推送帧数（监控与测试用）
+#   设计理由：多个终端/状态栏共享一个进程，计算与编码量为 O(1)/秒，扇出只剩逐连接写入
+# subscribe_time_service(socket_path=None, mode="JSON") -> Iterator[str]: 同步订阅客户端
+# main_serve(rate=None, socket_path=None, template=None, snapshot_path=None, schedule=None):
+#   --serve 入口（schedule 为分段膨胀日程）；Ctrl+C 退出，参数错误或服务已在运行 exit(1)
+#   关联配置：base.json time_service_socket/time_service_handshake_timeout/time_service_max_buffer，
+#     LINE 模板默认 once_format；Windows 无 AF_UNIX 时启动报错
@@ -0,0 +1,141 @@
+# 共享内存时间快照模块（定长 mmap 文件 + seqlock 版本号，本机任意进程零 IPC 读取最新膨胀时间）
+# 写方：时间服务守护进程 / GUI 每次刷新时发布；读方：modules/time_dilation.py read_time_snapshot()
+
+import mmap
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
+
+# 静态配置（快照文件路径/读超时）
+from config.static.static_config import get_static_config
+
+# 文件头：魔数、格式版本、数据区字节数
+_HEADER = struct.Struct("<4sHH")
+_MAGIC = b"AWTS"
+_VERSION = 1
+
+# seqlock 版本号（8 字节对齐，奇数 = 写入中，偶数 = 稳定）
+_SEQ = struct.Struct("<Q")
+_SEQ_OFFSET = 8
+
+# 数据区：发布时刻（epoch 秒）、标准日期时间、自定义时间、倍率百分比、一天小时数、剩余小时、
+# 中文日期、农历文本（字符串 UTF-8 定长，NUL 填充；超长按字节截断，读取时丢弃残缺字符）
+_PAYLOAD = struct.Struct("<d19s16sddd48s256s")
+_PAYLOAD_OFFSET = _SEQ_OFFSET + _SEQ.size
+
+SNAPSHOT_SIZE = _PAYLOAD_OFFSET + _PAYLOAD.size
+
+
+class TimeSnapshot(NamedTuple):
+    published_at: float  # 发布时刻（epoch 秒，读方据此判断新鲜度）
+    standard_datetime: str
+    custom_time: str
+    dilation_percentage: float
+    expanded_hours_per_day: float
+    remaining_hours: float
+    chinese_date: str
+    lunar_info: str
+
+
+def get_time_snapshot_path() -> Path:
+    # 默认快照路径：base.json time_snapshot_path，相对路径置于系统临时目录（与时间服务套接字同策略）
+    path = Path(get_static_config().base["time_snapshot_path"])
+    return path if path.is_absolute() else Path(tempfile.gettempdir()) / path
+
+
+class TimeSnapshotWriter:
+    def __init__(self, path: Path | str | None = None):
+        # 创建/截断为定长文件并 mmap 可写映射，写入文件头，版本号归零
+        self.path = Path(path) if path is not None else get_time_snapshot_path()
+        with open(self.path, "w+b") as f:
+            f.truncate(SNAPSHOT_SIZE)
+            self._mmap = mmap.mmap(f.fileno(), SNAPSHOT_SIZE, access=mmap.ACCESS_WRITE)
+        _HEADER.pack_into(self._mmap, 0, _MAGIC, _VERSION, _PAYLOAD.size)
+        self._seq = 0
+        _SEQ.pack_into(self._mmap, _SEQ_OFFSET, self._seq)
+
+    def publish(self, info: Any) -> None:
+        # seqlock 写：版本号置奇 → 写数据区 → 版本号置偶（单写者，读方见到奇数或前后不一致即重读）
+        payload = _PAYLOAD.pack(
+            time.time(),
+            info.standard_datetime.encode("utf-8"),
+            info.custom_time.encode("utf-8"),
+            info.dilation_percentage,
+            info.expanded_hours_per_day,
+            info.remaining_hours,
+            info.chinese_date.encode("utf-8"),
+            info.lunar_info.encode("utf-8"),
+        )
+        _SEQ.pack_into(self._mmap, _SEQ_OFFSET, self._seq + 1)
+        self._mmap[_PAYLOAD_OFFSET:SNAPSHOT_SIZE] = payload
+        self._seq += 2
+        _SEQ.pack_into(self._mmap, _SEQ_OFFSET, self._seq)
+
+    def close(self, unlink: bool = True) -> None:
+        # 释放映射；默认删除快照文件（读方随后打开会失败而不是读到过期数据）
+        self._mmap.close()
+        if unlink:
+            self.path.unlink(missing_ok=True)
+
+
+class TimeSnapshotReader:
+    def __init__(self, path: Path | str | None = None):
+        # 只读映射快照文件并校验文件头；格式不符抛 ValueError，文件不存在抛 FileNotFoundError
+        self.path = Path(path) if path is not None else get_time_snapshot_path()
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < SNAPSHOT_SIZE or _HEADER.unpack_from(self._mmap, 0) != (
+            _MAGIC,
+            _VERSION,
+            _PAYLOAD.size,
+        ):
+            self._mmap.close()
+            raise ValueError(f"时间快照文件格式不匹配: {self.path}")
+        self._timeout = float(get_static_config().base["time_snapshot_read_timeout"])
+
+    @property
+    def sequence(self) -> int:
+        # 当前版本号（每次发布 +2；读方可据此判断是否有新数据）
+        return _SEQ.unpack_from(self._mmap, _SEQ_OFFSET)[0]
+
+    def read(self) -> TimeSnapshot:
+        # seqlock 读：版本号为偶数且读数据前后一致才返回；冲突时让出 CPU 后重读（写方可能被调度出去），
+        # 超过 time_snapshot_read_timeout 仍未读到（如写进程崩溃于写入中）抛 TimeoutError
+        deadline = None
+        while True:
+            before = _SEQ.unpack_from(self._mmap, _SEQ_OFFSET)[0]
+            if not before & 1:
+                fields = _PAYLOAD.unpack_from(self._mmap, _PAYLOAD_OFFSET)
+                if _SEQ.unpack_from(self._mmap, _SEQ_OFFSET)[0] == before:
+                    return TimeSnapshot(
+                        *(
+                            f.rstrip(b"\0").decode("utf-8", "ignore") if isinstance(f, bytes) else f
+                            for f in fields
+                        )
+                    )
+            if deadline is None:
+                deadline = time.monotonic() + self._timeout
+            elif time.monotonic() > deadline:
+                raise TimeoutError(f"时间快照持续写入中，读取失败: {self.path}")
+            time.sleep(0)
+
+    def close(self) -> None:
+        # 释放映射
+        self._mmap.close()
+
+
+# ===== modules/time_snapshot.py 函数/类说明 =====
+# 文件格式：_HEADER（魔数 AWTS/版本/数据区字节数）+ 8 字节 seqlock 版本号 + 定长数据区 _PAYLOAD
+#   （发布时刻/标准日期时间/自定义时间/倍率百分比/一天小时数/剩余小时/中文日期/农历文本），共 SNAPSHOT_SIZE 字节
+# TimeSnapshot: 快照字段（NamedTuple，published_at 供读方判断新鲜度）
+# get_time_snapshot_path() -> Path: 默认快照路径（base.json time_snapshot_path，相对路径置于临时目录）
+# TimeSnapshotWriter(path=None): 单写者发布端
+#   publish(info): 版本号置奇 → 写数据区 → 置偶；close(unlink=True): 释放映射并删除文件
+# TimeSnapshotReader(path=None): 只读映射；read() -> TimeSnapshot: 版本号偶数且前后一致才返回，
+#   冲突时让出 CPU 重读，超过 time_snapshot_read_timeout 秒抛 TimeoutError；sequence: 当前版本号；文件头不符抛 ValueError
+#   设计理由：读方打开后每次读取只是内存访问（无系统调用/无 IPC），适合高频轮询；
+#   定长布局无需解析分隔符，字符串超长按字节截断
+#   关联配置：base.json time_snapshot_path/time_snapshot_read_timeout；
+#     发布端 modules/time_service.py（--serve --snapshot）与 ui/main_window.py（GUI --snapshot）
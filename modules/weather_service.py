@@ -2,18 +2,20 @@
 # 使用 Open-Meteo 免费天气 API（无需 API Key）
 # API 文档: https://open-meteo.com/
 
-import urllib.request
 import urllib.error
 import json
 import logging
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, replace
+from typing import Iterable, Optional
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
-# 通用重试工具
+# 通用重试工具与连接池 HTTP 客户端
+from utils.http_pool import HTTPConnectionPool
 from utils.retry import retry_call
 
 # 城市配置表（经纬度）
@@ -25,12 +27,36 @@ from data.weather_codes import WEATHER_CODE_INFO, UNKNOWN_WEATHER
 # 静态配置（缓存 TTL 参数）
 from config.static.static_config import get_static_config
 
+# 持久化缓存（SQLite）、项目根定位与 dataclass 反序列化
+from modules.weather_store import WeatherStore
+from utils.dataclass_utils import dataclass_from_dict
+from utils.file_utils import get_project_root
+
 # 天气结果内存缓存：城市名 → (缓存时间戳, WeatherData)
 _weather_cache: dict[str, tuple[float, "WeatherData"]] = {}
 
+# 在途查询：城市名 → _Flight（single-flight，同城并发查询只发一次请求）
+_inflight: dict[str, "_Flight"] = {}
+
+# 保护 _weather_cache 与 _inflight（QThreadPool 工作线程并发读写；网络与磁盘 IO 不在锁内）
+_cache_lock = threading.Lock()
+
+# 持久化缓存单例：(是否已尝试打开, WeatherStore | None)，打开失败只尝试一次
+_default_store: tuple[bool, WeatherStore | None] = (False, None)
+
 # 缓存有效期（秒，来自静态配置）
 CACHE_TTL_SECONDS = int(get_static_config().base["weather_cache_ttl"])
 
+# 天气请求共享连接池（跨请求与 QThreadPool 工作线程复用 keep-alive 连接，参数来自静态配置）
+_http_pool = HTTPConnectionPool(
+    timeout=float(get_static_config().base["http_timeout"]),
+    idle_timeout=float(get_static_config().base["http_idle_timeout"]),
+    max_idle_per_host=int(get_static_config().base["http_max_idle_per_host"]),
+)
+
+# 过期数据最长可用时长（秒）：超过有效期但未超过此值时先返回旧数据并后台刷新，超过则同步查询；0 关闭
+CACHE_MAX_STALE_SECONDS = int(get_static_config().base["weather_cache_max_stale"])
+
 
 @dataclass
 class WeatherData:
@@ -42,75 +68,319 @@ class WeatherData:
     weather: str  # 中文短名（如"晴"）
     description: str  # 中文完整描述
     icon: str  # emoji 图标
+    stale: bool = False  # 是否为已过期的缓存数据（后台刷新中）
+
+
+def _fetch_weather_data(url: str) -> dict | list:
+    # 经共享连接池请求 Open-Meteo API（keep-alive + gzip）并解析 JSON（独立函数供 retry_call 重试）
+    return json.loads(_http_pool.get(url).decode("utf-8"))
+
 
+def _forecast_url(latitudes: str, longitudes: str) -> str:
+    # 拼接 Open-Meteo 当前天气 URL（多地点时经纬度为逗号分隔列表）
+    return (
+        f"https://api.open-meteo.com/v1/forecast?"
+        f"latitude={latitudes}&longitude={longitudes}"
+        f"&current=temperature_2m,relative_humidity_2m,weather_code,"
+        f"wind_speed_10m,apparent_temperature"
+        f"&timezone=auto"
+    )
+
+
+def _fetch_with_retry(url: str) -> dict | list:
+    # 网络错误自动重试（总尝试 3 次 = 首次 + 2 次重试）
+    return retry_call(
+        _fetch_weather_data,
+        url,
+        retries=3,
+        exceptions=(urllib.error.URLError, TimeoutError),
+        delay=1.0,
+    )
 
-def _fetch_weather_data(url: str) -> dict:
-    # 请求 Open-Meteo API 并解析 JSON（独立函数供 retry_call 重试）
-    with urllib.request.urlopen(url, timeout=10) as response:
-        return json.loads(response.read().decode("utf-8"))
+
+def _parse_weather(data: dict) -> WeatherData:
+    # 单个地点的响应对象 → WeatherData（缺失字段按 0 兜底）
+    current = data.get("current", {})
+    weather_code = current.get("weather_code", 0)
+    code_info = WEATHER_CODE_INFO.get(weather_code, UNKNOWN_WEATHER)
+
+    return WeatherData(
+        temperature=current.get("temperature_2m", 0),
+        humidity=current.get("relative_humidity_2m", 0),
+        wind_speed=current.get("wind_speed_10m", 0),
+        apparent_temperature=current.get("apparent_temperature", 0),
+        weather_code=weather_code,
+        weather=code_info.name,
+        description=code_info.description,
+        icon=code_info.icon,
+    )
 
 
 def get_weather_by_coords(lat: float, lon: float) -> Optional[WeatherData]:
     # 拼接 API URL，重试耗尽后统一返回 None；仅捕获网络/解析类异常，编程错误上抛
     try:
-        # 使用 Open-Meteo API
-        url = (
-            f"https://api.open-meteo.com/v1/forecast?"
-            f"latitude={lat}&longitude={lon}"
-            f"&current=temperature_2m,relative_humidity_2m,weather_code,"
-            f"wind_speed_10m,apparent_temperature"
-            f"&timezone=auto"
-        )
-
-        # 网络错误自动重试（总尝试 3 次 = 首次 + 2 次重试）
-        data = retry_call(
-            _fetch_weather_data,
-            url,
-            retries=3,
-            exceptions=(urllib.error.URLError, TimeoutError),
-            delay=1.0,
-        )
-
-        current = data.get("current", {})
-        weather_code = current.get("weather_code", 0)
-        code_info = WEATHER_CODE_INFO.get(weather_code, UNKNOWN_WEATHER)
-
-        return WeatherData(
-            temperature=current.get("temperature_2m", 0),
-            humidity=current.get("relative_humidity_2m", 0),
-            wind_speed=current.get("wind_speed_10m", 0),
-            apparent_temperature=current.get("apparent_temperature", 0),
-            weather_code=weather_code,
-            weather=code_info.name,
-            description=code_info.description,
-            icon=code_info.icon,
-        )
+        data = _fetch_with_retry(_forecast_url(str(lat), str(lon)))
+        return _parse_weather(data)
     except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as e:
         # 网络/超时/JSON 解析失败：记录堆栈并降级返回 None
         logger.exception(f"获取天气信息失败: {e}")
         return None
 
 
-def get_weather_by_city(city_name: str) -> Optional[WeatherData]:
-    # 命中缓存直接返回
-    cached = _weather_cache.get(city_name)
+def get_weather_by_coords_batch(
+    coords: list[tuple[float, float]],
+) -> list[Optional[WeatherData]]:
+    # 多地点单次请求：经纬度拼成逗号分隔列表，响应为按请求顺序排列的对象数组；
+    # 失败（网络/解析/条目数不符）时全部返回 None，与单地点查询同一降级口径
+    if not coords:
+        return []
+    latitudes = ",".join(str(lat) for lat, _ in coords)
+    longitudes = ",".join(str(lon) for _, lon in coords)
+    try:
+        data = _fetch_with_retry(_forecast_url(latitudes, longitudes))
+    except (urllib.error.URLError, TimeoutError, json.JSONDecodeError) as e:
+        logger.exception(f"批量获取天气信息失败: {e}")
+        return [None] * len(coords)
+    # 单地点时 Open-Meteo 返回对象而非数组
+    items = [data] if isinstance(data, dict) else data
+    if len(items) != len(coords):
+        logger.error(f"批量天气响应条目数不符: 请求 {len(coords)} 个，返回 {len(items)} 个")
+        return [None] * len(coords)
+    return [_parse_weather(item) for item in items]
+
+
+def get_weather_store() -> WeatherStore | None:
+    # 懒加载持久化缓存（路径/容量来自静态配置）；打开失败时记录警告并退化为纯内存缓存
+    global _default_store
+    loaded, store = _default_store
+    if loaded:
+        return store
+    base = get_static_config().base
+    try:
+        store = WeatherStore(
+            get_project_root() / base["weather_cache_path"],
+            int(base["weather_cache_max_cities"]),
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"天气持久化缓存不可用，仅使用内存缓存: {e}")
+        store = None
+    _default_store = (True, store)
+    return store
+
+
+def reset_weather_store(store: WeatherStore | None = None, loaded: bool = False) -> None:
+    # 重置持久化缓存单例（测试注入或禁用用）；loaded=True 时直接使用传入的 store（None 即禁用）
+    global _default_store
+    _, old = _default_store
+    if old is not None and old is not store:
+        old.close()
+    _default_store = (loaded, store)
+
+
+class _Flight:
+    __slots__ = ("done", "result")
+
+    def __init__(self):
+        # 单个城市的一次在途查询：完成事件 + 结果（失败为 None）
+        self.done = threading.Event()
+        self.result: Optional[WeatherData] = None
+
+    def wait(self, timeout: float | None = None) -> Optional[WeatherData]:
+        # 跟随者阻塞等待领头查询完成，共享其结果（超时返回 None）
+        if not self.done.wait(timeout):
+            return None
+        return self.result
+
+
+def _cached_entry(city_name: str) -> tuple[float, WeatherData] | None:
+    # 先查内存，未命中再读磁盘并回填内存（不论是否过期，有效期由调用方判断）
+    with _cache_lock:
+        cached = _weather_cache.get(city_name)
+    if cached is not None:
+        return cached
+    store = get_weather_store()
+    if store is None:
+        return None
+    try:
+        record = store.load(city_name)
+    except sqlite3.Error as e:
+        logger.warning(f"读取天气持久化缓存失败: {e}")
+        return None
+    if record is None:
+        return None
+    weather = dataclass_from_dict(WeatherData, record[1], tolerant=True)
+    if weather is None:
+        return None
+    with _cache_lock:
+        # 读盘期间其他线程已写入更新结果时以内存为准
+        return _weather_cache.setdefault(city_name, (record[0], weather))
+
+
+def _fresh(city_name: str) -> Optional[WeatherData]:
+    # 缓存（内存或磁盘）中未过期的天气，无则 None
+    cached = _cached_entry(city_name)
     if cached and time.time() - cached[0] < CACHE_TTL_SECONDS:
         return cached[1]
+    return None
+
 
-    # 实际查询（失败不缓存，下次立即重试）
-    city_info = CITIES.get(city_name)
-    if not city_info:
+def _remember(records: dict[str, tuple[float, WeatherData]]) -> None:
+    # 成功结果写入内存缓存与持久化缓存（磁盘写入失败只记录警告）
+    with _cache_lock:
+        _weather_cache.update(records)
+    store = get_weather_store()
+    if store is None or not records:
+        return
+    try:
+        store.save_many(records)
+    except sqlite3.Error as e:
+        logger.warning(f"写入天气持久化缓存失败: {e}")
+
+
+def _claim_flights(city_names: list[str]) -> tuple[dict[str, _Flight], dict[str, _Flight]]:
+    # 登记在途查询：返回（本调用领头的城市, 已有其他调用在途、需等待的城市）
+    owned: dict[str, _Flight] = {}
+    joined: dict[str, _Flight] = {}
+    with _cache_lock:
+        for city_name in city_names:
+            flight = _inflight.get(city_name)
+            if flight is None:
+                owned[city_name] = _inflight[city_name] = _Flight()
+            else:
+                joined[city_name] = flight
+    return owned, joined
+
+
+def _finish_flights(owned: dict[str, _Flight], results: dict[str, Optional[WeatherData]]) -> None:
+    # 领头查询结束（含异常）：注销在途记录并唤醒跟随者
+    with _cache_lock:
+        for city_name in owned:
+            del _inflight[city_name]
+    for city_name, flight in owned.items():
+        flight.result = results.get(city_name)
+        flight.done.set()
+
+
+def get_cached_weather(city_name: str) -> Optional[WeatherData]:
+    # 不发请求：返回内存或磁盘中上次的天气（已过期时标记 stale），供启动时立即渲染
+    cached = _cached_entry(city_name)
+    if cached is None:
         return None
-    lat, lon = city_info
-    result = get_weather_by_coords(lat, lon)
-    if result is not None:
-        _weather_cache[city_name] = (time.time(), result)
+    fetched_at, weather = cached
+    if time.time() - fetched_at >= CACHE_TTL_SECONDS:
+        return replace(weather, stale=True)
+    return weather
+
+
+def _refresh(city_name: str, owned: dict[str, _Flight]) -> Optional[WeatherData]:
+    # 领头查询：复查缓存（未命中与登记之间可能恰有上一轮查询完成），否则发请求并写入缓存；
+    # 结束时唤醒跟随者（失败不缓存，下次立即重试）
+    result = None
+    try:
+        result = _fresh(city_name)
+        if result is None:
+            lat, lon = CITIES[city_name]
+            result = get_weather_by_coords(lat, lon)
+            if result is not None:
+                _remember({city_name: (time.time(), result)})
+    finally:
+        _finish_flights(owned, {city_name: result})
     return result
 
 
+def _refresh_in_background(city_name: str, owned: dict[str, _Flight]) -> None:
+    # 后台刷新线程入口：编程错误记录堆栈（跟随者已由 _refresh 唤醒）
+    try:
+        _refresh(city_name, owned)
+    except Exception as e:
+        logger.exception(f"后台刷新天气异常: {e}")
+
+
+def get_weather_by_city(city_name: str) -> Optional[WeatherData]:
+    # 命中缓存（内存或磁盘）且未过期直接返回
+    cached = _cached_entry(city_name)
+    age = time.time() - cached[0] if cached else None
+    if cached and age < CACHE_TTL_SECONDS:
+        return cached[1]
+    if city_name not in CITIES:
+        return None
+
+    # stale-while-revalidate：过期未超过最长可用时长时立即返回旧数据（stale=True），
+    # 同城只启动一个后台刷新（已在途则不再启动）
+    if cached and age < CACHE_MAX_STALE_SECONDS:
+        owned, _ = _claim_flights([city_name])
+        if owned:
+            threading.Thread(
+                target=_refresh_in_background,
+                args=(city_name, owned),
+                name=f"weather-refresh-{city_name}",
+                daemon=True,
+            ).start()
+        return replace(cached[1], stale=True)
+
+    # single-flight：同城并发调用只有领头者发请求，其余等待并共享结果
+    owned, joined = _claim_flights([city_name])
+    if joined:
+        return joined[city_name].wait()
+    return _refresh(city_name, owned)
+
+
+def wait_weather_refresh(city_name: str, timeout: float | None = None) -> Optional[WeatherData]:
+    # 等待该城市在途查询（含后台刷新）完成并返回其结果；无在途查询时返回未过期缓存或 None
+    with _cache_lock:
+        flight = _inflight.get(city_name)
+    if flight is not None:
+        return flight.wait(timeout)
+    return _fresh(city_name)
+
+
+def get_weather_by_cities(
+    city_names: Iterable[str] | None = None,
+) -> dict[str, Optional[WeatherData]]:
+    # 批量城市查询（默认 CITIES 全部城市）：缓存有效的直接返回，其余合并为一次请求并整体写入缓存；
+    # 已有单城查询在途的城市等待其结果而不重复请求；未知城市与请求失败的城市为 None（失败不缓存）
+    results: dict[str, Optional[WeatherData]] = {}
+    pending: list[str] = []
+    for city_name in CITIES if city_names is None else city_names:
+        fresh = _fresh(city_name)
+        if fresh is not None or city_name not in CITIES:
+            results[city_name] = fresh
+        else:
+            pending.append(city_name)
+
+    owned, joined = _claim_flights(pending)
+    fetched: dict[str, Optional[WeatherData]] = {}
+    try:
+        if owned:
+            names = list(owned)
+            fetched = dict(zip(names, get_weather_by_coords_batch([CITIES[n] for n in names])))
+            fetched_at = time.time()
+            _remember(
+                {
+                    city_name: (fetched_at, result)
+                    for city_name, result in fetched.items()
+                    if result is not None
+                }
+            )
+    finally:
+        _finish_flights(owned, fetched)
+    for city_name in pending:
+        results[city_name] = (
+            fetched[city_name] if city_name in owned else joined[city_name].wait()
+        )
+    return results
+
+
 def clear_weather_cache() -> None:
-    # 直接清空模块级缓存字典
-    _weather_cache.clear()
+    # 清空内存缓存字典与持久化缓存
+    with _cache_lock:
+        _weather_cache.clear()
+    store = get_weather_store()
+    if store is not None:
+        try:
+            store.clear()
+        except sqlite3.Error as e:
+            logger.warning(f"清空天气持久化缓存失败: {e}")
 
 
 def format_weather_info(weather: Optional[WeatherData], city_name: str = "") -> str:
@@ -125,16 +395,44 @@ def format_weather_info(weather: Optional[WeatherData], city_name: str = "") ->
         f"体感 {weather.apparent_temperature:.1f}°C | "
         f"湿度 {weather.humidity}% | "
         f"风力 {weather.wind_speed:.1f}km/h"
+        f"{' | 待更新' if weather.stale else ''}"
     )
 
 
 # ===== modules/weather_service.py 函数/常量说明 =====
-# WeatherData: dataclass，天气信息聚合类（S10.11 C1：to_display 已删，展示统一走 format_weather_info）
-# _fetch_weather_data(url): 请求 API 并解析 JSON（供 retry_call 重试的可调用对象）
+# WeatherData: dataclass，天气信息聚合类（S10.11 C1：to_display 已删，展示统一走 format_weather_info）；
+#   stale=True 表示返回的是已过期缓存（后台刷新中）
+# CACHE_TTL_SECONDS / CACHE_MAX_STALE_SECONDS: 缓存有效期 / 过期数据最长可用时长（0 关闭 stale-while-revalidate）
+# _http_pool: 共享 HTTPConnectionPool（utils/http_pool.py，keep-alive + gzip，空闲超时关闭）
+# _fetch_weather_data(url): 经连接池请求 API 并解析 JSON（供 retry_call 重试的可调用对象；conftest 打桩点）
+# _forecast_url(latitudes, longitudes): 拼接 API URL（多地点为逗号分隔列表）
+# _fetch_with_retry(url): _fetch_weather_data 的重试包装（URLError/TimeoutError 自动重试 2 次）
+# _parse_weather(data): 单地点响应对象 → WeatherData
 # get_weather_by_coords(lat, lon): 经纬度查询，URLError/TimeoutError 自动重试 2 次
-# get_weather_by_city(city_name): 城市查询，30 分钟缓存（仅缓存成功，失败可立即重试）
-# clear_weather_cache(): 清空缓存
+# get_weather_by_coords_batch(coords): 多地点单次请求（Open-Meteo 逗号分隔经纬度），按请求顺序拆分为 WeatherData；
+#   失败或条目数不符时全部为 None
+# get_weather_store() / reset_weather_store(store=None, loaded=False): 持久化缓存懒加载单例
+#   （modules/weather_store.py，打开失败退化为纯内存）与重置/注入
+# _Flight: 单城在途查询（完成事件 + 结果），wait() 供跟随者共享领头结果
+# _cached_entry(city): 内存 → 磁盘两级查找，磁盘命中回填内存；_fresh(city): 未过期缓存或 None；
+#   _remember(records): 成功结果写入两级缓存
+# _claim_flights(cities) -> (owned, joined) / _finish_flights(owned, results): 在途登记与完成唤醒
+#   （finally 中调用，领头异常时跟随者得到 None 而不会永久阻塞）
+# get_cached_weather(city_name): 不发请求，返回上次天气（过期时 stale=True），GUI 启动即时渲染用
+# _refresh(city, owned) / _refresh_in_background(city, owned): 领头查询（复查缓存 → 请求 → 写缓存 → 唤醒跟随者）
+#   及其后台线程入口
+# get_weather_by_city(city_name): 城市查询，30 分钟缓存（内存 + 磁盘，仅缓存成功，失败可立即重试）；
+#   stale-while-revalidate：过期但未超过 CACHE_MAX_STALE_SECONDS 时立即返回旧数据（stale=True），
+#   同城只启动一个后台刷新线程；超过该上限或无缓存时同步查询（不再因重试阻塞调用方最长约 30 秒）；
+#   single-flight：同城并发调用共享一次在途请求（领头后复查缓存，避免刚完成的查询被重复发起）
+# wait_weather_refresh(city_name, timeout=None): 等待在途/后台刷新完成并返回结果（GUI 先显示旧数据再更新用）
+# get_weather_by_cities(city_names=None): 批量城市查询（默认全部 CITIES），缓存有效的直接返回，
+#   其余合并为一次请求（17 城刷新从 17 次往返降为 1 次）并整体写入缓存；已在途的城市等待其结果
+#   线程安全：_weather_cache/_inflight 的读写均经 _cache_lock，锁内不做网络与磁盘 IO
+# clear_weather_cache(): 清空内存与持久化缓存
 # format_weather_info(weather, city_name): 完整展示文本
 #   设计理由：缓存减少 API 调用（对应 M09a）；失败不缓存保证网络恢复后及时更新
 #   异常处理：网络/解析异常统一返回 None 并记录堆栈；其余异常上抛暴露编程错误
-#   关联配置：城市表 data/cities.py；天气代码表 data/weather_codes.py；重试工具 utils/retry.py
+#   关联配置：城市表 data/cities.py；天气代码表 data/weather_codes.py；重试工具 utils/retry.py；
+#     持久化缓存 base.json weather_cache_path/weather_cache_max_cities；过期上限 weather_cache_max_stale；
+#     连接池 http_timeout/http_idle_timeout/http_max_idle_per_host
@@ -0,0 +1,102 @@
+# 天气持久化缓存模块（SQLite，跨进程重启保留上次天气）
+# 启动时先从磁盘渲染上次结果，再后台刷新；按城市最近访问时间淘汰，表大小有上限
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+# 配置日志
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS weather (
+    city TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+
+class WeatherStore:
+    def __init__(self, path: Path | str, max_cities: int):
+        # 打开（必要时创建）数据库；QThreadPool 后台任务与 GUI 线程共用连接，读写经锁串行
+        if max_cities < 1:
+            raise ValueError("max_cities 必须大于等于 1")
+        self.path = Path(path)
+        self.max_cities = max_cities
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def load(self, city_name: str) -> tuple[float, dict[str, Any]] | None:
+        # 读取城市记录 → (抓取时间戳, WeatherData 字段字典)，并刷新最近访问时间；无记录返回 None
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT fetched_at, data FROM weather WHERE city = ?", (city_name,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE weather SET last_seen = ? WHERE city = ?", (time.time(), city_name)
+            )
+        return row[0], json.loads(row[1])
+
+    def save_many(self, records: dict[str, tuple[float, Any]]) -> None:
+        # 写入 {城市: (抓取时间戳, WeatherData)}（单事务），随后按最近访问时间淘汰超出上限的城市
+        now = time.time()
+        rows = [
+            (city, fetched_at, now, json.dumps(asdict(weather), ensure_ascii=False))
+            for city, (fetched_at, weather) in records.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO weather (city, fetched_at, last_seen, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(city) DO UPDATE SET fetched_at = excluded.fetched_at, "
+                "last_seen = excluded.last_seen, data = excluded.data",
+                rows,
+            )
+            self._conn.execute(
+                "DELETE FROM weather WHERE city NOT IN "
+                "(SELECT city FROM weather ORDER BY last_seen DESC LIMIT ?)",
+                (self.max_cities,),
+            )
+
+    def save(self, city_name: str, fetched_at: float, weather: Any) -> None:
+        # 写入单个城市
+        self.save_many({city_name: (fetched_at, weather)})
+
+    def cities(self) -> list[str]:
+        # 已存城市（最近访问在前）
+        with self._lock:
+            rows = self._conn.execute("SELECT city FROM weather ORDER BY last_seen DESC").fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self) -> None:
+        # 清空全部记录
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM weather")
+
+    def close(self) -> None:
+        # 关闭连接
+        with self._lock:
+            self._conn.close()
+
+
+# ===== modules/weather_store.py 函数/类说明 =====
+# WeatherStore(path, max_cities): SQLite 天气持久化缓存（单表 weather：city 主键/fetched_at/last_seen/data JSON）
+#   load(city) -> (fetched_at, 字段字典) | None: 读取并刷新 last_seen（反序列化由调用方完成）
+#   save(city, fetched_at, weather) / save_many({city: (fetched_at, weather)}): upsert（单事务），
+#     之后按 last_seen 保留最近 max_cities 个城市，其余淘汰
+#   cities(): 已存城市（最近访问在前）；clear()/close(): 清空/关闭
+#   设计理由：进程内字典每次启动都是冷缓存，GUI 需等网络返回才有天气；持久化后启动即可显示上次结果；
+#     有效期判断沿用 weather_cache_ttl（由 modules/weather_service.py 按 fetched_at 判断）
+#   异常处理：max_cities < 1 抛 ValueError；sqlite3.Error 由调用方捕获降级为纯内存缓存
+#   关联配置：路径 base.json weather_cache_path，容量 weather_cache_max_cities
@@ -0,0 +1,167 @@
+# 多倍率世界注册表模块（同屏并排显示 1.5x/2x/5x/20x 等多个倍率）
+# 每次求值只读一次时钟：标准日期时间、中文日期、农历等与倍率无关部分计算一次供所有倍率共享，
+# 各倍率字段以紧凑数组输出
+
+import datetime
+from array import array
+from typing import Iterable
+
+# 时钟源与 now_ns() 计数起点
+from modules.clock_source import LOCAL_EPOCH, ClockSource, RealClock
+
+# 分段膨胀日程（单个世界可按日程换算）
+from modules.dilation_schedule import DilationSchedule
+
+# 时间膨胀核心（换算口径与单世界完全一致）
+from modules.time_dilation import AcceleratedWorld, LazyDateFields, TimeInfo, format_custom_time
+
+_NS_PER_MILLISECOND = 1_000_000
+_NS_PER_SECOND = 1_000_000_000
+
+
+class MultiWorldFrame:
+    __slots__ = (
+        "standard_second",  # 本帧标准秒序号（距 LOCAL_EPOCH）
+        "standard_datetime",  # 标准日期时间字符串（所有倍率共享）
+        "rates",  # 各世界平均倍率 array('d')
+        "custom_ns",  # 各世界当天自定义纳秒 array('q')
+        "dilation_percentage",  # 各世界当前倍率百分比 array('d')（日程取当前时段倍率）
+        "remaining_hours",  # 各世界加速后当天剩余小时 array('d')
+        "hours_per_day",  # 各世界一天自定义小时数 array('q')
+        "_date_fields",  # 中文日期/农历（LazyDateFields，所有倍率共享且惰性计算）
+    )
+
+    def __init__(
+        self,
+        standard_second: int,
+        standard_datetime: str,
+        date_fields: LazyDateFields,
+        rates: array,
+        custom_ns: array,
+        dilation_percentage: array,
+        remaining_hours: array,
+        hours_per_day: array,
+    ):
+        # 一次求值的结果：共享字段各一份，逐倍率字段为等长数组（下标即注册顺序）
+        self.standard_second = standard_second
+        self.standard_datetime = standard_datetime
+        self._date_fields = date_fields
+        self.rates = rates
+        self.custom_ns = custom_ns
+        self.dilation_percentage = dilation_percentage
+        self.remaining_hours = remaining_hours
+        self.hours_per_day = hours_per_day
+
+    def __len__(self) -> int:
+        # 世界数量
+        return len(self.custom_ns)
+
+    @property
+    def chinese_date(self) -> str:
+        # 中文日期（首次访问才计算，所有倍率共享）
+        return self._date_fields.chinese_date
+
+    @property
+    def lunar_info(self) -> str:
+        # 农历信息（首次访问才计算，所有倍率共享）
+        return self._date_fields.lunar_info
+
+    def custom_ms(self, index: int) -> int:
+        # 第 index 个世界的当天自定义毫秒数（高频显示用）
+        return self.custom_ns[index] // _NS_PER_MILLISECOND
+
+    def custom_time(self, index: int) -> str:
+        # 第 index 个世界的自定义时间 HH:MM:SS（按需格式化，只显示部分倍率时不格式化其余）
+        return format_custom_time(self.custom_ns[index], self.hours_per_day[index])
+
+    def info(self, index: int) -> TimeInfo:
+        # 第 index 个世界的 TimeInfo（与 get_custom_time 字段一致，日期字段与其余世界共享同一对象）
+        return TimeInfo(
+            standard_datetime=self.standard_datetime,
+            custom_time=self.custom_time(index),
+            dilation_percentage=self.dilation_percentage[index],
+            expanded_hours_per_day=24.0 * self.rates[index],
+            remaining_hours=self.remaining_hours[index],
+            date_fields=self._date_fields,
+        )
+
+
+class WorldRegistry:
+    def __init__(self, rates: Iterable[float] = (), clock: ClockSource | None = None):
+        # 按倍率注册世界（各自校验倍率下限），所有世界共享同一时钟源
+        self.clock = clock if clock is not None else RealClock()
+        self._worlds: list[AcceleratedWorld] = []
+        self._date_cache: tuple[int, str, LazyDateFields] | None = (
+            None  # (标准秒序号, 标准日期时间, 惰性日期字段) 与倍率无关部分的秒级缓存
+        )
+        for rate in rates:
+            self.add(rate)
+
+    def __len__(self) -> int:
+        # 已注册世界数量
+        return len(self._worlds)
+
+    @property
+    def worlds(self) -> tuple[AcceleratedWorld, ...]:
+        # 已注册世界（注册顺序，与 MultiWorldFrame 数组下标一致）
+        return tuple(self._worlds)
+
+    def add(self, rate: float | None = None, schedule: DilationSchedule | None = None) -> int:
+        # 注册一个倍率（或分段日程）世界，返回其数组下标；非法倍率抛 ValueError
+        self._worlds.append(
+            AcceleratedWorld(time_dilation_rate=rate, clock=self.clock, schedule=schedule)
+        )
+        return len(self._worlds) - 1
+
+    def evaluate(self) -> MultiWorldFrame:
+        # 单次取时：读一次时钟，共享字段每标准秒构造一次，各世界只做整数换算
+        local_ns = self.clock.now_ns()
+        standard_second = local_ns // _NS_PER_SECOND
+        if self._date_cache is not None and self._date_cache[0] == standard_second:
+            _, standard_datetime, date_fields = self._date_cache
+        else:
+            now = LOCAL_EPOCH + datetime.timedelta(seconds=standard_second)
+            standard_datetime = now.strftime("%Y-%m-%d %H:%M:%S")
+            date_fields = LazyDateFields(now)
+            self._date_cache = (standard_second, standard_datetime, date_fields)
+
+        rates = array("d")
+        custom_ns = array("q")
+        dilation_percentage = array("d")
+        remaining_hours = array("d")
+        hours_per_day = array("q")
+        for world in self._worlds:
+            custom, percentage, remaining = world.dilation_at(local_ns)
+            rates.append(world.time_dilation_rate)
+            custom_ns.append(custom)
+            dilation_percentage.append(percentage)
+            remaining_hours.append(remaining)
+            hours_per_day.append(world.custom_hours_per_day)
+        return MultiWorldFrame(
+            standard_second,
+            standard_datetime,
+            date_fields,
+            rates,
+            custom_ns,
+            dilation_percentage,
+            remaining_hours,
+            hours_per_day,
+        )
+
+
+# ===== modules/world_registry.py 函数/类说明 =====
+# MultiWorldFrame: 一次多倍率求值结果（__slots__）
+#   standard_second/standard_datetime/chinese_date/lunar_info: 与倍率无关，所有世界共享一份（日期字段惰性）
+#   rates/custom_ns/dilation_percentage/remaining_hours/hours_per_day: 逐世界紧凑数组（array('d')/array('q')），
+#     下标为注册顺序
+#   custom_time(i)/custom_ms(i): 按需格式化第 i 个世界的 HH:MM:SS / 当天自定义毫秒数
+#   info(i) -> TimeInfo: 与 AcceleratedWorld.get_custom_time() 字段一致，日期字段对象共享
+# WorldRegistry(rates=(), clock=None): 多倍率世界注册表，所有世界共享同一时钟源
+#   add(rate=None, schedule=None) -> int: 注册世界（AcceleratedWorld 校验倍率），返回下标
+#   worlds: 已注册世界元组
+#   evaluate() -> MultiWorldFrame: 单次读时钟求值；标准日期时间与惰性日期字段按标准秒缓存，
+#     各世界仅调用公开的 AcceleratedWorld.dilation_at 整数换算（与单世界同一取整口径）
+#   设计理由：并排显示多个倍率时，N 个独立世界各自读时钟、格式化标准时间与计算农历；
+#     注册表把与倍率无关部分降为每帧一份，逐倍率成本只剩整数乘除
+#   异常处理：倍率低于 rate_min 由 AcceleratedWorld 抛 ValueError
+#   关联配置：倍率下限/默认值来自 config/static/base.json；时钟源来自 modules/clock_source.py
@@ -1,5 +1,6 @@
 # pytest 共享 fixture（S9.7 测试引入）
 # 隔离策略：用户配置重定向到临时目录（不污染真实 user_config.json）+ 天气网络打桩（不发真实请求）
+#   + 天气持久化缓存禁用（不写项目内数据库）
 
 import pytest
 
@@ -37,6 +38,9 @@ def mock_weather(monkeypatch):
         }
 
     monkeypatch.setattr(weather_service, "_fetch_weather_data", fake_fetch)
+    # 持久化缓存默认禁用（不读写项目内数据库）；需要时用例自行注入临时目录下的 WeatherStore
+    weather_service.reset_weather_store(None, loaded=True)
     weather_service.clear_weather_cache()
     yield
     weather_service.clear_weather_cache()
+    weather_service.reset_weather_store()
@@ -1,9 +1,10 @@
 # 闹钟模块测试（S9.7 测试引入）
-# 覆盖：构造校验、重复/一次性触发、跨天去重、上限、容错、编辑保留 ID、预设铃声辅助
+# 覆盖：构造校验、重复/一次性触发、跨天去重、上限、容错、编辑保留 ID、预设铃声辅助、注入时钟
 
 import datetime
 
 from modules.alarm_service import Alarm, AlarmManager, PresetSound
+from modules.clock_source import SimulatedClock
 
 
 def _alarm(label="测试", time="07:00", **kwargs):
@@ -119,3 +120,15 @@ def test_preset_helpers():
     assert PresetSound.from_index(2) is PresetSound.BEEP
     assert PresetSound.from_value("CLASSIC") is PresetSound.CLASSIC
     assert PresetSound.from_value("不存在的") is PresetSound.CLASSIC  # 兜底
+
+
+def test_alarm_manager_simulated_week():
+    # 闹钟管理器注入模拟时钟：一周逐分钟 tick，工作日闹钟恰好触发 5 次
+    clock = SimulatedClock(datetime.datetime(2026, 8, 3))  # 周一
+    manager = AlarmManager(clock=clock)
+    manager.add_alarm(Alarm(label="起床", time="07:00", repeat_days=[0, 1, 2, 3, 4]))
+    fired = 0
+    for _ in range(7 * 24 * 60):
+        fired += len(manager.check_alarms())
+        clock.advance(60)
+    assert fired == 5
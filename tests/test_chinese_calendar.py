@@ -1,12 +1,23 @@
 # 农历/日期模块测试（S9.7 测试引入）
-# 覆盖：干支/生肖/月日/时辰/节日/年份边界/格式化
+# 覆盖：干支/生肖/月日/时辰/节日/年份边界/格式化/时辰分桶缓存/区间生成器/节日年度索引/节气索引/后台预热
 
 import datetime
+import threading
 
+import pytest
+
+import modules.chinese_calendar as chinese_calendar
 from modules.chinese_calendar import (
     get_chinese_lunar_calendar,
     get_chinese_date,
     get_lunar_info,
+    get_lunar_range,
+    get_current_jieqi,
+    get_next_jieqi,
+    get_public_holiday,
+    warm_up_lunar,
+    get_lunar_cache_stats,
+    clear_lunar_cache,
 )
 
 
@@ -67,3 +78,141 @@ def test_lunar_info_string():
     assert "丙午年" in text
     assert "马" in text
     assert "拜财神" in text
+
+
+def test_lunar_cache_shichen_bucket(monkeypatch):
+    # (日期, 时辰) 分桶缓存：同一时辰内逐秒查询只算一次，跨时辰/跨日才重算，计数正确
+    calls = {"n": 0}
+    orig = chinese_calendar.get_chinese_lunar_calendar
+
+    def counting(year, month, day, hour):
+        # 统计农历全量计算次数
+        calls["n"] += 1
+        return orig(year, month, day, hour)
+
+    monkeypatch.setattr(chinese_calendar, "get_chinese_lunar_calendar", counting)
+    clear_lunar_cache()
+    start = datetime.datetime(2026, 8, 8, 11, 0, 0)
+    texts = {get_lunar_info(start + datetime.timedelta(seconds=s)) for s in range(0, 7200, 7)}
+    assert len(texts) == 1 and calls["n"] == 1  # 11:00-12:59 同属午时
+    assert "午时" in get_lunar_info(datetime.datetime(2026, 8, 8, 12, 59))
+    assert "未时" in get_lunar_info(datetime.datetime(2026, 8, 8, 13, 0))
+    assert calls["n"] == 2
+    stats = get_lunar_cache_stats()
+    assert stats["misses"] == 2 and stats["hits"] == len(range(0, 7200, 7))
+    # 23 点与 0 点同属子时（同一天同一桶）
+    get_lunar_info(datetime.datetime(2026, 8, 8, 23, 30))
+    get_lunar_info(datetime.datetime(2026, 8, 8, 0, 30))
+    assert calls["n"] == 3
+
+
+def test_lunar_cache_bounded(monkeypatch):
+    # 容量有界：超出上限按 LRU 淘汰
+    monkeypatch.setattr(chinese_calendar, "LUNAR_CACHE_MAXSIZE", 5)
+    clear_lunar_cache()
+    for day in range(1, 11):
+        get_lunar_info(datetime.datetime(2026, 8, day, 12))
+    assert get_lunar_cache_stats()["size"] == 5
+    clear_lunar_cache()
+    assert get_lunar_cache_stats() == {"hits": 0, "misses": 0, "size": 0, "maxsize": 5}
+
+
+def test_lunar_range_matches_per_day():
+    # 区间生成器与逐日查询一致（跨农历年/闰六月的 2025 全年 + 除夕/春节）
+    start = datetime.date(2025, 1, 1)
+    infos = list(get_lunar_range(start, datetime.date(2025, 12, 31), hour=9))
+    assert len(infos) == 365
+    for offset, info in enumerate(infos):
+        day = start + datetime.timedelta(days=offset)
+        assert info == get_chinese_lunar_calendar(day.year, day.month, day.day, 9)
+    assert infos[27].public_holiday == "除夕"  # 2025-01-28
+    assert any(info.lunar_month == "闰六月" for info in infos)
+
+
+def test_lunar_range_streams():
+    # 生成器惰性输出：百年区间只取首项；空区间不产出
+    dates = get_lunar_range(datetime.date(1901, 1, 1), datetime.date(2100, 12, 31))
+    first = next(dates)
+    assert first.lunar_year == "庚子年" and first.lunar_month == "冬月"
+    assert list(get_lunar_range(datetime.date(2026, 2, 1), datetime.date(2026, 1, 1))) == []
+
+
+def test_holiday_index_precedence():
+    # 年度索引合并优先级：农历节日 > chinese-calendar > 自定义节日，英文名已翻译
+    assert get_public_holiday(datetime.date(2026, 2, 17)) == "春节"
+    assert get_public_holiday(datetime.date(2026, 1, 1)) == "元旦"
+    assert get_public_holiday(datetime.date(2026, 10, 1)) == "国庆节"
+    assert get_public_holiday(datetime.date(2026, 2, 14)) == "情人节"
+    assert get_public_holiday(datetime.date(2026, 8, 9)) == ""
+
+
+def test_holiday_index_built_once(monkeypatch):
+    # 支持范围外年份：chinese-calendar 只探测一次，整年查询不再触发异常
+    calls = {"n": 0}
+
+    def unsupported(day):
+        # 模拟 chinese-calendar 不支持该年份
+        calls["n"] += 1
+        raise NotImplementedError
+
+    monkeypatch.setattr(chinese_calendar, "get_holiday_detail", unsupported)
+    monkeypatch.setattr(chinese_calendar, "_holiday_indexes", {})
+    start = datetime.date(1950, 1, 1)
+    names = [get_public_holiday(start + datetime.timedelta(days=i)) for i in range(365)]
+    assert calls["n"] == 1
+    assert names[(datetime.date(1950, 10, 1) - start).days] == "国庆节"  # 自定义节日兜底
+
+
+def test_jieqi_current_and_next():
+    # 节气索引：立秋后处暑前，当前为立秋、下一为处暑；交节时刻本身归属新节气
+    moment = datetime.datetime(2026, 8, 8, 12)
+    current = get_current_jieqi(moment)
+    assert current.name == "立秋" and current.start.date() == datetime.date(2026, 8, 7)
+    term, remaining = get_next_jieqi(moment)
+    assert term.name == "处暑" and term.start == moment + remaining
+    assert get_current_jieqi(term.start).name == "处暑"
+    assert get_next_jieqi(term.start)[0].name == "白露"
+
+
+def test_jieqi_index_matches_day_fields():
+    # 索引中的交节日期与逐日字段的节气完全一致（2025-2026 两年，共 48 个节气）
+    days = {}
+    moment = datetime.datetime(2025, 1, 1)
+    while moment.year < 2027:
+        term, _ = get_next_jieqi(moment)
+        days[term.start.date()] = term.name
+        moment = term.start
+    start = datetime.date(2025, 1, 1)
+    infos = get_lunar_range(start, datetime.date(2026, 12, 31))
+    for offset, info in enumerate(infos):
+        assert info.jieqi == days.get(start + datetime.timedelta(days=offset), "")
+
+
+def test_jieqi_index_built_per_year(monkeypatch):
+    # 节气索引按年懒构建：查询只构建所在公历年与次年两个农历年，年末查询跨到次年小寒
+    monkeypatch.setattr(chinese_calendar, "_jieqi_indexes", {})
+    term, _ = get_next_jieqi(datetime.datetime(2026, 12, 30))
+    assert term.name == "小寒" and term.start.year == 2027
+    assert sorted(chinese_calendar._jieqi_indexes) == [2026, 2027]
+    assert get_current_jieqi(datetime.datetime(2026, 1, 1)).name == "冬至"
+    assert sorted(chinese_calendar._jieqi_indexes) == [2026, 2027]
+
+
+def test_jieqi_out_of_range():
+    # 超出配置年份范围抛 ValueError
+    with pytest.raises(ValueError):
+        get_current_jieqi(datetime.datetime(1800, 1, 1))
+    with pytest.raises(ValueError):
+        get_next_jieqi(datetime.datetime(2200, 1, 1))
+
+
+def test_warm_up_fills_caches():
+    # 后台预热线程跑完后，同一时辰的农历查询直接命中缓存
+    clear_lunar_cache()
+    moment = datetime.datetime(2026, 8, 8, 12)
+    thread = threading.Thread(target=warm_up_lunar, args=(moment,))
+    thread.start()
+    thread.join()
+    assert get_lunar_cache_stats()["misses"] == 1
+    get_lunar_info(moment)
+    assert get_lunar_cache_stats()["hits"] == 1
@@ -0,0 +1,67 @@
+# 时钟源模块测试
+# 覆盖：真实时钟、单调锚定时钟、模拟时钟推进/休眠、整数纳秒取时 now_ns、抽象基类
+
+import datetime
+
+import pytest
+
+from modules.clock_source import (
+    LOCAL_EPOCH,
+    ClockSource,
+    MonotonicClock,
+    RealClock,
+    SimulatedClock,
+)
+
+
+def test_real_clock_now():
+    # 真实时钟与系统时间一致（秒级误差内）
+    delta = datetime.datetime.now() - RealClock().now()
+    assert abs(delta.total_seconds()) < 1
+
+
+def test_monotonic_clock_anchor():
+    # 单调时钟从锚点起按流逝量推进，不回退
+    anchor = datetime.datetime(2026, 8, 8, 12, 0, 0)
+    clock = MonotonicClock(anchor)
+    t1 = clock.now()
+    t2 = clock.now()
+    assert anchor <= t1 <= t2 < anchor + datetime.timedelta(seconds=5)
+
+
+def test_simulated_clock_advance_and_sleep():
+    # 模拟时钟只在 advance/set/sleep 时前进，sleep 不阻塞
+    start = datetime.datetime(2026, 8, 8, 23, 59, 59)
+    clock = SimulatedClock(start)
+    assert clock.now() == start
+    assert clock.advance(1) == datetime.datetime(2026, 8, 9)
+    clock.sleep(3600)
+    assert clock.now() == datetime.datetime(2026, 8, 9, 1)
+    clock.advance(datetime.timedelta(minutes=30))
+    assert clock.now() == datetime.datetime(2026, 8, 9, 1, 30)
+    clock.set(start)
+    assert clock.now() == start
+
+
+def test_incomplete_subclass_rejected():
+    # ClockSource 为抽象基类：未实现 now/now_ns 的子类构造时即抛 TypeError
+    class NowOnly(ClockSource):
+        def now(self) -> datetime.datetime:
+            # 只实现 now()，缺 now_ns()
+            return datetime.datetime(2026, 8, 8)
+
+    with pytest.raises(TypeError):
+        ClockSource()
+    with pytest.raises(TypeError):
+        NowOnly()
+
+
+def test_now_ns_matches_now():
+    # now_ns 与 now() 同口径（本地墙上时间距 LOCAL_EPOCH 的纳秒）：模拟时钟精确相等，真实/单调时钟秒级误差内
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 12, 0, 0, 123456))
+    assert clock.now_ns() == (clock.now() - LOCAL_EPOCH) // datetime.timedelta(microseconds=1) * 1000
+    for source in (RealClock(), MonotonicClock()):
+        expected = (source.now() - LOCAL_EPOCH).total_seconds()
+        t1, t2 = source.now_ns(), source.now_ns()
+        assert t1 <= t2 or isinstance(source, RealClock)
+        assert abs(t1 / 1e9 - expected) < 1
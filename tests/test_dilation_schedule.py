@@ -0,0 +1,124 @@
+# 分段膨胀日程测试
+# 覆盖：前缀和、正向/反向二分换算与逐段扫描一致、反向最小性、格式校验、
+#   AcceleratedWorld 日程模式（标量/批量/反向/边界休眠）
+
+import datetime
+import random
+from array import array
+
+import pytest
+
+from modules.clock_source import SimulatedClock
+from modules.dilation_schedule import DilationSchedule
+from modules.time_dilation import AcceleratedWorld
+
+_HOUR_NS = 3600 * 10**9
+_DAY_NS = 24 * _HOUR_NS
+
+
+def _linear_dilated_ns(segments, day_ns):
+    # 参照实现：逐段累加（O(n)），验证前缀和 + 二分结果
+    total = 0
+    bounds = [start for start, _ in segments] + [_DAY_NS]
+    for (start, rate), end in zip(segments, bounds[1:]):
+        numerator, denominator = rate
+        if day_ns < end:
+            return total + (day_ns - start) * numerator // denominator
+        total += (end - start) * numerator // denominator
+    raise AssertionError("day_ns 越界")
+
+
+def test_prefix_and_forward():
+    # 会议 1x / 专注 4x / 其余 1x：前缀和与一天总量，正向换算按时段累计
+    schedule = DilationSchedule.parse("00:00=1,09:00=4,12:00=1")
+    assert schedule.prefix == (0, 9 * _HOUR_NS, 21 * _HOUR_NS, 33 * _HOUR_NS)
+    assert schedule.total_ns == 33 * _HOUR_NS
+    assert schedule.dilated_ns(10 * _HOUR_NS) == 13 * _HOUR_NS
+    assert schedule.rate_at(9 * _HOUR_NS) == 4.0 and schedule.rate_at(9 * _HOUR_NS - 1) == 1.0
+    assert schedule.standard_ns(13 * _HOUR_NS) == 10 * _HOUR_NS
+
+
+def test_matches_linear_scan_and_inverse_is_minimal():
+    # 非整数倍率多段日程：二分结果与逐段扫描一致；反向结果为正向 ≥ 目标的最小标准纳秒
+    rng = random.Random(7)
+    starts = sorted(rng.sample(range(1, 86400), 40))
+    spec = [("00:00", 1.7)] + [(s, rng.choice((1.0, 2.3, 3.75, 20.0))) for s in starts]
+    schedule = DilationSchedule(spec)
+    segments = list(zip(schedule.starts, schedule._ratios))
+    for _ in range(2000):
+        day_ns = rng.randrange(_DAY_NS)
+        assert schedule.dilated_ns(day_ns) == _linear_dilated_ns(segments, day_ns)
+        target = rng.randrange(schedule.total_ns)
+        t = schedule.standard_ns(target)
+        assert schedule.dilated_ns(t) >= target
+        assert t == 0 or schedule.dilated_ns(t - 1) < target
+
+
+def test_invalid_schedules():
+    # 不从 00:00 开始、起点非递增、倍率低于下限或高于上限、格式错误、反向越界均抛 ValueError
+    for bad in ("09:00=2", "00:00=2,12:00=3,11:00=1", "00:00=0.5", "00:00", "00:00=x", "24:00=1"):
+        with pytest.raises(ValueError):
+            DilationSchedule.parse(bad)
+    with pytest.raises(ValueError, match="必须在 1.0 到 20.0 之间"):
+        DilationSchedule.parse("00:00=1,09:00=25")
+    assert DilationSchedule.parse("00:00=1,09:00=20").rates == (1.0, 20.0)  # 上限含边界
+    schedule = DilationSchedule.parse("00:00=2")
+    with pytest.raises(ValueError):
+        schedule.standard_ns(schedule.total_ns)
+
+
+def test_world_with_schedule():
+    # AcceleratedWorld 日程模式：读数/倍率百分比/一天小时数/反向换算/边界休眠跨时段均精确
+    schedule = DilationSchedule.parse("00:00=1,09:00=4,12:00=1")
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 10, 0, 0))
+    world = AcceleratedWorld(clock=clock, schedule=schedule)
+    info = world.get_custom_time()
+    assert info.custom_time == "13:00:00" and info.dilation_percentage == 400.0
+    assert world.custom_hours_per_day == 33 and world.time_dilation_rate == 33 / 24
+    assert abs(info.remaining_hours - 20.0) < 1e-12
+    day = datetime.date(2026, 8, 8)
+    assert world.custom_to_standard("13:00:00", day) == datetime.datetime(2026, 8, 8, 10)
+    assert world.custom_to_standard("21:00:01", day) == datetime.datetime(2026, 8, 8, 12, 0, 1)
+    # 08:59:59.5（1x）→ 下个自定义秒边界在 09:00:00，其后段倍率 4x 不影响本次等待
+    now = datetime.datetime(2026, 8, 8, 8, 59, 59, 500000)
+    assert abs(world._seconds_until_next_tick(now) - 0.501) < 1e-9
+    # 09:00:00.1（4x）→ 自定义 09:00:00.4，下个自定义秒在 0.15s 后
+    now = datetime.datetime(2026, 8, 8, 9, 0, 0, 100000)
+    assert abs(world._seconds_until_next_tick(now) - 0.151) < 1e-9
+
+
+def test_single_segment_matches_constant_rate():
+    # 单段日程与恒定倍率逐微秒结果一致
+    rng = random.Random(3)
+    moment = datetime.datetime(2026, 8, 8)
+    constant = AcceleratedWorld(2.3, clock=SimulatedClock(moment))
+    schedule = DilationSchedule.parse("00:00=2.3")
+    scheduled = AcceleratedWorld(clock=SimulatedClock(moment), schedule=schedule)
+    for _ in range(500):
+        t = moment + datetime.timedelta(microseconds=rng.randrange(86400 * 10**6))
+        constant.clock.set(t)
+        scheduled.clock.set(t)
+        assert constant.get_custom_frame()[1] == scheduled.get_custom_frame()[1]
+        assert constant.get_custom_time().custom_time == scheduled.get_custom_time().custom_time
+
+
+def test_batch_with_schedule():
+    # 批量换算日程模式：array('d') 路径与标量一致；NumPy 路径与 array 路径一致（未安装跳过）
+    schedule = DilationSchedule.parse("00:00=1,09:00=4,12:00=1.5")
+    world = AcceleratedWorld(schedule=schedule)
+    moments = [
+        datetime.datetime(2026, 8, 8, h, m, 7, 250000)
+        for h, m in ((3, 0), (9, 30), (11, 59), (18, 45))
+    ]
+    batch = world.get_custom_time_batch(array("d", (m.timestamp() for m in moments)))
+    for i, moment in enumerate(moments):
+        info = AcceleratedWorld(clock=SimulatedClock(moment), schedule=schedule).get_custom_time()
+        h, m, s = (int(x) for x in info.custom_time.split(":"))
+        assert (batch.hours[i], batch.minutes[i], batch.seconds[i]) == (h, m, s)
+    np = pytest.importorskip("numpy")
+    start = datetime.datetime(2026, 8, 8).timestamp()
+    stamps = np.arange(start, start + 86400, 0.37)
+    vec = world.get_custom_time_batch(stamps)
+    ref = world.get_custom_time_batch(array("d", stamps[::997]))
+    assert list(vec.hours[::997]) == list(ref.hours)
+    assert list(vec.seconds[::997]) == list(ref.seconds)
@@ -0,0 +1,135 @@
+# 连接池 HTTP 客户端测试（本地桩服务器，不访问外网）
+# 覆盖：keep-alive 复用、gzip 请求与解压、空闲超时、服务器关闭空闲连接后重发、多线程共享、异常口径
+
+import gzip
+import http.server
+import socket
+import threading
+import time
+import urllib.error
+
+import pytest
+
+from utils.http_pool import HTTPConnectionPool
+
+_BODY = b'{"current": {"temperature_2m": 20.0}}' * 20
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 支持 keep-alive
+    disable_nagle_algorithm = True  # 响应头与响应体分两次写出，避免 Nagle + 延迟确认的 40ms 停顿
+    connections = 0  # 服务器累计接受的 TCP 连接数
+    encodings: list[str] = []  # 各请求的 Accept-Encoding
+
+    def setup(self):
+        # 每个新连接计数一次
+        type(self).connections += 1
+        super().setup()
+
+    def do_GET(self):
+        # /close: 响应后关闭连接；/missing: 404；其余按 Accept-Encoding 返回 gzip 或原文
+        type(self).encodings.append(self.headers.get("Accept-Encoding", ""))
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        body = _BODY
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 静默访问日志
+        pass
+
+
+@pytest.fixture
+def server():
+    # 本地 HTTP/1.1 桩服务器（随机端口），用例结束关闭
+    _Handler.connections = 0
+    _Handler.encodings = []
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_keep_alive_and_gzip(server):
+    # 连续 10 次请求只建立 1 个连接；请求带 gzip 且响应自动解压
+    pool = HTTPConnectionPool(timeout=5)
+    for _ in range(10):
+        assert pool.get(f"{server}/json?x=1") == _BODY
+    assert _Handler.connections == 1
+    assert all(enc == "gzip" for enc in _Handler.encodings)
+    assert pool.idle_count(server) == 1
+    pool.close()
+    assert pool.idle_count() == 0
+
+
+def test_connection_close_and_idle_timeout(server):
+    # 服务器声明 Connection: close 时不入池；空闲超时的连接不复用
+    pool = HTTPConnectionPool(timeout=5, idle_timeout=0.05)
+    pool.get(f"{server}/close")
+    assert pool.idle_count(server) == 0
+    pool.get(f"{server}/json")
+    pool.get(f"{server}/json")
+    assert _Handler.connections == 2
+    time.sleep(0.1)
+    pool.get(f"{server}/json")
+    assert _Handler.connections == 3
+    pool.close()
+
+
+def test_retries_when_server_dropped_idle_connection(server):
+    # 空闲连接被服务器端关闭：复用失败后自动换新连接重发，调用方无感知
+    pool = HTTPConnectionPool(timeout=5)
+    pool.get(f"{server}/json")
+    _, conn = pool._idle[next(iter(pool._idle))][0]
+    conn.sock.shutdown(2)  # 使池中空闲连接失效（模拟空闲期间连接被断开）
+    assert pool.get(f"{server}/json") == _BODY
+    assert _Handler.connections == 2
+    pool.close()
+
+
+def test_shared_across_threads(server):
+    # 8 个线程各请求 20 次：结果正确，连接数不超过线程数
+    pool = HTTPConnectionPool(timeout=5, max_idle_per_host=8)
+    results = []
+
+    def worker():
+        # 逐次请求并记录是否正确
+        results.extend(pool.get(f"{server}/json") == _BODY for _ in range(20))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert len(results) == 160 and all(results)
+    assert _Handler.connections <= 8
+    pool.close()
+
+
+def test_error_semantics(server):
+    # 404 抛 HTTPError；连接被拒包装为 URLError；非 http URL 抛 ValueError
+    pool = HTTPConnectionPool(timeout=5)
+    with pytest.raises(urllib.error.HTTPError) as info:
+        pool.get(f"{server}/missing")
+    assert info.value.code == 404
+    with socket.socket() as probe:  # 取一个刚释放、无人监听的端口
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    with pytest.raises(urllib.error.URLError):
+        pool.get(f"http://127.0.0.1:{port}/")
+    with pytest.raises(ValueError):
+        pool.get("ftp://example.com/")
+    pool.close()
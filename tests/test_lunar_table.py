@@ -0,0 +1,94 @@
+# 农历预计算表测试
+# 覆盖：构建/查表与慢路径一致、范围外回退、默认表注入、格式校验、表已打开时重建（原子替换）
+
+import datetime
+
+import pytest
+
+from modules.chinese_calendar import (
+    _compute_day_fields,
+    build_lunar_table,
+    get_chinese_lunar_calendar,
+)
+from modules.lunar_table import (
+    LunarTable,
+    TABLE_COLUMNS,
+    reset_lunar_table,
+    write_lunar_table,
+)
+
+
+@pytest.fixture
+def small_table(tmp_path):
+    # 构建 2025-2026 两年小表并注入为默认表，用例结束后恢复懒加载
+    path = tmp_path / "lunar_table.bin"
+    build_lunar_table(path, 2025, 2026)
+    table = LunarTable(path)
+    reset_lunar_table(table, loaded=True)
+    yield table
+    reset_lunar_table()
+
+
+def test_table_matches_slow_path(small_table):
+    # 两年逐日查表结果与 lunar-python 慢路径完全一致
+    day = small_table.first_day
+    assert (small_table.last_day - day).days + 1 == small_table.count == 730
+    while day <= small_table.last_day:
+        assert small_table.lookup(day) == _compute_day_fields(day.year, day.month, day.day)
+        day += datetime.timedelta(days=1)
+
+
+def test_calendar_uses_table(small_table):
+    # 表内日期：LunarInfo 与已知值一致，时辰/财神方位仍按小时/月份实时计算
+    info = get_chinese_lunar_calendar(2026, 8, 8, 12)
+    assert (info.lunar_year, info.shengxiao, info.lunar_month, info.lunar_day) == (
+        "丙午年",
+        "马",
+        "六月",
+        "廿六",
+    )
+    assert info.shichen == "午时"
+    assert get_chinese_lunar_calendar(2026, 8, 8, 23).shichen == "子时"
+    assert get_chinese_lunar_calendar(2025, 10, 1, 9).public_holiday == "国庆节"
+
+
+def test_out_of_range_falls_back(small_table):
+    # 表范围外返回 None，get_chinese_lunar_calendar 回退慢路径
+    assert small_table.lookup(datetime.date(2024, 12, 31)) is None
+    assert small_table.lookup(datetime.date(2027, 1, 1)) is None
+    info = get_chinese_lunar_calendar(2024, 2, 10, 12)
+    assert info.lunar_month == "正月" and info.lunar_day == "初一"
+
+
+def test_invalid_table_rejected(tmp_path):
+    # 魔数不符/截断文件抛 ValueError；列取值种类超宽拒绝写入
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"XXXX" + b"\0" * 32)
+    with pytest.raises(ValueError):
+        LunarTable(bad)
+
+    path = tmp_path / "t.bin"
+    write_lunar_table(path, datetime.date(2026, 1, 1), [("a",) * len(TABLE_COLUMNS)] * 3)
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError):
+        LunarTable(path)
+
+    rows = ((str(i),) + ("",) * (len(TABLE_COLUMNS) - 1) for i in range(300))
+    with pytest.raises(ValueError):
+        write_lunar_table(tmp_path / "wide.bin", datetime.date(2026, 1, 1), rows)
+
+
+def test_rebuild_while_open(tmp_path):
+    # 已打开（mmap）的表在重建期间及之后仍读到完整旧内容（原地截断会令读方 SIGBUS）；
+    # 新打开读到新表，目录中不残留临时文件
+    path = tmp_path / "t.bin"
+    first_day = datetime.date(2026, 1, 1)
+    write_lunar_table(path, first_day, [("旧",) * len(TABLE_COLUMNS)] * 400)
+    old = LunarTable(path)
+    write_lunar_table(path, first_day, [("新",) * len(TABLE_COLUMNS)] * 2)
+    assert old.lookup(first_day + datetime.timedelta(days=399)) == ("旧",) * len(TABLE_COLUMNS)
+    new = LunarTable(path)
+    assert new.count == 2 and new.lookup(first_day) == ("新",) * len(TABLE_COLUMNS)
+    assert [p.name for p in tmp_path.iterdir()] == ["t.bin"]
+    old.close()
+    new.close()
@@ -0,0 +1,99 @@
+# 入口分发测试
+# 覆盖：CLI/--version/--help/--once 冷启动不导入 PyQt6/ui 模块与时间服务、冷启动耗时预算、--once 模板输出、
+#   --fps/--schedule 透传
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# CLI 路径冷启动预算（秒，进程内从 import main 到分发完成）：实测约 40ms，留足慢速 CI 余量
+_CLI_START_BUDGET_SECONDS = 0.3
+
+# 子进程脚本：日志初始化与 CLI 实时钟替换为空操作（不写 logs/、不进入死循环），
+# 记录耗时与已加载的 GUI/时间服务模块（时间服务连带 asyncio/ssl，仅 --serve 分支导入）
+_SCRIPT = """
+import json, sys, time
+t = time.perf_counter()
+import main
+main.setup_logging = lambda **kwargs: None
+main.main_cli = lambda **kwargs: print("cli", kwargs)
+sys.argv = ["main.py"] + json.loads(sys.argv[1])
+try:
+    main.main()
+except SystemExit:
+    pass
+elapsed = time.perf_counter() - t
+gui = sorted(
+    m for m in sys.modules
+    if m.split(".")[0] in ("PyQt6", "ui", "asyncio", "ssl") or m == "modules.time_service"
+)
+print(json.dumps([elapsed, gui, "lunar_python" in sys.modules]))
+"""
+
+
+def _run_main(args):
+    # 新进程运行入口分发，返回 (标准输出行, 耗时, 已加载 GUI/时间服务模块, 是否导入农历库)
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, json.dumps(args)],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    elapsed, gui, lunar = json.loads(lines[-1])
+    return lines[:-1], elapsed, gui, lunar
+
+
+@pytest.mark.parametrize(
+    "args", [["--cli"], ["--cli", "--rate", "3.0"], ["--version"], ["--help"], ["--once"]]
+)
+def test_headless_paths_skip_gui(args):
+    # CLI/版本/帮助路径：不导入任何 PyQt6/ui 模块与时间服务（asyncio/ssl），冷启动在预算内
+    output, elapsed, gui, _ = _run_main(args)
+    assert gui == []
+    assert output
+    assert elapsed < _CLI_START_BUDGET_SECONDS, f"冷启动 {elapsed:.3f}s 超出预算"
+
+
+def test_cli_dispatch_passes_rate():
+    # --cli --rate/--fps 透传给 main_cli；--fps 不带值时取静态配置默认帧率
+    output, _, _, _ = _run_main(["--cli", "--rate", "3.0"])
+    assert output[-1] == "cli {'rate': 3.0, 'fps': None, 'schedule': None}"
+    output, _, _, _ = _run_main(["--cli", "--fps"])
+    assert output[-1] == "cli {'rate': None, 'fps': 30.0, 'schedule': None}"
+    output, _, _, _ = _run_main(["--cli", "--fps", "60"])
+    assert output[-1] == "cli {'rate': None, 'fps': 60.0, 'schedule': None}"
+
+
+def test_once_format():
+    # --once 按模板输出一行；未引用农历字段时不导入农历库，引用时才导入
+    output, _, _, lunar = _run_main(
+        ["--once", "--rate", "3.0", "-F", "{custom_time}|{dilation_percentage:.0f}"]
+    )
+    assert re.fullmatch(r"\d{2}:\d{2}:\d{2}\|300", output[-1])
+    assert not lunar
+    output, _, _, lunar = _run_main(["--once", "-F", "{lunar_info}"])
+    assert "年" in output[-1] and lunar
+
+
+def test_once_schedule():
+    # --schedule 传入分段日程：--once 按日程倍率输出；非法日程打印错误退出
+    output, _, _, _ = _run_main(
+        ["--once", "--schedule", "00:00=3,12:00=3", "-F", "{dilation_percentage:.0f}"]
+    )
+    assert output[-1] == "300"
+    output, _, _, _ = _run_main(["--once", "--schedule", "09:00=4"])
+    assert output[0].startswith("错误：")
+    output, _, _, _ = _run_main(["--once", "--schedule", "00:00=1,09:00=25"])
+    assert output[0] == "错误：膨胀日程倍率必须在 1.0 到 20.0 之间: 25.0"
+
+
+def test_once_invalid_format():
+    # 非法模板打印错误并以非零码退出（SystemExit 被脚本捕获，输出错误行）
+    output, _, _, _ = _run_main(["--once", "-F", "{bogus}"])
+    assert output[-1].startswith("错误")
@@ -1,13 +1,26 @@
 # 时间膨胀模块测试（S9.7 测试引入）
-# 覆盖：倍率校验、时间计算、24h 边界、TimeInfo 字段、秒级缓存、剩余小时
+# 覆盖：倍率校验、时间计算、24h 边界、TimeInfo 字段与值相等、秒级缓存、剩余小时、批量换算、导入耗时、
+#   输出模板、整数纳秒运算路径（有理倍率/边界精确/毫秒分辨率）、高频毫秒模式（查表格式化/帧取时/实时钟）、
+#   多日加速日历（闭式与逐日累加一致/纪元前/批量路径）、批量与标量边界一致
 
 import datetime
-from unittest import mock
+import json
+import subprocess
+import sys
+from array import array
+from fractions import Fraction
+from pathlib import Path
+
+import pytest
 
 import modules.time_dilation as td
-from modules.time_dilation import AcceleratedWorld, TimeInfo
+from modules.time_dilation import AcceleratedWorld, OutputTemplate, TimeInfo
+from modules.clock_source import SimulatedClock
 from config.static.static_config import get_static_config
 
+# 模块冷导入耗时预算（秒）：农历库/NumPy 懒加载后约 40ms，留足慢速 CI 余量
+_IMPORT_BUDGET_SECONDS = 0.3
+
 
 def test_init_valid_rates():
     # 有效倍率正常构造，一天自定义小时数 = int(24*rate)
@@ -75,6 +88,21 @@ def test_timeinfo_properties():
     assert t.custom_second == 34
 
 
+def test_timeinfo_value_equality():
+    # 同一时刻两次独立读数值相等（不同对象），字段不同则不等
+    moment = datetime.datetime(2026, 8, 8, 12, 34, 56)
+    a = AcceleratedWorld(2.0, clock=SimulatedClock(moment)).get_custom_time()
+    b = AcceleratedWorld(2.0, clock=SimulatedClock(moment)).get_custom_time()
+    assert a is not b
+    assert a == b
+    c = AcceleratedWorld(3.0, clock=SimulatedClock(moment)).get_custom_time()
+    assert a != c
+    t = TimeInfo("2026-08-08 12:34:56", "24:12:34", "d", "l", 200.0, 48.0, 24.0)
+    assert t == TimeInfo("2026-08-08 12:34:56", "24:12:34", "d", "l", 200.0, 48.0, 24.0)
+    assert t != TimeInfo("2026-08-08 12:34:56", "24:12:34", "d", "x", 200.0, 48.0, 24.0)
+    assert t != "24:12:34"
+
+
 def test_second_cache(monkeypatch):
     # 秒级缓存：同秒多次调用仅全量计算一次，跨秒重算（S9.3 回归）
     aw = AcceleratedWorld(2.0)
@@ -91,18 +119,46 @@ def test_second_cache(monkeypatch):
     i2 = aw.get_custom_time()
     i3 = aw.get_custom_time()
     assert i1 is i2 is i3  # 同秒返回同一缓存对象
+    assert i1.lunar_info and i2.lunar_info and i3.lunar_info
     assert calls["n"] == 1
 
 
-def test_second_cache_cross_second(monkeypatch):
-    # 跨秒重算（打桩 datetime 模块引用，绕过 datetime 不可 setattr 限制）
-    aw = AcceleratedWorld(2.0)
-    fake_dt = mock.MagicMock()
-    base = datetime.datetime(2026, 8, 8, 12, 0, 0, 123456)
-    fake_dt.datetime.now.return_value = base
-    monkeypatch.setattr(td, "datetime", fake_dt)
+def test_lazy_lunar_fields(monkeypatch):
+    # 惰性字段：只读 custom_time 不触发农历/中文日期计算；同一标准秒内多个 TimeInfo 共享一次计算
+    calls = {"lunar": 0, "date": 0}
+    orig_lunar, orig_date = td.get_lunar_info, td.get_chinese_date
+
+    def counting_lunar(now):
+        # 统计农历计算次数
+        calls["lunar"] += 1
+        return orig_lunar(now)
+
+    def counting_date(now):
+        # 统计中文日期计算次数
+        calls["date"] += 1
+        return orig_date(now)
+
+    monkeypatch.setattr(td, "get_lunar_info", counting_lunar)
+    monkeypatch.setattr(td, "get_chinese_date", counting_date)
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 12, 0, 0))
+    aw = AcceleratedWorld(4.0, clock=clock)
+    i1 = aw.get_custom_time()
+    assert i1.custom_time == "48:00:00" and calls == {"lunar": 0, "date": 0}
+    clock.advance(0.5)  # 同一标准秒内自定义秒已变化
+    i2 = aw.get_custom_time()
+    assert i2 is not i1
+    assert i1.lunar_info == i2.lunar_info and "丙午年" in i2.lunar_info
+    assert i2.chinese_date == "2026年08月08日 星期六"
+    assert calls == {"lunar": 1, "date": 1}
+    assert not hasattr(i1, "__dict__")  # __slots__ 表示
+
+
+def test_second_cache_cross_second():
+    # 跨秒重算（注入模拟时钟，替代打桩 datetime 模块）
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 12, 0, 0, 123456))
+    aw = AcceleratedWorld(2.0, clock=clock)
     i1 = aw.get_custom_time()
-    fake_dt.datetime.now.return_value = base.replace(second=1)
+    clock.advance(1)
     i2 = aw.get_custom_time()
     assert i1 is not i2  # 跨秒重算（新对象）
     assert i2.standard_datetime.endswith(":01")
@@ -121,10 +177,344 @@ def test_main_cli_default(monkeypatch):
     # main_cli 不传参时使用静态配置默认倍率（打桩 run_live_clock 避免阻塞）
     started = {}
 
-    def fake_run(self):
-        # 记录实例倍率后立即返回
+    def fake_run(self, fps=None):
+        # 记录实例倍率与帧率后立即返回
         started["rate"] = self.time_dilation_rate
+        started["fps"] = fps
 
     monkeypatch.setattr(AcceleratedWorld, "run_live_clock", fake_run)
     td.main_cli()
-    assert started.get("rate") == 2.0  # 与 static default_rate 一致
+    assert started == {"rate": 2.0, "fps": None}  # 与 static default_rate 一致，默认逐秒模式
+
+
+def test_custom_time_batch_matches_scalar():
+    # 批量换算与 get_custom_time 同源：array('d') 输入逐元素结果与单点计算一致
+    aw = AcceleratedWorld(2.5)
+    moments = [
+        datetime.datetime(2026, 8, 8, h, m, s, us)
+        for h, m, s, us in ((0, 0, 0, 0), (9, 30, 15, 500000), (12, 0, 0, 0), (23, 59, 59, 999000))
+    ]
+    batch = aw.get_custom_time_batch(array("d", (m.timestamp() for m in moments)))
+    assert len(batch) == 4
+    assert isinstance(batch.hours, array) and isinstance(batch.remaining_hours, array)
+
+    for i, moment in enumerate(moments):
+        info = AcceleratedWorld(2.5, clock=SimulatedClock(moment)).get_custom_time()
+        h, m, s = (int(x) for x in info.custom_time.split(":"))
+        assert (batch.hours[i], batch.minutes[i], batch.seconds[i]) == (h, m, s)
+        assert abs(batch.remaining_hours[i] - info.remaining_hours) < 1e-9
+
+
+def test_custom_time_batch_numpy():
+    # NumPy 向量化路径与 array('d') 路径结果一致（NumPy 为可选依赖，未安装跳过）
+    np = pytest.importorskip("numpy")
+    aw = AcceleratedWorld(20.0)
+    start = datetime.datetime(2026, 8, 8).timestamp()
+    stamps = np.arange(start, start + 86400, 0.37)
+    vec = aw.get_custom_time_batch(stamps)
+    ref = aw.get_custom_time_batch(array("d", stamps[::997]))
+    assert vec.hours.dtype == np.int64
+    assert list(vec.hours[::997]) == list(ref.hours)
+    assert list(vec.minutes[::997]) == list(ref.minutes)
+    assert list(vec.seconds[::997]) == list(ref.seconds)
+    assert np.allclose(vec.remaining_hours[::997], np.asarray(ref.remaining_hours))
+    assert vec.hours.max() < aw.custom_hours_per_day
+
+
+def test_batch_boundary_matches_scalar():
+    # 批量路径与标量同一整数纳秒运算：自定义秒边界 ±1 微秒处（浮点倍率易错位）两条路径逐项与标量一致
+    rate = Fraction("2.3")
+    midnight = datetime.datetime(2026, 8, 8)
+    boundaries = (-(-c * 10**6 * rate.denominator // rate.numerator) for c in range(0, 198720, 97))
+    moments = [
+        midnight + datetime.timedelta(microseconds=us + d) for us in boundaries for d in (-1, 0, 1)
+    ]
+    world = AcceleratedWorld(2.3)
+    expected = []
+    for moment in moments:
+        # 每个时刻新建实例：TimeInfo 按自定义秒缓存，同一秒内剩余小时取首次计算值
+        info = AcceleratedWorld(2.3, clock=SimulatedClock(moment)).get_custom_time()
+        expected.append((tuple(int(x) for x in info.custom_time.split(":")), info.remaining_hours))
+    dates = [world.get_accelerated_date(m) for m in moments]
+    stamps = [m.timestamp() for m in moments]
+
+    batch = world.get_custom_time_batch(array("d", stamps))
+    got = list(zip(zip(batch.hours, batch.minutes, batch.seconds), batch.remaining_hours))
+    assert got == expected
+    calendar = world.get_accelerated_date_batch(array("d", stamps))
+    assert list(calendar.elapsed_seconds) == [d.elapsed_seconds for d in dates]
+    np = pytest.importorskip("numpy")
+    vec = world.get_custom_time_batch(np.array(stamps))
+    hms = zip(vec.hours.tolist(), vec.minutes.tolist(), vec.seconds.tolist())
+    got = list(zip(hms, vec.remaining_hours.tolist()))
+    assert got == expected
+    calendar = world.get_accelerated_date_batch(np.array(stamps))
+    assert calendar.elapsed_seconds.tolist() == [d.elapsed_seconds for d in dates]
+    assert calendar.days.tolist() == [d.days for d in dates]
+
+
+def test_custom_to_standard_roundtrip():
+    # 反向换算回代：得到的标准时刻经 get_custom_time 正向换算恰为目标读数，前 1 微秒仍为上一秒
+    day = datetime.date(2026, 8, 8)
+    for rate, target in ((2.0, "37:15:00"), (1.5, "00:00:01"), (20.0, "479:59:59"), (3.7, "12:34:56")):
+        std = AcceleratedWorld(rate).custom_to_standard(target, day)
+        assert std.date() == day
+        clock = SimulatedClock(std)
+        assert AcceleratedWorld(rate, clock=clock).get_custom_time().custom_time == target
+        clock.set(std - datetime.timedelta(microseconds=1))
+        assert AcceleratedWorld(rate, clock=clock).get_custom_time().custom_time != target
+
+
+def test_integer_path_exact_at_boundaries():
+    # 有理倍率整数运算：2.3 倍（浮点路径在边界处会取整错误）下每个抽样自定义秒的首个微秒恰好跨入该秒
+    aw = AcceleratedWorld(2.3)
+    assert aw.rate_fraction == Fraction(23, 10)
+    day = datetime.date(2026, 8, 8)
+    midnight = datetime.datetime.combine(day, datetime.time.min)
+    clock = SimulatedClock(midnight)
+    world = AcceleratedWorld(2.3, clock=clock)
+    wrap = world.custom_hours_per_day * 3600
+    one_us = datetime.timedelta(microseconds=1)
+    for custom_second in range(1, int(86400 * 2.3), 613):
+        std = aw.custom_to_standard(float(custom_second), day)
+        # 正向：首个微秒恰为该秒；前 1 微秒仍为上一秒（custom_time 按总秒数还原，小时按一天小时数取模）
+        for moment, expected in ((std, custom_second), (std - one_us, custom_second - 1)):
+            clock.set(moment)
+            h, m, s = (int(x) for x in world.get_custom_time().custom_time.split(":"))
+            assert h * 3600 + m * 60 + s == expected % wrap
+
+
+def test_millisecond_resolution():
+    # 毫秒分辨率：同一自定义秒内按毫秒刷新；默认秒分辨率毫秒字段为 0 且同秒复用缓存
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 12, 0, 0, 123456))
+    aw = AcceleratedWorld(3.0, clock=clock)
+    info = aw.get_custom_time(milliseconds=True)
+    assert info.custom_time_ms == "36:00:00.370"  # 0.123456s × 3 = 0.370368s
+    clock.advance(0.0001)  # 自定义 +0.3ms，仍在同一自定义毫秒
+    assert aw.get_custom_time(milliseconds=True) is info
+    clock.advance(0.0002)
+    assert aw.get_custom_time(milliseconds=True).custom_millisecond == 371
+    coarse = aw.get_custom_time()
+    assert coarse.custom_millisecond == 0 and coarse.custom_time == "36:00:00"
+    assert aw.get_custom_time() is coarse
+    assert abs(coarse.remaining_hours - (72.0 - 36.0 - 0.371268 / 3600)) < 1e-9
+    template = OutputTemplate("{custom_time_ms}")
+    assert template.needs_milliseconds and not OutputTemplate("{custom_time}").needs_milliseconds
+    assert template.render(aw.get_custom_time(milliseconds=True)) == "36:00:00.371"
+
+
+def test_custom_to_standard_values():
+    # 固定值与批量：2x 下 37:15:00 → 18:37:30；批量与标量一致；越界拒绝
+    aw = AcceleratedWorld(2.0)
+    day = datetime.date(2026, 8, 8)
+    assert aw.custom_to_standard("37:15:00", day) == datetime.datetime(2026, 8, 8, 18, 37, 30)
+    batch = aw.custom_to_standard_batch(["00:00:00", "37:15", 3600.0], day)
+    assert batch == [
+        datetime.datetime(2026, 8, 8),
+        datetime.datetime(2026, 8, 8, 18, 37, 30),
+        datetime.datetime(2026, 8, 8, 0, 30),
+    ]
+    for bad in ("48:00:00", "12:60:00", "abc", -1.0):
+        with pytest.raises(ValueError):
+            aw.custom_to_standard(bad, day)
+
+
+def test_simulated_day_runs_fast():
+    # 模拟时钟驱动：一天 1440 次分钟级 tick 毫秒级跑完，自定义小时单调推进到 47
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8))
+    aw = AcceleratedWorld(2.0, clock=clock)
+    hours = []
+    for _ in range(24 * 60):
+        hours.append(aw.get_custom_time().custom_hour)
+        clock.advance(60)
+    assert hours[0] == 0 and hours[-1] == 47
+    assert hours == sorted(hours)
+
+
+def test_seconds_until_next_tick():
+    # 边界对齐：取标准秒与自定义秒边界中较早者（+1ms 余量）
+    aw = AcceleratedWorld(4.0)
+    margin = td._TICK_MARGIN_SECONDS
+    # 12:00:00.100 → 自定义 48:00:00.4，下个自定义秒在 0.15s 后，早于标准秒 0.9s
+    now = datetime.datetime(2026, 8, 8, 12, 0, 0, 100000)
+    assert abs(aw._seconds_until_next_tick(now) - (0.15 + margin)) < 1e-9
+    # 1x：两种边界重合
+    now = datetime.datetime(2026, 8, 8, 12, 0, 0, 750000)
+    assert abs(AcceleratedWorld(1.0)._seconds_until_next_tick(now) - (0.25 + margin)) < 1e-9
+
+
+def test_live_clock_sleeps_to_boundaries(monkeypatch, capsys):
+    # 实时钟不再 10ms 轮询：每轮休眠时长即到下一边界的距离，且每次唤醒都有新的读数
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 12, 0, 0, 100000))
+    aw = AcceleratedWorld(2.0, clock=clock)
+    sleeps = []
+
+    def fake_sleep(seconds):
+        # 记录休眠时长并推进模拟时间，运行若干轮后模拟 Ctrl+C 退出
+        sleeps.append(seconds)
+        if len(sleeps) >= 5:
+            raise KeyboardInterrupt
+        clock.advance(seconds)
+
+    monkeypatch.setattr(clock, "sleep", fake_sleep)
+    aw.run_live_clock()
+    assert len(sleeps) == 5
+    assert all(0.01 < s <= 0.5 + td._TICK_MARGIN_SECONDS for s in sleeps)
+    out = capsys.readouterr().out
+    assert out.count("\r标准时间") == 5  # 每次唤醒均跨过边界并刷新
+    assert "时钟已停止运行" in out
+
+
+def test_millisecond_formatter_matches_fstring():
+    # 查表格式化与 f-string 逐位一致（含小时按一天小时数回绕）；前缀更换后行首重建
+    formatter = td.MillisecondFormatter(48, "T ")
+    wrap_ms = 48 * 3600000
+    for custom_ms in [*range(0, 5000, 7), *range(wrap_ms - 3000, wrap_ms + 3000, 11)]:
+        second, ms = divmod(custom_ms, 1000)
+        h, m, s = (second // 3600) % 48, second % 3600 // 60, second % 60
+        assert formatter.format(custom_ms) == f"T {h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+    formatter.set_prefix("U ")
+    assert formatter.format(1) == "U 00:00:00.001"
+
+
+def test_custom_frame_consistent():
+    # 帧取时：TimeInfo 与毫秒数来自同一时刻；同一自定义秒内返回同一 TimeInfo 对象
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 12, 0, 0, 100000))
+    aw = AcceleratedWorld(20.0, clock=clock)
+    info, custom_ms = aw.get_custom_frame()
+    assert info.custom_time == "240:00:02" and custom_ms == 240 * 3600000 + 2000
+    clock.advance(0.02)  # 自定义 +400ms，仍在同一自定义秒
+    info2, custom_ms2 = aw.get_custom_frame()
+    assert info2 is info and custom_ms2 == custom_ms + 400
+    clock.advance(0.03)  # 跨入下一自定义秒
+    info3, custom_ms3 = aw.get_custom_frame()
+    assert info3.custom_time == "240:00:03" and custom_ms3 % 1000 == 0
+
+
+def test_live_clock_high_frequency(monkeypatch, capsys):
+    # 高频毫秒模式：按帧率休眠，每帧输出毫秒读数；自定义秒变化时才整行重写（含行尾参数）
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 12, 0, 0))
+    aw = AcceleratedWorld(20.0, clock=clock)
+    sleeps = []
+
+    def fake_sleep(seconds):
+        # 记录帧间隔并推进模拟时间，50 帧后模拟 Ctrl+C
+        sleeps.append(seconds)
+        if len(sleeps) >= 50:
+            raise KeyboardInterrupt
+        clock.advance(seconds)
+
+    monkeypatch.setattr(clock, "sleep", fake_sleep)
+    aw.run_live_clock(fps=100)
+    assert all(abs(s - 0.01) < 1e-12 for s in sleeps)
+    out = capsys.readouterr().out
+    frames = out.split("\r")[1:]
+    assert len(frames) == 50  # 每帧自定义毫秒都在变化（20x 下每帧 200ms）
+    assert frames[1] == "标准时间：2026-08-08 12:00:00 | 自定义时间：240:00:00.200"
+    assert sum("膨胀倍率" in f for f in frames) == 10  # 每 5 帧跨一个自定义秒
+    assert "100fps 毫秒实时时钟" in out
+
+
+def test_accelerated_date_closed_form():
+    # 加速日历：倍率 1 时与真实时刻一致；非整数倍率下闭式结果与逐日累加一致；纪元之前为负
+    epoch = datetime.datetime(2026, 1, 1)
+    same = AcceleratedWorld(1.0, calendar_epoch=epoch).get_accelerated_date(
+        datetime.datetime(2027, 3, 5, 10)
+    )
+    assert same.moment == datetime.datetime(2027, 3, 5, 10)
+    assert (same.days, same.weeks, same.years) == (428, 61, 1)
+
+    world = AcceleratedWorld(2.3, calendar_epoch=datetime.datetime(2026, 1, 1, 6))
+    moment = datetime.datetime(2026, 3, 1, 18)
+    walked = 18 * 3600 * 2.3 * 10**9  # 当天 0 点到 18 点
+    walked += (moment.date() - datetime.date(2026, 1, 1)).days * 86400 * 23 // 10 * 10**9
+    walked -= 6 * 3600 * 23 // 10 * 10**9  # 纪元当天 0 点到 6 点
+    got = world.get_accelerated_date(moment)
+    assert got.elapsed_seconds == walked // 10**9
+    assert got.days == got.elapsed_seconds // 86400 and got.weeks == got.days // 7
+    assert got.moment == world.calendar_epoch + datetime.timedelta(seconds=got.elapsed_seconds)
+
+    before = world.get_accelerated_date(datetime.datetime(2025, 12, 31, 23))
+    assert before.elapsed_seconds < 0 and before.days == -1 and before.years == -1
+
+
+def test_accelerated_date_default_epoch_and_clock():
+    # 纪元默认取 base.json calendar_epoch；不传时刻时取注入时钟当前时刻
+    epoch = datetime.datetime.fromisoformat(get_static_config().base["calendar_epoch"])
+    clock = SimulatedClock(epoch + datetime.timedelta(days=10))
+    world = AcceleratedWorld(3.0, clock=clock)
+    assert world.calendar_epoch == epoch
+    got = world.get_accelerated_date()
+    assert (got.days, got.weeks) == (30, 4)
+    with pytest.raises(ValueError):
+        world.get_accelerated_date(datetime.datetime(9000, 1, 1))
+
+
+def test_accelerated_date_batch_matches_scalar():
+    # 批量加速日历：array('d') 与 NumPy 路径的天/周/年与标量逐项一致（纪元为 2/29 时周年日口径一致）
+    world = AcceleratedWorld(2.3, calendar_epoch=datetime.datetime(2024, 2, 29, 12))
+    moments = [
+        datetime.datetime(2024, 1, 1, 3) + datetime.timedelta(hours=37.3 * i) for i in range(0, 3000, 7)
+    ]
+    stamps = [m.timestamp() for m in moments]
+    expected = [world.get_accelerated_date(m) for m in moments]
+    batch = world.get_accelerated_date_batch(array("d", stamps))
+    assert len(batch) == len(moments)
+    assert list(batch.days) == [e.days for e in expected]
+    assert list(batch.weeks) == [e.weeks for e in expected]
+    assert list(batch.years) == [e.years for e in expected]
+    np = pytest.importorskip("numpy")
+    vec = world.get_accelerated_date_batch(np.array(stamps))
+    assert list(vec.days) == [e.days for e in expected]
+    assert list(vec.years) == [e.years for e in expected]
+
+
+def test_import_is_lightweight():
+    # 新进程冷导入 time_dilation：不加载 lunar_python/chinese_calendar/numpy，耗时在预算内；
+    # 首次需要农历库的查询（节日索引）后才被导入
+    script = (
+        "import json, sys, time\n"
+        "t = time.perf_counter()\n"
+        "import modules.time_dilation as td\n"
+        "elapsed = time.perf_counter() - t\n"
+        "heavy = ['lunar_python', 'chinese_calendar', 'numpy']\n"
+        "before = [m for m in heavy if m in sys.modules]\n"
+        "td.AcceleratedWorld(2.0).get_custom_time()\n"
+        "import datetime, modules.chinese_calendar as cc\n"
+        "cc.get_public_holiday(datetime.date(2026, 10, 1))\n"
+        "after = [m for m in heavy if m in sys.modules]\n"
+        "print(json.dumps([elapsed, before, after]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed, before, after = json.loads(result.stdout.strip().splitlines()[-1])
+    assert before == []
+    assert "lunar_python" in after
+    assert elapsed < _IMPORT_BUDGET_SECONDS, f"冷导入 {elapsed:.3f}s 超出预算"
+
+
+def test_output_template_render():
+    # 模板编译一次多次渲染：格式说明/转换符生效，未引用农历时不触发农历计算
+    clock = SimulatedClock(datetime.datetime(2026, 8, 8, 6, 0, 0))
+    world = AcceleratedWorld(2.0, clock=clock)
+    template = OutputTemplate("[{custom_time}] {remaining_hours:.1f}h {custom_hour!r}")
+    assert not template.needs_lunar
+    assert template.fields == {"custom_time", "remaining_hours", "custom_hour"}
+    info = world.get_custom_time()
+    assert template.render(info) == "[12:00:00] 36.0h 12"
+    assert info._date_fields._lunar_info is None  # 惰性农历未被读取
+    clock.advance(1)
+    assert template.render(world.get_custom_time()) == "[12:00:02] 36.0h 12"
+    assert OutputTemplate("{lunar_info}").needs_lunar
+
+
+def test_output_template_invalid():
+    # 未知字段/嵌套格式/括号不匹配均抛 ValueError
+    for bad in ("{bogus}", "{custom_time:{width}}", "{custom_time", "{custom_time!x}"):
+        with pytest.raises(ValueError):
+            OutputTemplate(bad)
@@ -0,0 +1,164 @@
+# 本地时间服务测试
+# 覆盖：数千本地客户端负载（计算/编码与客户端数无关）、LINE/JSON 协议、握手超时默认、断开退订、同步客户端、
+#   重复启动拒绝抢占运行中服务的套接字
+
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from modules.time_dilation import AcceleratedWorld
+from modules.time_service import TimeService, subscribe_time_service
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="需要 Unix 域套接字")
+resource = pytest.importorskip("resource")  # 仅类 Unix 平台
+
+# 负载测试客户端数（受进程文件描述符上限约束：每个连接客户端/服务端各占一个 fd）
+_LOAD_CLIENTS = min(2000, (resource.getrlimit(resource.RLIMIT_NOFILE)[0] - 200) // 2)
+
+
+def _counting_service(path):
+    # 构造服务并统计 TimeInfo 计算次数与各协议编码次数
+    world = AcceleratedWorld(2.0)
+    service = TimeService(world, path)
+    counts = {"compute": 0, "LINE": 0, "JSON": 0}
+    compute, payload = world.get_custom_time, service._payload
+
+    def counting_compute(**kwargs):
+        # 统计 get_custom_time 调用
+        counts["compute"] += 1
+        return compute(**kwargs)
+
+    def counting_payload(mode):
+        # 统计实际编码（缓存未命中）次数
+        if mode not in service._payloads:
+            counts[mode] += 1
+        return payload(mode)
+
+    world.get_custom_time = counting_compute
+    service._payload = counting_payload
+    return service, counts
+
+
+def test_load_many_clients(tmp_path):
+    # 数千客户端订阅：全部连接后的下一帧每个客户端都收到同一份字节；每帧计算一次、每协议编码一次
+    async def read_until(reader, expected):
+        # 跳过连接期间的旧帧，直到读到目标帧
+        while (line := await reader.readline()) != expected:
+            assert line, "连接提前关闭"
+        return line
+
+    async def scenario():
+        service, counts = _counting_service(tmp_path / "t.sock")
+        await service.start()
+        clients = []
+        for i in range(_LOAD_CLIENTS):
+            reader, writer = await asyncio.open_unix_connection(str(service.socket_path))
+            mode = "JSON" if i % 2 else "LINE"
+            writer.write(f"{mode}\n".encode())
+            clients.append((mode, reader, writer))
+        await asyncio.gather(*(r.readline() for _, r, _ in clients))
+        assert service.client_count == _LOAD_CLIENTS
+        ticks = service.ticks
+        while service.ticks == ticks:
+            await asyncio.sleep(0.01)
+        expected = {mode: service._payloads[mode] for mode in ("LINE", "JSON")}
+        await asyncio.wait_for(
+            asyncio.gather(*(read_until(r, expected[m]) for m, r, _ in clients)), timeout=5
+        )
+        ticks = service.ticks
+        for _, _, writer in clients:
+            writer.close()
+        await service.close()
+        return expected, counts, ticks
+
+    expected, counts, ticks = asyncio.run(scenario())
+    record = json.loads(expected["JSON"])
+    assert record["custom_time"] == expected["LINE"].decode().split(" | ")[0]
+    assert counts["compute"] == ticks
+    assert counts["LINE"] <= ticks and counts["JSON"] <= ticks
+
+
+def test_handshake_and_disconnect(tmp_path):
+    # 未知协议返回 ERROR；不发握手按 LINE；客户端断开后下一帧退订
+    async def scenario():
+        service = TimeService(AcceleratedWorld(2.0), tmp_path / "t.sock")
+        await service.start()
+        reader, writer = await asyncio.open_unix_connection(str(service.socket_path))
+        writer.write(b"XML\n")
+        error = await reader.readline()
+        writer.close()
+        reader, writer = await asyncio.open_unix_connection(str(service.socket_path))
+        silent = await asyncio.wait_for(reader.readline(), timeout=3)
+        assert service.client_count == 1
+        writer.close()
+        await asyncio.sleep(1.2)
+        remaining = service.client_count
+        await service.close()
+        return error, silent, remaining, service.socket_path.exists()
+
+    error, silent, remaining, exists = asyncio.run(scenario())
+    assert error.startswith(b"ERROR")
+    assert silent.count(b":") == 4  # "HH:MM:SS | HH:MM:SS"
+    assert remaining == 0
+    assert not exists  # 关闭后删除套接字文件
+
+
+def test_second_service_refuses_running_socket(tmp_path):
+    # 同一路径已有服务在运行：第二个服务启动抛 OSError 且不删除其套接字，原服务照常推送；
+    # 服务关闭后留下的残留文件（连接被拒）可被新服务清理并接管
+    async def scenario():
+        path = tmp_path / "t.sock"
+        first = TimeService(AcceleratedWorld(2.0), path)
+        await first.start()
+        second = TimeService(AcceleratedWorld(3.0), path)
+        with pytest.raises(OSError, match="已在运行"):
+            await second.start()
+        await second.close()
+        assert path.exists()
+        reader, writer = await asyncio.open_unix_connection(str(path))
+        writer.write(b"JSON\n")
+        line = json.loads(await asyncio.wait_for(reader.readline(), timeout=3))
+        writer.close()
+        await first.close()
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))  # 未监听的套接字文件：模拟崩溃进程留下的残留
+        stale.close()
+        third = TimeService(AcceleratedWorld(2.0), path)
+        await third.start()
+        await third.close()
+        return line
+
+    assert asyncio.run(scenario())["dilation_percentage"] == 200.0
+
+
+def test_sync_subscriber(tmp_path):
+    # 同步客户端逐行读取 JSON 推送（服务运行于后台线程事件循环）
+    path = tmp_path / "t.sock"
+    service = TimeService(AcceleratedWorld(3.0), path)
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def run():
+        # 后台线程：启动服务后运行事件循环直到停止
+        loop.run_until_complete(service.start())
+        ready.set()
+        loop.run_forever()
+        loop.run_until_complete(service.close())
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    try:
+        assert ready.wait(5)
+        lines = subscribe_time_service(path, "JSON")
+        record = json.loads(next(lines))
+        lines.close()
+        assert record["dilation_percentage"] == 300.0
+        assert "年" in record["lunar_info"]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
@@ -0,0 +1,145 @@
+# 共享内存时间快照测试
+# 覆盖：发布/读取往返、定长截断、文件头校验、写入中超时、跨进程并发读无撕裂、时间服务发布
+
+import asyncio
+import datetime
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from modules.clock_source import SimulatedClock
+from modules.time_dilation import AcceleratedWorld, TimeInfo, read_time_snapshot
+from modules.time_service import TimeService
+from modules.time_snapshot import TimeSnapshotReader, TimeSnapshotWriter
+
+
+def _info(n: int) -> TimeInfo:
+    # 构造字段相互关联的 TimeInfo（读方据此校验快照是否撕裂）
+    return TimeInfo(
+        standard_datetime=f"2026-08-08 {n % 24:02d}:{n % 60:02d}:{n % 60:02d}",
+        custom_time=f"{n % 480:03d}:{n % 60:02d}:{n % 60:02d}",
+        chinese_date=f"日期{n}",
+        lunar_info=f"农历{n}",
+        dilation_percentage=float(n),
+        expanded_hours_per_day=float(n) * 0.24,
+        remaining_hours=float(n),
+    )
+
+
+def test_roundtrip(tmp_path):
+    # 发布后读取：字段与 TimeInfo 一致，版本号每次发布 +2，关闭后删除文件
+    path = tmp_path / "t.snap"
+    writer = TimeSnapshotWriter(path)
+    world = AcceleratedWorld(2.0, clock=SimulatedClock(datetime.datetime(2026, 8, 8, 12)))
+    info = world.get_custom_time()
+    writer.publish(info)
+    reader = TimeSnapshotReader(path)
+    assert reader.sequence == 2
+    got = read_time_snapshot(reader)
+    assert (got.standard_datetime, got.custom_time) == ("2026-08-08 12:00:00", "24:00:00")
+    assert got.lunar_info == info.lunar_info and got.chinese_date == info.chinese_date
+    assert got.remaining_hours == info.remaining_hours
+    assert reader.read().published_at > 0
+    writer.publish(_info(7))
+    assert reader.sequence == 4 and read_time_snapshot(path).custom_time == "007:07:07"
+    reader.close()
+    writer.close()
+    assert not path.exists()
+
+
+def test_truncation_and_header(tmp_path):
+    # 超长农历文本按字节截断且不产生残缺字符；文件头不符抛 ValueError
+    path = tmp_path / "t.snap"
+    writer = TimeSnapshotWriter(path)
+    info = _info(1)
+    info._date_fields._lunar_info = "农" * 200
+    writer.publish(info)
+    text = read_time_snapshot(path).lunar_info
+    assert text == "农" * (256 // 3)
+    writer.close()
+    bad = tmp_path / "bad.snap"
+    bad.write_bytes(b"\0" * 512)
+    with pytest.raises(ValueError):
+        TimeSnapshotReader(bad)
+
+
+def test_read_timeout_when_writer_stuck(tmp_path):
+    # 版本号停留在奇数（写方崩溃于写入中）时读方超时后抛 TimeoutError
+    path = tmp_path / "t.snap"
+    writer = TimeSnapshotWriter(path)
+    writer.publish(_info(1))
+    writer._seq += 1
+    writer.publish(_info(2))  # 手动错位：发布结束后版本号为奇数
+    reader = TimeSnapshotReader(path)
+    reader._timeout = 0.05
+    with pytest.raises(TimeoutError):
+        reader.read()
+    reader.close()
+    writer.close()
+
+
+def test_cross_process_reads_never_torn(tmp_path):
+    # 另一进程高频读取期间本进程持续发布：每次读到的快照字段都来自同一次发布
+    path = tmp_path / "t.snap"
+    writer = TimeSnapshotWriter(path)
+    writer.publish(_info(0))
+    stop = threading.Event()
+
+    def publish_loop():
+        # 后台线程尽可能快地发布字段关联的快照
+        n = 0
+        while not stop.is_set():
+            n += 1
+            writer.publish(_info(n))
+
+    script = (
+        "import sys\n"
+        "from modules.time_snapshot import TimeSnapshotReader\n"
+        "reader = TimeSnapshotReader(sys.argv[1])\n"
+        "seen = set()\n"
+        "for _ in range(50000):\n"
+        "    s = reader.read()\n"
+        "    n = int(s.dilation_percentage)\n"
+        "    assert s.chinese_date == f'日期{n}' and s.lunar_info == f'农历{n}', s\n"
+        "    assert s.custom_time == f'{n % 480:03d}:{n % 60:02d}:{n % 60:02d}', s\n"
+        "    seen.add(n)\n"
+        "print(len(seen))\n"
+    )
+    thread = threading.Thread(target=publish_loop)
+    thread.start()
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", script, str(path)],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True,
+            text=True,
+        )
+    finally:
+        stop.set()
+        thread.join()
+        writer.close()
+    assert result.returncode == 0, result.stderr
+    assert int(result.stdout) > 1  # 读取期间确实观察到多次发布
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="需要 Unix 域套接字")
+def test_time_service_publishes_snapshot(tmp_path):
+    # 时间服务开启快照：每帧发布，读方与服务当前帧一致；关闭服务后快照文件删除
+    path = tmp_path / "t.snap"
+
+    async def scenario():
+        service = TimeService(AcceleratedWorld(2.0), tmp_path / "t.sock", snapshot_path=path)
+        await service.start()
+        got = read_time_snapshot(path)
+        expected = service._info
+        await service.close()
+        return got, expected
+
+    got, expected = asyncio.run(scenario())
+    assert got.custom_time == expected.custom_time
+    assert got.standard_datetime == expected.standard_datetime
+    assert not path.exists()
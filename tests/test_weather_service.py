@@ -1,10 +1,14 @@
 # 天气服务模块测试（S9.7 测试引入）
-# 覆盖：缓存命中/过期、重试机制、窄捕获降级、编程错误上抛、格式化容错、未知城市
+# 覆盖：缓存命中/过期、重试机制、窄捕获降级、编程错误上抛、格式化容错、未知城市、多城市批量请求（拆分/缓存/失败降级）、
+#   同城并发查询 single-flight（只发一次请求/领头异常不阻塞跟随者）、
+#   stale-while-revalidate（立即返回旧数据/单个后台刷新/超过上限同步查询）
 
 import json
+import threading
 import time
 
 import modules.weather_service as weather_service
+from data.cities import CITIES
 from modules.weather_service import WeatherData
 
 
@@ -71,9 +75,9 @@ def test_cache_expiry(monkeypatch):
     _set_fetch(monkeypatch, fake)
     weather_service.get_weather_by_city("北京")
     assert calls["n"] == 1
-    # 模拟过期
+    # 模拟过期（超过过期数据最长可用时长，走同步查询）
     weather_service._weather_cache["北京"] = (
-        time.time() - 7200,
+        time.time() - weather_service.CACHE_MAX_STALE_SECONDS - 1,
         weather_service._weather_cache["北京"][1],
     )
     weather_service.get_weather_by_city("北京")
@@ -158,3 +162,183 @@ def test_unknown_city(monkeypatch):
     _set_fetch(monkeypatch, fake)
     assert weather_service.get_weather_by_city("不存在的城市") is None
     assert calls["n"] == 0
+
+
+def _batch_response(count):
+    # 模拟 Open-Meteo 多地点响应：按请求顺序排列的对象数组（温度为序号，便于核对拆分顺序）
+    return [
+        {
+            "current": {
+                "temperature_2m": float(i),
+                "relative_humidity_2m": 50,
+                "weather_code": 0,
+                "wind_speed_10m": 5.0,
+                "apparent_temperature": float(i),
+            }
+        }
+        for i in range(count)
+    ]
+
+
+def test_batch_all_cities_single_request(monkeypatch):
+    # 全部城市一次请求：URL 含逗号分隔经纬度，按顺序拆分并整体写入缓存，之后单城查询命中缓存
+    urls = []
+
+    def fake(url):
+        # 记录 URL 并返回与城市数等长的数组
+        urls.append(url)
+        return _batch_response(len(CITIES))
+
+    _set_fetch(monkeypatch, fake)
+    results = weather_service.get_weather_by_cities()
+    assert len(urls) == 1
+    lat, lon = CITIES["上海"]
+    assert f"{lat}," in urls[0] and f",{lon}" in urls[0]
+    assert list(results) == list(CITIES)
+    assert [w.temperature for w in results.values()] == [float(i) for i in range(len(CITIES))]
+    assert set(weather_service._weather_cache) == set(CITIES)
+    assert weather_service.get_weather_by_city("北京") is results["北京"]
+    assert len(urls) == 1
+
+
+def test_batch_fetches_only_stale_and_unknown(monkeypatch):
+    # 已缓存城市不再请求；未知城市为 None；单城市时响应为对象而非数组
+    urls = []
+
+    def fake(url):
+        # 记录 URL；单地点返回对象
+        urls.append(url)
+        return _batch_response(1)[0]
+
+    _set_fetch(monkeypatch, fake)
+    cached = weather_service.get_weather_by_city("北京")
+    results = weather_service.get_weather_by_cities(["北京", "上海", "不存在的城市"])
+    assert results["北京"] is cached and results["不存在的城市"] is None
+    assert results["上海"] is not None and len(urls) == 2
+    assert f"latitude={CITIES['上海'][0]}&" in urls[1]
+
+
+def test_batch_failure_not_cached(monkeypatch):
+    # 网络失败与条目数不符：全部为 None 且不写缓存
+    def always_fail(url):
+        # 恒定抛超时异常
+        raise TimeoutError("一直失败")
+
+    _set_fetch(monkeypatch, always_fail)
+    monkeypatch.setattr("utils.retry.time.sleep", lambda s: None)
+    assert weather_service.get_weather_by_coords_batch([(1.0, 2.0), (3.0, 4.0)]) == [None, None]
+
+    _set_fetch(monkeypatch, lambda url: _batch_response(1))
+    results = weather_service.get_weather_by_cities(["北京", "上海"])
+    assert results == {"北京": None, "上海": None}
+    assert weather_service._weather_cache == {}
+
+
+def test_single_flight_concurrent_callers(monkeypatch):
+    # 同城 8 个线程并发查询：只发一次请求，所有调用得到同一结果对象；在途记录结束后清空
+    started = threading.Event()
+    release = threading.Event()
+    calls = {"n": 0}
+    default = weather_service._fetch_weather_data
+
+    def slow(url):
+        # 阻塞到测试放行，保证其余线程在请求在途期间到达
+        calls["n"] += 1
+        started.set()
+        release.wait(5)
+        return default(url)
+
+    _set_fetch(monkeypatch, slow)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(weather_service.get_weather_by_city("北京")))
+        for _ in range(8)
+    ]
+    threads[0].start()
+    assert started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert calls["n"] == 1
+    assert len(results) == 8 and all(r is results[0] for r in results) and results[0] is not None
+    assert weather_service._inflight == {}
+
+
+def test_single_flight_leader_error_releases_followers(monkeypatch):
+    # 领头查询抛编程错误：异常上抛给领头者，跟随者得到 None 而不会永久阻塞
+    started = threading.Event()
+    release = threading.Event()
+
+    def broken(url):
+        # 放行后返回非 dict 数据触发 AttributeError
+        started.set()
+        release.wait(5)
+        return "not-a-dict"
+
+    _set_fetch(monkeypatch, broken)
+    errors = []
+
+    def leader():
+        # 记录领头线程的异常
+        try:
+            weather_service.get_weather_by_city("上海")
+        except AttributeError as e:
+            errors.append(e)
+
+    lead = threading.Thread(target=leader)
+    lead.start()
+    assert started.wait(5)
+    follower_result = []
+    follower = threading.Thread(
+        target=lambda: follower_result.append(weather_service.get_weather_by_city("上海"))
+    )
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    lead.join(5)
+    follower.join(5)
+    assert len(errors) == 1 and follower_result == [None]
+    assert weather_service._inflight == {}
+
+
+def test_stale_while_revalidate(monkeypatch):
+    # 过期未超上限：立即返回旧数据（stale=True）且只启动一个后台刷新；刷新完成后为新数据
+    release = threading.Event()
+    calls = {"n": 0}
+    default = weather_service._fetch_weather_data
+
+    def slow(url):
+        # 阻塞到测试放行，模拟慢网络
+        calls["n"] += 1
+        release.wait(5)
+        data = default(url)
+        data["current"]["temperature_2m"] = 30.0
+        return data
+
+    _set_fetch(monkeypatch, slow)
+    old = WeatherData(10.0, 50, 5.0, 11.0, 0, "晴", "晴朗无云", "☀️")
+    weather_service._weather_cache["北京"] = (time.time() - 3600, old)
+    first = weather_service.get_weather_by_city("北京")
+    second = weather_service.get_weather_by_city("北京")
+    assert first.stale and second.stale and first.temperature == 10.0
+    assert "待更新" in weather_service.format_weather_info(first)
+    release.set()
+    fresh = weather_service.wait_weather_refresh("北京", 5)
+    assert fresh is not None and fresh.temperature == 30.0 and not fresh.stale
+    assert calls["n"] == 1
+    assert weather_service.get_weather_by_city("北京") is fresh
+
+
+def test_stale_beyond_max_fetches_synchronously(monkeypatch):
+    # 超过过期数据最长可用时长：同步查询，不返回旧数据
+    old = WeatherData(10.0, 50, 5.0, 11.0, 0, "晴", "晴朗无云", "☀️")
+    weather_service._weather_cache["北京"] = (
+        time.time() - weather_service.CACHE_MAX_STALE_SECONDS - 1,
+        old,
+    )
+    result = weather_service.get_weather_by_city("北京")
+    assert not result.stale and result.temperature == 20.0
+    assert weather_service._inflight == {}
@@ -0,0 +1,87 @@
+# 天气持久化缓存测试
+# 覆盖：读写往返、upsert、按最近访问淘汰、跨实例（重启）命中、过期后重新请求、get_cached_weather、批量写入
+
+import time
+
+import pytest
+
+import modules.weather_service as weather_service
+from modules.weather_service import WeatherData
+from modules.weather_store import WeatherStore
+
+
+def _weather(temperature: float) -> WeatherData:
+    # 构造测试用天气数据
+    return WeatherData(temperature, 50, 5.0, temperature + 1, 0, "晴", "晴朗无云", "☀️")
+
+
+def test_roundtrip_and_upsert(tmp_path):
+    # 写入后读取得到字段字典；同城再次写入覆盖旧记录
+    store = WeatherStore(tmp_path / "w.sqlite3", max_cities=4)
+    assert store.load("北京") is None
+    store.save("北京", 100.0, _weather(20.0))
+    store.save("北京", 200.0, _weather(25.0))
+    fetched_at, data = store.load("北京")
+    assert fetched_at == 200.0 and data["temperature"] == 25.0 and data["icon"] == "☀️"
+    assert store.cities() == ["北京"]
+    store.close()
+    with pytest.raises(ValueError):
+        WeatherStore(tmp_path / "x.sqlite3", max_cities=0)
+
+
+def test_evicts_least_recently_seen(tmp_path):
+    # 超出容量时淘汰最久未访问的城市（读取会刷新访问时间）
+    store = WeatherStore(tmp_path / "w.sqlite3", max_cities=2)
+    store.save("北京", 1.0, _weather(1.0))
+    time.sleep(0.01)
+    store.save("上海", 1.0, _weather(2.0))
+    time.sleep(0.01)
+    store.load("北京")
+    time.sleep(0.01)
+    store.save("广州", 1.0, _weather(3.0))
+    assert store.cities() == ["广州", "北京"]
+    store.close()
+
+
+def test_service_survives_restart(tmp_path, monkeypatch):
+    # 首个"进程"查询后写盘；清空内存并换新连接（模拟重启）后不发请求即命中，过期后重新请求
+    calls = {"n": 0}
+    fake = weather_service._fetch_weather_data
+
+    def counting(url):
+        # 计数后返回 conftest 默认成功响应
+        calls["n"] += 1
+        return fake(url)
+
+    monkeypatch.setattr(weather_service, "_fetch_weather_data", counting)
+    path = tmp_path / "w.sqlite3"
+    weather_service.reset_weather_store(WeatherStore(path, 8), loaded=True)
+    first = weather_service.get_weather_by_city("北京")
+    assert calls["n"] == 1
+
+    weather_service._weather_cache.clear()
+    weather_service.reset_weather_store(WeatherStore(path, 8), loaded=True)
+    assert weather_service.get_cached_weather("北京") == first
+    assert weather_service.get_weather_by_city("北京") == first
+    assert calls["n"] == 1
+
+    weather_service._weather_cache.clear()
+    weather_service.get_weather_store().save("北京", time.time() - 7200, first)
+    stale = weather_service.get_cached_weather("北京")  # 过期数据仍可用于即时渲染
+    assert stale.stale and stale.temperature == first.temperature
+    weather_service.get_weather_by_city("北京")
+    assert weather_service.wait_weather_refresh("北京", 5) == first
+    assert calls["n"] == 2
+    assert weather_service.get_cached_weather("上海") is None
+
+
+def test_batch_persists_all(tmp_path, monkeypatch):
+    # 批量查询的成功结果一次写盘；clear_weather_cache 同时清空磁盘
+    store = WeatherStore(tmp_path / "w.sqlite3", 8)
+    weather_service.reset_weather_store(store, loaded=True)
+    single = weather_service._fetch_weather_data("")
+    monkeypatch.setattr(weather_service, "_fetch_weather_data", lambda url: [single, single])
+    weather_service.get_weather_by_cities(["北京", "上海"])
+    assert set(store.cities()) == {"北京", "上海"}
+    weather_service.clear_weather_cache()
+    assert store.cities() == []
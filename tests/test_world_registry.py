@@ -0,0 +1,70 @@
+# 多倍率世界注册表测试
+# 覆盖：逐倍率字段与单世界 get_custom_time 一致、单次读时钟、共享日期字段、日程世界、倍率校验
+
+import datetime
+
+import pytest
+
+from modules.clock_source import SimulatedClock
+from modules.dilation_schedule import DilationSchedule
+from modules.time_dilation import AcceleratedWorld
+from modules.world_registry import WorldRegistry
+
+
+class _CountingClock(SimulatedClock):
+    # 统计 now_ns() 调用次数的模拟时钟
+    def __init__(self, start: datetime.datetime):
+        super().__init__(start)
+        self.reads = 0
+
+    def now_ns(self) -> int:
+        # 计数后委托模拟时钟
+        self.reads += 1
+        return super().now_ns()
+
+
+def test_matches_single_worlds():
+    # 1.5x/2x/5x/20x 同一时刻：各倍率字段与独立 AcceleratedWorld 结果逐项一致
+    moment = datetime.datetime(2026, 8, 8, 10, 17, 33, 456789)
+    rates = (1.5, 2.0, 5.0, 20.0)
+    registry = WorldRegistry(rates, clock=SimulatedClock(moment))
+    frame = registry.evaluate()
+    assert len(frame) == len(registry) == 4
+    for i, rate in enumerate(rates):
+        world = AcceleratedWorld(rate, clock=SimulatedClock(moment))
+        expected, expected_ms = world.get_custom_frame()
+        got = frame.info(i)
+        assert got.custom_time == expected.custom_time == frame.custom_time(i)
+        assert frame.custom_ms(i) == expected_ms
+        assert got.dilation_percentage == expected.dilation_percentage
+        assert got.expanded_hours_per_day == expected.expanded_hours_per_day
+        assert got.remaining_hours == expected.remaining_hours
+        assert got.standard_datetime == expected.standard_datetime
+    assert frame.rates.typecode == "d" and frame.custom_ns.typecode == "q"
+
+
+def test_single_clock_read_and_shared_date_fields():
+    # 一次求值只读一次时钟；同一标准秒内日期字段对象复用，跨秒后重建
+    clock = _CountingClock(datetime.datetime(2026, 8, 8, 12))
+    registry = WorldRegistry((1.5, 2.0, 5.0, 20.0), clock=clock)
+    for world in registry.worlds:
+        assert world.clock is clock
+    frame = registry.evaluate()
+    assert clock.reads == 1
+    assert frame.info(0)._date_fields is frame.info(3)._date_fields
+    assert frame.lunar_info == frame.info(2).lunar_info
+    clock.advance(0.2)
+    assert registry.evaluate()._date_fields is frame._date_fields
+    clock.advance(1.0)
+    assert registry.evaluate()._date_fields is not frame._date_fields
+
+
+def test_schedule_world_and_validation():
+    # 日程世界取当前时段倍率；低于下限的倍率注册时抛 ValueError
+    registry = WorldRegistry(clock=SimulatedClock(datetime.datetime(2026, 8, 8, 10)))
+    index = registry.add(schedule=DilationSchedule.parse("00:00=1,09:00=4,12:00=1"))
+    frame = registry.evaluate()
+    assert frame.custom_time(index) == "13:00:00" and frame.dilation_percentage[index] == 400.0
+    with pytest.raises(ValueError):
+        registry.add(0.5)
+    assert len(registry) == 1
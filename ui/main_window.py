@@ -1,6 +1,7 @@
 # 主窗口模块（S4 重构为面板装配器：QTimer 调度 + 信号连接 + 主题/托盘）
 
 import logging
+import threading
 from typing import Any
 
 # 配置日志
@@ -22,6 +23,9 @@ from config.settings import (
 )
 from config.static.static_config import get_static_config
 from modules.time_dilation import AcceleratedWorld
+from modules.clock_source import RealClock
+from modules.time_snapshot import TimeSnapshotWriter
+from modules.chinese_calendar import warm_up_lunar
 from modules.alarm_service import Alarm
 from ui.audio_player import play_alarm_sound_async
 from data.cities import CITIES
@@ -60,8 +64,21 @@ class AcceleratedWorldGUI(QMainWindow):
                 int(base["window_height"]),
             )
 
+        # 共享时钟源（时钟/倒计时/闹钟同一时间来源）
+        self.clock = RealClock()
+
         # 创建加速世界核心实例
-        self.accel_world = AcceleratedWorld(time_dilation_rate=saved_rate)
+        self.accel_world = AcceleratedWorld(
+            time_dilation_rate=saved_rate, clock=self.clock
+        )
+
+        # 共享内存时间快照发布端（启动参数 --snapshot 开启，默认关闭）
+        self.snapshot_writer: TimeSnapshotWriter | None = None
+        self._snapshot_info = None
+
+        # 高频毫秒模式（启动参数 --fps 开启）：帧率与上一帧 TimeInfo
+        self._frame_fps: float | None = None
+        self._frame_info = None
 
         # 设置中心部件和主布局
         central_widget = QWidget()
@@ -73,10 +90,10 @@ class AcceleratedWorldGUI(QMainWindow):
         # ------------------- 面板装配 -------------------
         self.clock_panel = ClockPanel()
         self.date_panel = DatePanel()
-        self.countdown_panel = CountdownPanel()
+        self.countdown_panel = CountdownPanel(clock=self.clock)
         self.world_clock_panel = WorldClockPanel()
         self.weather_panel = WeatherPanel()
-        self.alarm_panel = AlarmPanel()
+        self.alarm_panel = AlarmPanel(clock=self.clock)
 
         for panel in (
             self.clock_panel,
@@ -126,13 +143,26 @@ class AcceleratedWorldGUI(QMainWindow):
     # ------------------- 时钟调度 -------------------
 
     def update_clock(self) -> None:
-        # 100ms 定时器驱动，异常不外抛仅记录日志
+        # 100ms 定时器驱动（高频模式按帧率），异常不外抛仅记录日志
         try:
-            info = self.accel_world.get_custom_time()
-            self.clock_panel.update_time(info)
-            self.date_panel.update_time(info)
-            self.countdown_panel.update_countdown()
-            self.world_clock_panel.update_world_clock()
+            custom_ms = None
+            if self._frame_fps is None:
+                info = self.accel_world.get_custom_time()
+            else:
+                # 高频模式：一次取时得到 TimeInfo 与自定义毫秒；TimeInfo 未变的帧只刷新毫秒标签
+                info, custom_ms = self.accel_world.get_custom_frame()
+            if custom_ms is None or info is not self._frame_info:
+                self._frame_info = info
+                # TimeInfo 按 (标准秒, 自定义秒) 缓存，对象变化才重新发布快照
+                if self.snapshot_writer is not None and info is not self._snapshot_info:
+                    self.snapshot_writer.publish(info)
+                    self._snapshot_info = info
+                self.clock_panel.update_time(info)
+                self.date_panel.update_time(info)
+                self.countdown_panel.update_countdown()
+                self.world_clock_panel.update_world_clock()
+            if custom_ms is not None:
+                self.clock_panel.update_frame(custom_ms, self.accel_world.custom_hours_per_day)
         except Exception as e:
             # logger.exception 自带堆栈，单通道记录
             logger.exception(f"更新时钟时出错: {e}")
@@ -150,7 +180,7 @@ class AcceleratedWorldGUI(QMainWindow):
         if not (base["rate_min"] <= rate <= base["rate_max"]):
             return
         # 更新加速世界实例
-        self.accel_world = AcceleratedWorld(time_dilation_rate=rate)
+        self.accel_world = AcceleratedWorld(time_dilation_rate=rate, clock=self.clock)
         # 同步保存倍率（滑杆/输入框/启动参数共用此路径）
         set_setting("time_dilation_rate", rate)
 
@@ -241,7 +271,18 @@ class AcceleratedWorldGUI(QMainWindow):
         rate: float | None = None,
         theme: str | None = None,
         city: str | None = None,
+        snapshot: str | None = None,
+        fps: float | None = None,
     ) -> None:
+        # 开启共享内存时间快照发布
+        if snapshot is not None:
+            self.snapshot_writer = TimeSnapshotWriter(snapshot)
+
+        # 开启高频毫秒模式：定时器周期改为帧间隔
+        if fps is not None:
+            self._frame_fps = fps
+            self.timer.setInterval(max(1, round(1000 / fps)))
+
         # 应用倍率（面板 set_rate 触发 rate_changed → 重建+保存+托盘更新，无需重复 update_rate，F1）
         if rate is not None:
             self.clock_panel.set_rate(rate)
@@ -258,14 +299,18 @@ class AcceleratedWorldGUI(QMainWindow):
 
 def main_gui(**kwargs: Any) -> None:
     # 创建应用与窗口，应用启动参数后进入事件循环
+    # 农历库导入与当前农历/节气索引计算放到后台线程，与窗口构建并行
+    threading.Thread(target=warm_up_lunar, name="lunar-warm-up", daemon=True).start()
     app = QApplication([])
     window = AcceleratedWorldGUI()
 
-    # 应用启动参数（rate/theme/city）
+    # 应用启动参数（rate/theme/city/snapshot/fps）
     window.apply_startup_args(
         rate=kwargs.get("rate"),
         theme=kwargs.get("theme"),
         city=kwargs.get("city"),
+        snapshot=kwargs.get("snapshot"),
+        fps=kwargs.get("fps"),
     )
 
     if kwargs.get("hidden"):
@@ -275,11 +320,16 @@ def main_gui(**kwargs: Any) -> None:
 
     app.exec()
 
+    # 事件循环结束（托盘退出/关闭窗口）后关闭快照发布端并删除快照文件
+    if window.snapshot_writer is not None:
+        window.snapshot_writer.close()
+
 
 # ===== ui/main_window.py 函数/类说明 =====
 # AcceleratedWorldGUI(QMainWindow): 主窗口装配器
-#   __init__: 加载配置 → 装配 6 个面板 → 连接信号 → 闹钟加载 → 100ms 定时器 → 主题 → 托盘
-#   update_clock(): tick 分发 TimeInfo 到时钟/日期/倒计时/世界时钟面板
+#   __init__: 加载配置 → 共享时钟源 → 装配 6 个面板 → 连接信号 → 闹钟加载 → 100ms 定时器 → 主题 → 托盘
+#   update_clock(): tick 分发 TimeInfo 到时钟/日期/倒计时/世界时钟面板；开启快照时 TimeInfo 变化即发布；
+#     高频模式（--fps）每帧 get_custom_frame()，TimeInfo 未变的帧只刷新时钟面板毫秒标签
 #   _on_rate_changed(rate): 倍率信号 → 重建核心实例 + 持久化 + 托盘更新
 #   _update_acceleration_rate(rate): 倍率验证/重建/保存共用路径
 #   _save_alarms(): 闹钟变更持久化（alarm_saved 信号）
@@ -288,8 +338,9 @@ def main_gui(**kwargs: Any) -> None:
 #   hide_to_tray()/show_normal()/quit_app(): 托盘交互（SystemTray 信号回调）
 #   closeEvent(): 托盘可见时隐藏而非退出
 #   save_settings(): 汇总各面板当前状态持久化
-#   apply_startup_args(rate/theme/city): 启动参数应用
-# main_gui(**kwargs): 创建应用/窗口/启动参数/显示/事件循环
+#   apply_startup_args(rate/theme/city/snapshot/fps): 启动参数应用（snapshot 路径开启共享内存快照发布；
+#     fps 开启高频毫秒模式，定时器周期改为 1000/fps 毫秒）
+# main_gui(**kwargs): 后台预热农历（warm_up_lunar）→ 创建应用/窗口/启动参数/显示/事件循环 → 关闭快照发布端
 #   设计理由：主窗口只做装配与调度，业务 UI 全部内聚在面板（signal/slot 解耦）
 #   关联配置：config/settings.py 配置读写；ui/audio_player.py 闹钟播放；
 #     ui/system_tray.py 托盘；ui/themes.py 样式
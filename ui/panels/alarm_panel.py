@@ -1,6 +1,5 @@
 # 闹钟面板模块（S4 GUI 面板化拆分，闹钟列表 + 增删改入口）
 
-import datetime
 import os
 from typing import List, Dict, Any
 
@@ -21,6 +20,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QFont
 
 from modules.alarm_service import AlarmManager, Alarm, PresetSound
+from modules.clock_source import ClockSource
 from ui.alarm_dialog import AlarmEditDialog
 from config.static.static_config import get_static_config
 
@@ -36,11 +36,13 @@ class AlarmPanel(QWidget):
     alarm_saved = pyqtSignal()  # 列表变更，主窗口负责持久化
     alarm_triggered = pyqtSignal(object)  # 闹钟触发（携带 Alarm 对象）
 
-    def __init__(self, parent: QWidget | None = None):
-        # 构建列表 UI 并启动每秒触发检查定时器
+    def __init__(
+        self, parent: QWidget | None = None, clock: ClockSource | None = None
+    ):
+        # 构建列表 UI 并启动每秒触发检查定时器；clock 透传给管理器（主窗口共享同一时钟源）
         super().__init__(parent)
 
-        self.alarm_manager = AlarmManager()
+        self.alarm_manager = AlarmManager(clock=clock)
 
         alarm_frame = QFrame()
         alarm_frame.setFrameShape(QFrame.Shape.StyledPanel)
@@ -152,11 +154,10 @@ class AlarmPanel(QWidget):
             self.alarm_list.setItemWidget(item, widget)
 
     def check_alarms(self) -> None:
-        # 空列表短路：无闹钟时不建 datetime 不遍历（S9.3）
+        # 空列表短路：无闹钟时不取时间不遍历（S9.3）；当前时间由管理器经时钟源获取
         if not self.alarm_manager.alarms:
             return
-        now = datetime.datetime.now()
-        for alarm in self.alarm_manager.check_alarms(now):
+        for alarm in self.alarm_manager.check_alarms():
             self.alarm_triggered.emit(alarm)
 
     def save_and_refresh(self) -> None:
@@ -227,12 +228,12 @@ class AlarmPanel(QWidget):
 
 
 # ===== ui/panels/alarm_panel.py 函数/类说明 =====
-# AlarmPanel(QWidget): 闹钟面板
+# AlarmPanel(QWidget, clock=None): 闹钟面板（clock 透传 AlarmManager，由主窗口注入共享时钟源）
 #   信号：alarm_saved 列表变更（主窗口持久化）；alarm_triggered(Alarm) 触发（主窗口播放/通知）
 #   load_alarms(data): 启动时从配置加载
 #   to_dict_list(): 导出列表供持久化
 #   refresh_list(): 重建列表控件（每行含开关/时间/标签/重复/声音/编辑/删除）
-#   check_alarms(): 每秒定时检查，命中发信号；一次性闹钟禁用由主窗口处理
+#   check_alarms(): 每秒定时检查（当前时间经管理器时钟源），命中发信号；一次性闹钟禁用由主窗口处理
 #   save_and_refresh(): 变更后统一保存+刷新入口
 #   show_add_alarm_dialog()/show_edit_alarm_dialog()/delete_alarm()/toggle_alarm(): 增删改
 #   _get_repeat_display()/_get_sound_display(): 显示格式化辅助
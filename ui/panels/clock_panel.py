@@ -16,7 +16,7 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtGui import QFont, QDoubleValidator
 
-from modules.time_dilation import TimeInfo
+from modules.time_dilation import MillisecondFormatter, TimeInfo
 from ui.themes import LIGHT_THEME_PROGRESS
 from config.static.static_config import get_static_config
 
@@ -133,10 +133,15 @@ class ClockPanel(QWidget):
 
         layout.addWidget(input_frame)
 
+        # 高频毫秒模式格式化器（首次 update_frame 时创建，倍率变化导致一天小时数变化时重建）
+        self._frame_formatter: MillisecondFormatter | None = None
+
     def update_time(self, info: TimeInfo) -> None:
         # 由主窗口 tick 传入 TimeInfo，经计算属性取值更新标签与进度条
+        # 高频模式下加速时间标签由 update_frame 按帧刷新，此处不覆盖
         self.standard_time_label.setText(f"标准时间: {info.standard_time}")
-        self.accelerated_time_label.setText(f"加速时间: {info.custom_time}")
+        if self._frame_formatter is None:
+            self.accelerated_time_label.setText(f"加速时间: {info.custom_time}")
         self.hours_per_day_value_label.setText(f"{info.expanded_hours_per_day:.2f}小时")
         self.rate_value_label.setText(f"{info.dilation_percentage:.0f}%")
         self.remaining_hours_value_label.setText(f"{info.remaining_hours:.2f}小时")
@@ -147,6 +152,13 @@ class ClockPanel(QWidget):
         self.progress_bar.setMaximum(total_hours)
         self.progress_bar.setValue(current_hour)
 
+    def update_frame(self, custom_ms: int, hours_per_day: int) -> None:
+        # 高频模式每帧调用：仅刷新加速时间标签（HH:MM:SS.mmm），查表格式化，同秒行首复用
+        formatter = self._frame_formatter
+        if formatter is None or formatter.hours_per_day != hours_per_day:
+            formatter = self._frame_formatter = MillisecondFormatter(hours_per_day, "加速时间: ")
+        self.accelerated_time_label.setText(formatter.format(custom_ms))
+
     def set_progress_style(self, qss: str) -> None:
         # 直接应用传入的 QSS 常量
         self.progress_bar.setStyleSheet(qss)
@@ -190,7 +202,9 @@ class ClockPanel(QWidget):
 # ===== ui/panels/clock_panel.py 函数/类说明 =====
 # ClockPanel(QWidget): 时钟显示 + 参数标签 + 进度条 + 倍率设置（滑杆/输入框/按钮）
 #   信号：rate_changed(float) 倍率变化，主窗口据此重建实例并持久化
-#   update_time(info): 刷新时间/参数/进度条显示
+#   update_time(info): 刷新时间/参数/进度条显示（高频模式下加速时间标签交给 update_frame）
+#   update_frame(custom_ms, hours_per_day): 高频毫秒模式每帧刷新加速时间标签
+#     （modules/time_dilation.py MillisecondFormatter 查表格式化，一天小时数变化时重建）
 #   set_progress_style(qss): 主题切换时更新进度条样式
 #   set_rate(rate): 外部同步倍率（走滑杆触发信号，保证 UI 与核心一致）
 #   on_slider_change(value): 滑杆回调，同步标签后发信号
@@ -20,16 +20,21 @@ from PyQt6.QtCore import Qt, QDate, QTime
 from PyQt6.QtGui import QFont
 
 from config.static.static_config import get_static_config
+from modules.clock_source import ClockSource, RealClock
 
 # 静态配置（字体/颜色）
 _UI = get_static_config().ui
 
 
 class CountdownPanel(QWidget):
-    def __init__(self, parent: QWidget | None = None):
-        # 目标时间内部态初始为 None；选择器只改写输入框文本
+    def __init__(
+        self, parent: QWidget | None = None, clock: ClockSource | None = None
+    ):
+        # 目标时间内部态初始为 None；选择器只改写输入框文本；clock 为时间来源（默认真实时钟）
         super().__init__(parent)
 
+        self.clock = clock if clock is not None else RealClock()
+
         self.countdown_target_date: datetime.datetime | None = None  # 倒计时目标时间
 
         countdown_frame = QFrame()
@@ -126,7 +131,7 @@ class CountdownPanel(QWidget):
             return
 
         # 检查时间是否已过期
-        if self.countdown_target_date <= datetime.datetime.now():
+        if self.countdown_target_date <= self.clock.now():
             QMessageBox.warning(self, "警告", "目标时间已过期，请选择未来时间")
             self.countdown_target_date = None
             return
@@ -144,7 +149,7 @@ class CountdownPanel(QWidget):
         if not self.countdown_target_date:
             return
 
-        now = datetime.datetime.now()
+        now = self.clock.now()
         remaining = self.countdown_target_date - now
 
         if remaining.total_seconds() <= 0:
@@ -287,7 +292,7 @@ class CountdownPanel(QWidget):
 
 
 # ===== ui/panels/countdown_panel.py 函数/类说明 =====
-# CountdownPanel(QWidget): 倒计时面板
+# CountdownPanel(QWidget, clock=None): 倒计时面板（过期校验与剩余计算经注入时钟源取当前时间）
 #   set_countdown(): 解析三种时间格式并校验过期，成功后刷新显示
 #   clear_countdown(): 清除目标与显示
 #   update_countdown(): 主窗口 tick 调用，计算剩余并着色（结束红/进行绿）
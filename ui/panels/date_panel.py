@@ -1,15 +1,45 @@
 # 日期面板模块（S4 GUI 面板化拆分，中文日期 + 农历信息）
 
+import datetime
+
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QFrame, QLabel
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import pyqtSignal, Qt, QThreadPool, QRunnable, QObject
 from PyQt6.QtGui import QFont
 
 from modules.time_dilation import TimeInfo
+from modules.chinese_calendar import get_next_jieqi
 from config.static.static_config import get_static_config
 
 _UI = get_static_config().ui
 
 
+def _jieqi_display(now: datetime.datetime) -> str:
+    # "距下一节气 N 天"（交节当天显示"今日交节"）；超出节气索引年份范围时不显示
+    try:
+        term, _ = get_next_jieqi(now)
+    except ValueError:
+        return ""
+    days = (term.start.date() - now.date()).days
+    return f"今日{term.name}交节" if days == 0 else f"距{term.name}还有 {days} 天"
+
+
+class _JieQiTaskSignals(QObject):
+    finished = pyqtSignal(str, str)  # (标准日期 "YYYY-MM-DD", 节气倒计时文案)
+
+
+class _JieQiTask(QRunnable):
+    def __init__(self, today: str, now: datetime.datetime):
+        # 记录查询日期与时刻并创建信号载体
+        super().__init__()
+        self.today = today
+        self.now = now
+        self.signals = _JieQiTaskSignals()
+
+    def run(self) -> None:
+        # 在线程池中查节气（首次查询某年需构建该年索引并可能导入农历库），完成后发 finished
+        self.signals.finished.emit(self.today, _jieqi_display(self.now))
+
+
 class DatePanel(QWidget):
     def __init__(self, parent: QWidget | None = None):
         # 构建日期/农历显示 frame，初始为占位文案
@@ -32,17 +62,42 @@ class DatePanel(QWidget):
         self.lunar_info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         date_layout.addWidget(self.lunar_info_label)
 
+        # 下一节气倒计时标签（按日刷新，后台线程查节气索引）
+        self.jieqi_label = QLabel("")
+        self.jieqi_label.setFont(QFont(_UI["font_family"], 11))
+        self.jieqi_label.setStyleSheet("color: " + _UI["colors"]["text_muted"])
+        self.jieqi_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        date_layout.addWidget(self.jieqi_label)
+        self._jieqi_date = None
+        self._jieqi_pool = QThreadPool.globalInstance()
+
         outer = QVBoxLayout(self)
         outer.addWidget(date_frame)
 
     def update_time(self, info: TimeInfo) -> None:
-        # 由主窗口 tick 传入 TimeInfo，直接更新两个标签
+        # 由主窗口 tick 传入 TimeInfo，直接更新两个标签；节气倒计时只在跨日时提交后台任务重算
         self.date_label.setText(info.chinese_date)
         self.lunar_info_label.setText(info.lunar_info)
+        today = info.standard_datetime.split()[0]
+        if today != self._jieqi_date:
+            self._jieqi_date = today
+            now = datetime.datetime.strptime(info.standard_datetime, "%Y-%m-%d %H:%M:%S")
+            task = _JieQiTask(today, now)
+            task.signals.finished.connect(self._on_jieqi_result)
+            self._jieqi_pool.start(task)
+
+    def _on_jieqi_result(self, today: str, text: str) -> None:
+        # 后台结果回到 GUI 线程；期间已跨日（结果过时）则丢弃，等待新日期的任务
+        if today == self._jieqi_date:
+            self.jieqi_label.setText(text)
 
 
 # ===== ui/panels/date_panel.py 函数/类说明 =====
 # DatePanel(QWidget): 日期显示面板
-#   update_time(info): 由主窗口时钟 tick 调用，刷新中文日期与农历标签
+#   update_time(info): 由主窗口时钟 tick 调用，刷新中文日期与农历标签；节气倒计时按日提交 _JieQiTask
+#   _on_jieqi_result(today, text): 后台节气结果回到 GUI 线程，日期仍一致时更新标签
+# _jieqi_display(now): 下一节气倒计时文案（modules/chinese_calendar.py get_next_jieqi）
+# _JieQiTask(QRunnable): 线程池中查下一节气，完成后发 finished(today, text)；
+#   设计理由：某年首次查询需构建该年节气索引（并可能首次导入农历库），放到后台避免阻塞时钟 tick
 #   设计理由：显示职责独立成面板，主窗口只做装配与调度
 #   关联配置：数据来自 modules/time_dilation.py 的 TimeInfo
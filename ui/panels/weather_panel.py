@@ -16,7 +16,9 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QFont
 
 from modules.weather_service import (
+    get_cached_weather,
     get_weather_by_city,
+    wait_weather_refresh,
     format_weather_info,
     WeatherData,
 )
@@ -43,13 +45,20 @@ class _WeatherTask(QRunnable):
         self.signals = _WeatherTaskSignals()
 
     def run(self) -> None:
-        # 在线程池中执行网络查询，异常兜底记录并降级返回，保证 UI 不卡"获取天气中..."
+        # 在线程池中执行查询（含持久化缓存磁盘读取），异常兜底记录并降级返回，保证 UI 不卡"获取天气中..."；
+        # 有上次天气时先发一次供即时渲染，过期（stale）则等待后台刷新完成后发新数据；刷新失败回退上次天气
+        cached = None
         try:
+            cached = get_cached_weather(self.city_name)
+            if cached is not None:
+                self.signals.finished.emit(self.city_name, cached)
             result = get_weather_by_city(self.city_name)
+            if result is not None and result.stale:
+                result = wait_weather_refresh(self.city_name)
         except Exception as e:
             logger.exception(f"后台天气查询异常: {e}")
             result = None
-        self.signals.finished.emit(self.city_name, result)
+        self.signals.finished.emit(self.city_name, result if result is not None else cached)
 
 
 class WeatherPanel(QWidget):
@@ -60,6 +69,8 @@ class WeatherPanel(QWidget):
         super().__init__(parent)
 
         self.current_city = _BASE["default_city"]
+        self._shown_city: str | None = None  # 天气标签当前显示的城市（无天气显示时为 None）
+        self._requested_city: str | None = None  # 最近一次已发起查询的城市（启动去重）
         self._weather_pool = QThreadPool.globalInstance()
 
         weather_frame = QFrame()
@@ -114,9 +125,12 @@ class WeatherPanel(QWidget):
         self.weather_timer.start(int(_BASE["weather_cache_ttl"]) * 1000)
 
     def update_weather(self) -> None:
-        # 置过渡态后提交 QThreadPool 任务，UI 不阻塞
-        self.weather_info_label.setText("获取天气中...")
-        self.weather_icon_label.setText("⏳")
+        # 提交 QThreadPool 任务（缓存读取与网络请求均不在 GUI 线程）；标签尚未显示该城市天气时置过渡态，
+        # 已显示（定时/手动刷新）则保留到新结果到达
+        if self._shown_city != self.current_city:
+            self.weather_info_label.setText("获取天气中...")
+            self.weather_icon_label.setText("⏳")
+        self._requested_city = self.current_city
         task = _WeatherTask(self.current_city)
         task.signals.finished.connect(self._on_weather_result)
         # globalInstance 运行时恒非 None（stub 标注 Optional，行级压制）
@@ -128,22 +142,30 @@ class WeatherPanel(QWidget):
         # 城市已切换时丢弃过期结果，避免旧数据覆盖新城市显示
         if city_name != self.current_city:
             return
+        # 刷新失败时后台任务已回退上次缓存天气；仍为 None 说明无任何可显示数据
         try:
             if weather:
                 self.weather_info_label.setText(format_weather_info(weather, city_name))
                 self.weather_icon_label.setText(weather.icon)
-            else:
-                self.weather_info_label.setText("天气获取失败")
-                self.weather_icon_label.setText("❓")
+                self._shown_city = city_name
+                return
         except Exception as e:
             logger.exception(f"更新天气显示时出错: {e}")
-            self.weather_info_label.setText("天气获取失败")
-            self.weather_icon_label.setText("❓")
+        self.weather_info_label.setText("天气获取失败")
+        self.weather_icon_label.setText("❓")
+        self._shown_city = None
 
     def set_city(self, city_name: str) -> None:
-        # 列表内 setCurrentText 触发联动查询；列表外直设并发起查询
+        # 列表内 setCurrentText 触发联动查询；列表外直设并发起查询；
+        # 该城市已发起过查询（恢复的 last_city 与 --city 相同）则不重复查询，避免启动时两次渲染
+        if city_name == self._requested_city and city_name == self.current_city:
+            return
         if city_name in CITIES:
-            self.city_combo.setCurrentText(city_name)
+            if city_name == self.city_combo.currentText():
+                # 与当前选项相同时 currentTextChanged 不触发，直接查询（启动恢复默认城市）
+                self.on_city_changed(city_name)
+            else:
+                self.city_combo.setCurrentText(city_name)
         else:
             self.current_city = city_name
             self.update_weather()
@@ -168,13 +190,17 @@ class WeatherPanel(QWidget):
 
 
 # ===== ui/panels/weather_panel.py 函数/类说明 =====
-# _WeatherTask(QRunnable): 后台查询任务，携带城市名，完成后发 finished(city, result)
+# _WeatherTask(QRunnable): 后台查询任务，携带城市名，完成后发 finished(city, result)；
+#   先读上次天气（内存/SQLite 持久化缓存，磁盘读取在线程池中）并发出供即时渲染，
+#   过期数据（stale-while-revalidate）等待后台刷新完成后再发一次；刷新失败时回退发上次天气
 # _WeatherTaskSignals(QObject): 任务信号载体（跨线程排队回 GUI 线程）
 # WeatherPanel(QWidget): 天气面板
 #   信号：theme_toggled 主题切换请求（主窗口负责应用 QSS）
-#   update_weather(): 提交后台任务立即返回，UI 不因网络阻塞（修复 D5）
-#   _on_weather_result(city, weather): 回调更新标签；城市已切换则丢弃过期结果
-#   set_city()/set_theme_button()/on_city_changed()/current_city_name(): 见 S4
+#   update_weather(): 提交后台任务立即返回，GUI 线程不读磁盘也不因网络阻塞（修复 D5）；
+#     标签未显示该城市天气时置过渡态，上次天气由任务读出后几毫秒内即渲染
+#   _on_weather_result(city, weather): 回调更新标签并记录 _shown_city；城市已切换则丢弃过期结果
+#   set_city()/set_theme_button()/on_city_changed()/current_city_name(): 见 S4；
+#     set_city 对已发起查询的当前城市不重复查询（_requested_city，--city 与恢复的 last_city 相同时启动只查一次）
 #   设计理由：QThreadPool 全局实例复用线程；信号跨线程自动排队，避免手动锁
 #   异常处理：查询失败在 service 层返回 None，回调显示失败文案
 #   关联配置：last_city 配置项由主窗口持久化；城市表来自 data/cities.py
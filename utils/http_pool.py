@@ -0,0 +1,159 @@
+# 连接池 HTTP 客户端模块（http.client 持久连接 + gzip）
+# 每个 (scheme, host, port) 保留若干空闲 keep-alive 连接供后续请求与其他线程复用，省去每次 TCP/TLS 握手；
+# 参数由调用方传入（utils 层不依赖 config，同 utils/logger.py）
+
+import gzip
+import http.client
+import threading
+import time
+import urllib.error
+import urllib.parse
+import zlib
+from typing import Mapping
+
+# 连接池键：(scheme, host, port)
+_PoolKey = tuple[str, str, int]
+
+# 复用的空闲连接可能已被服务器关闭：遇到这些异常时换下一个连接重发（新建连接仍失败才抛出）
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class HTTPConnectionPool:
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        idle_timeout: float = 30.0,
+        max_idle_per_host: int = 4,
+        user_agent: str = "AccelWorld",
+    ):
+        # timeout: 连接/读取超时；idle_timeout: 空闲连接超过该秒数不再复用（关闭）；
+        # max_idle_per_host: 每个主机最多保留的空闲连接数（并发超出时用完即关）
+        if max_idle_per_host < 1:
+            raise ValueError("max_idle_per_host 必须大于等于 1")
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.user_agent = user_agent
+        self._idle: dict[_PoolKey, list[tuple[float, http.client.HTTPConnection]]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, key: _PoolKey) -> tuple[http.client.HTTPConnection, bool]:
+        # 先关闭超过 idle_timeout 的空闲连接（列表按归还时间递增，超时的都在前部），
+        # 再取最近归还的连接（LIFO）；无可用时新建 → (连接, 是否复用)
+        conn = None
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            cut = 0
+            while cut < len(idle) and now - idle[cut][0] >= self.idle_timeout:
+                cut += 1
+            expired = [stale for _, stale in idle[:cut]]
+            del idle[:cut]
+            if idle:
+                conn = idle.pop()[1]
+        for stale in expired:
+            stale.close()
+        if conn is not None:
+            return conn, True
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout), False
+        return http.client.HTTPConnection(host, port, timeout=self.timeout), False
+
+    def _release(self, key: _PoolKey, conn: http.client.HTTPConnection) -> None:
+        # 归还连接；该主机空闲连接已满时直接关闭
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    def get(self, url: str, headers: Mapping[str, str] | None = None) -> bytes:
+        # GET 请求并返回（必要时 gzip 解压后的）响应体；
+        # 异常口径与 urllib.request.urlopen 一致：HTTP 错误状态抛 HTTPError，连接/协议错误包装为 URLError，
+        # 超时抛 TimeoutError（调用方 retry_call 的异常元组无需改动）
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"不支持的 URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = {
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+            "User-Agent": self.user_agent,
+            **(headers or {}),
+        }
+
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request("GET", path, headers=request_headers)
+                response = conn.getresponse()
+                body = response.read()
+            except _STALE_CONNECTION_ERRORS as e:
+                conn.close()
+                if reused:
+                    continue  # 空闲期间被服务器关闭的连接：换新连接重发
+                raise urllib.error.URLError(e) from e
+            except TimeoutError:
+                conn.close()
+                raise
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise urllib.error.URLError(e) from e
+            break
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+
+        if response.status >= 400:
+            raise urllib.error.HTTPError(
+                url, response.status, response.reason, response.headers, None
+            )
+        if response.getheader("Content-Encoding", "").lower() == "gzip":
+            try:
+                body = gzip.decompress(body)
+            except (OSError, EOFError, zlib.error) as e:
+                raise urllib.error.URLError(f"gzip 响应解压失败: {e}") from e
+        return body
+
+    def idle_count(self, url: str | None = None) -> int:
+        # 当前空闲连接数（url 给定时只统计该主机）
+        with self._lock:
+            if url is None:
+                return sum(len(idle) for idle in self._idle.values())
+            parts = urllib.parse.urlsplit(url)
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            return len(self._idle.get((parts.scheme, parts.hostname or "", port), []))
+
+    def close(self) -> None:
+        # 关闭全部空闲连接（借出中的连接归还后照常入池）
+        with self._lock:
+            conns = [conn for idle in self._idle.values() for _, conn in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+
+# ===== utils/http_pool.py 函数/类说明 =====
+# HTTPConnectionPool(timeout, idle_timeout, max_idle_per_host, user_agent): 线程安全的 keep-alive 连接池
+#   get(url, headers=None) -> bytes: GET 请求，发送 Accept-Encoding: gzip 并自动解压；
+#     复用连接在空闲期间被服务器关闭（RemoteDisconnected/BadStatusLine/连接重置）时换下一个连接重发，
+#     新建连接仍失败才抛出
+#   _acquire(key)/_release(key, conn): 按 (scheme, host, port) 借还连接；LIFO 复用最近归还的连接，
+#     超过 idle_timeout 的空闲连接借出时关闭；每主机空闲连接数上限 max_idle_per_host，超出用完即关
+#   idle_count(url=None): 空闲连接数（测试/基准观察用）；close(): 关闭全部空闲连接
+#   设计理由：urlopen 每次请求新建 TCP（HTTPS 另加 TLS）连接；天气刷新等重复访问同一主机时复用连接省去握手，
+#     gzip 减少 JSON 传输量；基准见 benchmarks/bench_weather_http.py
+#   异常处理：与 urlopen 同口径——HTTP 4xx/5xx 抛 HTTPError，连接/协议/解压错误包装为 URLError，超时抛 TimeoutError；
+#     非 http/https URL 抛 ValueError
+#   关联配置：参数由 modules/weather_service.py 从 base.json（http_timeout/http_idle_timeout/http_max_idle_per_host）传入